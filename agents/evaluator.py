@@ -2,10 +2,36 @@ import json
 from typing import List, Dict, Any
 from utils.persistence import load_json, SUCCESS_PERSONA_FILE, log_agent_action
 from utils.llm_client import get_llm_response, clean_json_response
+from utils import metrics, score_cache, embeddings, persona as persona_versions
+from utils.config import get_config
+
+ERROR_REASONING = "Error evaluating job."
+
+
+def _failed(result) -> bool:
+    return result[-1] == ERROR_REASONING
+
 
 class EvaluatorAgent:
     def __init__(self):
         self.persona = load_json(SUCCESS_PERSONA_FILE)
+        # Resolved by reload_persona; stored on each scored job
+        self.persona_version = None
+        # Named personas (personas/*.json) scored alongside the default one
+        self.extra_personas = {}
+        self.extra_versions = {}
+        self._persona_vector = None
+        # Jobs per LLM call; batching reduces API calls and avoids rate limits
+        self.batch_size = 5
+
+    def reload_persona(self):
+        """Re-reads the persona files, so edits take effect, and resolves their versions."""
+        personas = persona_versions.load_personas()
+        self.persona = personas.pop(persona_versions.DEFAULT_PERSONA, {})
+        self.persona_version = persona_versions.current_version(self.persona) if self.persona else None
+        self.extra_personas = personas
+        self.extra_versions = {name: persona_versions.current_version(p, name=name) for name, p in personas.items()}
+        self._persona_vector = None
 
     def score_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not self.persona:
@@ -14,18 +40,19 @@ class EvaluatorAgent:
             
         log_agent_action("Evaluator", f"Scoring {len(jobs)} jobs against persona...", "INFO")
         
-        # Batch scoring to reduce API calls and avoid rate limits
-        scored_jobs = []
-        batch_size = 5
+        jobs, scored_jobs = self.prefilter(jobs)
         
-        for i in range(0, len(jobs), batch_size):
-            batch = jobs[i:i + batch_size]
-            batch_results = self.evaluate_batch(batch)
-            
-            for job, (score, reasoning) in zip(batch, batch_results):
+        with metrics.timer("score"):
+            # Reposts and cross-posted roles reuse their cached score
+            results = score_cache.cached(jobs, "score", score_cache.persona_hash(self.persona),
+                                         self.evaluate_batch, self.batch_size, _failed)
+            for job, (score, reasoning) in zip(jobs, results):
                 job['match_score'] = score
                 job['match_reasoning'] = reasoning
+                job['persona_version'] = self.persona_version
                 scored_jobs.append(job)
+        metrics.incr("jobs_in", len(jobs), stage="score")
+        metrics.incr("jobs_out", len(scored_jobs), stage="score")
             
         # Sort by score
         scored_jobs.sort(key=lambda x: x.get('match_score', 0), reverse=True)
@@ -36,6 +63,200 @@ class EvaluatorAgent:
             
         return scored_jobs
     
+    def prefilter(self, jobs: List[Dict[str, Any]]):
+        """
+        Splits off jobs whose embedding similarity to the persona is below
+        embedding_prefilter_threshold; they skip the LLM, with a match_score of 0 and the
+        cosine similarity in persona_similarity. Returns (jobs to send to the LLM, prefiltered jobs).
+        """
+        threshold = get_config().embedding_prefilter_threshold
+        if threshold <= 0 or not jobs or not self.persona:
+            return jobs, []
+
+        encoder = embeddings.get_index().encoder
+        if self._persona_vector is None:
+            self._persona_vector = encoder.encode([embeddings.persona_text(self.persona)])[0]
+        similarities = encoder.encode([embeddings.job_text(job) for job in jobs]) @ self._persona_vector
+
+        keep, skipped = [], []
+        for job, similarity in zip(jobs, similarities):
+            if similarity >= threshold:
+                keep.append(job)
+                continue
+            job['match_score'] = 0
+            job['persona_similarity'] = round(float(similarity), 4)
+            job['match_reasoning'] = f"Not sent for LLM scoring: low similarity to the persona ({similarity:.2f})."
+            job['persona_version'] = self.persona_version
+            skipped.append(job)
+        metrics.incr("prefiltered", len(skipped), stage="score")
+        return keep, skipped
+
+    def screen_and_score(self, jobs: List[Dict[str, Any]], target_industries: List[str]):
+        """
+        Fused industry check and scoring: one LLM call per batch decides industry relevance
+        and scores the job, replacing the validator's YES/NO call plus evaluate_batch.
+        Prefiltered jobs are rejected: their industry was never checked, since the validator
+        leaves that to this call. Returns (scored relevant jobs, rejected jobs).
+        """
+        jobs, rejected = self.prefilter(jobs)
+        kept = []
+        with metrics.timer("score"):
+            results = score_cache.cached(jobs, "fused", score_cache.persona_hash(self.persona, sorted(target_industries)),
+                                         lambda batch: self.evaluate_batch_fused(batch, target_industries),
+                                         self.batch_size, _failed)
+            for job, (relevant, score, reasoning) in zip(jobs, results):
+                if not relevant:
+                    log_agent_action("Evaluator", f"Job filtered out (Industry Mismatch): {job.get('Title')} at {job.get('Company')}", "INFO")
+                    metrics.incr("rejected_industry", source=job.get('Source'))
+                    rejected.append(job)
+                    continue
+                job['match_score'] = score
+                job['match_reasoning'] = reasoning
+                job['persona_version'] = self.persona_version
+                kept.append(job)
+        metrics.incr("jobs_in", len(jobs), stage="score")
+        metrics.incr("jobs_out", len(kept), stage="score")
+
+        kept.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+        if kept:
+            log_agent_action("Evaluator", f"Screened and scored {len(jobs)} jobs; kept {len(kept)}. Highest score: {kept[0].get('match_score', 0)}.", "SUCCESS")
+        return kept, rejected
+
+    def evaluate_batch_fused(self, jobs: List[Dict[str, Any]], target_industries: List[str]):
+        """Industry relevance, score and reasoning for a batch in a single LLM call."""
+        jobs_text = "\n\n".join([
+            f"Job {i+1}:\nTitle: {job.get('Title')}\nCompany: {job.get('Company')}\nLocation: {job.get('Location')}\nSalary: {job.get('Salary')}\nType: {job.get('Job Type')}"
+            for i, job in enumerate(jobs)
+        ])
+
+        prompt = f"""
+        You are an expert industry analyst and career advisor.
+        
+        Target Industries: {", ".join(target_industries)}
+        
+        Persona:
+        {json.dumps(self.persona, indent=2)}
+        
+        Jobs:
+        {jobs_text}
+        
+        Task:
+        For each job:
+        1. Decide whether it likely belongs to ANY of the target industries, considering the company's known business and the nature of the role.
+        2. Score it from 0 to 100 based on the persona's scoring rubric, with brief reasoning.
+        
+        Output JSON array:
+        [
+            {{"job_number": 1, "relevant": true, "score": 85, "reasoning": "Matches core skills..."}},
+            {{"job_number": 2, "relevant": false, "score": 0, "reasoning": "Retail company, outside target industries."}}
+        ]
+        """
+
+        # Like the separate checks: an unanswered industry check lets the job through
+        results = {}
+        response = get_llm_response(prompt)
+        if response:
+            try:
+                for r in json.loads(clean_json_response(response)):
+                    results[int(r.get("job_number", 0))] = r
+            except Exception:
+                results = {}
+        out = []
+        for i in range(len(jobs)):
+            r = results.get(i + 1)
+            if r is None:
+                out.append((True, 50, ERROR_REASONING))
+            else:
+                out.append((r.get("relevant", True) is not False, r.get("score", 0), r.get("reasoning", "No reasoning provided.")))
+        return out
+
+    def score_extra_personas(self, jobs: List[Dict[str, Any]], names: List[str] = None, before_call=None) -> List[Dict[str, Any]]:
+        """
+        Scores `jobs` for the named personas (all of them by default) into job['persona_scores'],
+        as {name: [score, reasoning, persona_version]}. One LLM call covers a batch of jobs for
+        every persona still missing a cached score, so adding a candidate grows the prompt, not
+        the number of calls.
+        """
+        names = [n for n in (names or self.extra_personas) if n in self.extra_personas]
+        if not names or not jobs:
+            return jobs
+
+        hashes = {name: score_cache.persona_hash(self.extra_personas[name]) for name in names}
+        keys = {(i, name): score_cache.job_key(job, "score", hashes[name]) for i, job in enumerate(jobs) for name in names}
+        results = score_cache.get_many(keys.values())
+        missing = [i for i in range(len(jobs)) if any(keys[(i, n)] not in results for n in names)]
+
+        fresh = {}
+        with metrics.timer("score_personas"):
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                wanted = [[n for n in names if keys[(i, n)] not in results] for i in batch]
+                if before_call:
+                    before_call()
+                for i, job_names, scores in zip(batch, wanted, self.evaluate_batch_personas([jobs[i] for i in batch], wanted)):
+                    for name in job_names:
+                        results[keys[(i, name)]] = scores[name]
+                        if not _failed(scores[name]):
+                            fresh[keys[(i, name)]] = scores[name]
+        score_cache.put_many(fresh, "score")
+
+        for i, job in enumerate(jobs):
+            persona_scores = job.setdefault('persona_scores', {})
+            for name in names:
+                score, reasoning = results[keys[(i, name)]]
+                persona_scores[name] = [score, reasoning, self.extra_versions.get(name)]
+        metrics.incr("jobs_out", len(jobs) * len(names), stage="score_personas")
+        return jobs
+
+    def evaluate_batch_personas(self, jobs: List[Dict[str, Any]], wanted: List[List[str]]):
+        """
+        Scores a batch of jobs for several personas in a single LLM call.
+        wanted[i] names the personas job i needs; returns {name: (score, reasoning)} per job.
+        """
+        names = [n for n in self.extra_personas if any(n in w for w in wanted)]
+        personas_text = "\n\n".join(f'Persona "{name}":\n{json.dumps(self.extra_personas[name], indent=2)}' for name in names)
+        jobs_text = "\n\n".join([
+            f"Job {i+1}:\nTitle: {job.get('Title')}\nCompany: {job.get('Company')}\nLocation: {job.get('Location')}\nSalary: {job.get('Salary')}\nType: {job.get('Job Type')}\nScore for: {', '.join(wanted[i])}"
+            for i, job in enumerate(jobs)
+        ])
+
+        prompt = f"""
+        Evaluate these job postings against several candidates' Success Personas.
+        
+        Personas:
+        {personas_text}
+        
+        Jobs:
+        {jobs_text}
+        
+        Task:
+        For each job and each persona listed under its "Score for", provide a score from 0 to 100
+        based on that persona's scoring rubric and brief reasoning.
+        
+        Output JSON array, one entry per job and persona:
+        [
+            {{"job_number": 1, "persona": "{names[0]}", "score": 85, "reasoning": "Matches core skills..."}}
+        ]
+        """
+
+        results = {}
+        response = get_llm_response(prompt)
+        if response:
+            try:
+                for r in json.loads(clean_json_response(response)):
+                    results[(int(r.get("job_number", 0)), r.get("persona"))] = r
+            except:
+                results = {}
+
+        out = []
+        for i, job_names in enumerate(wanted):
+            scores = {}
+            for name in job_names:
+                r = results.get((i + 1, name))
+                scores[name] = (r.get("score", 0), r.get("reasoning", "No reasoning provided.")) if r else (50, ERROR_REASONING)
+            out.append(scores)
+        return out
+
     def evaluate_batch(self, jobs: List[Dict[str, Any]]):
         """Evaluate a batch of jobs in a single LLM call"""
         jobs_text = "\n\n".join([
@@ -62,16 +283,18 @@ class EvaluatorAgent:
         ]
         """
         
+        results = {}
         response = get_llm_response(prompt)
         if response:
             try:
-                results = json.loads(clean_json_response(response))
-                return [(r.get("score", 0), r.get("reasoning", "No reasoning provided.")) for r in results]
+                for r in json.loads(clean_json_response(response)):
+                    results[int(r.get("job_number", 0))] = r
             except:
-                pass
+                results = {}
         
-        # Fallback: return default scores
-        return [(50, "Error evaluating job.") for _ in jobs]
+        # Fallback: default score for any job the response missed
+        return [(results[i + 1].get("score", 0), results[i + 1].get("reasoning", "No reasoning provided."))
+                if i + 1 in results else (50, ERROR_REASONING) for i in range(len(jobs))]
 
     def evaluate_single_job(self, job: Dict[str, Any]):
         prompt = f"""
@@ -106,4 +329,4 @@ class EvaluatorAgent:
             except:
                 pass
         
-        return 0, "Error evaluating job."
+        return 0, ERROR_REASONING
@@ -57,6 +57,7 @@ class ExternalJobProcessor:
             
             from utils.llm_client import get_llm_response
             from agents.learner import LearnerAgent
+            from utils.persona import current_version as current_persona_version
             
             learner = LearnerAgent()
             persona = learner.get_persona()
@@ -97,6 +98,7 @@ class ExternalJobProcessor:
                     job.company = data.get("company", job.company)
                     job.match_score = data.get("match_score", 0)
                     job.match_reasoning = data.get("match_reasoning", "Evaluated by AI")
+                    job.persona_version = current_persona_version(persona)
                     
                     log_agent_action("ExternalProcessor", f"Evaluation complete. Score: {job.match_score}", "SUCCESS")
                     
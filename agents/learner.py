@@ -2,7 +2,8 @@ import os
 import glob
 import json
 from utils.llm_client import get_llm_response, clean_json_response
-from utils.persistence import save_json, load_json, SUCCESS_PERSONA_FILE, log_agent_action
+from utils.persistence import load_json, SUCCESS_PERSONA_FILE, log_agent_action
+from utils.persona import save_persona
 from backend.database import SessionLocal, JobPost
 
 class LearnerAgent:
@@ -95,7 +96,7 @@ class LearnerAgent:
             try:
                 cleaned_json = clean_json_response(response)
                 persona_data = json.loads(cleaned_json)
-                save_json(self.persona_file, persona_data)
+                save_persona(persona_data, "learner", self.persona_file)
                 log_agent_action("Learner", f"Success Persona established and saved to {self.persona_file}.", "SUCCESS")
                 return persona_data
             except Exception as e:
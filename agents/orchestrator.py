@@ -3,14 +3,36 @@ import time
 import asyncio
 import pandas as pd
 import os
+import json
 from datetime import datetime
 from job_scraper import scrape_all_jobs
 from agents.learner import LearnerAgent
 from agents.validator import ValidatorAgent
 from agents.corrector import SelfCorrectorAgent
 from agents.evaluator import EvaluatorAgent
-from utils.persistence import log_agent_action, get_config_value
-from backend.database import SessionLocal, JobPost, Config
+from utils.persistence import log_agent_action
+from utils.job_keys import canonicalize_link
+from utils import checkpoints, metrics, retention, config, embeddings, salary
+from utils.near_dup import (cluster_jobs, fingerprint, has_features, band_keys, similarity,
+                            encode_signature, decode_signature, SIMILARITY_THRESHOLD)
+from utils.persona import DEFAULT_PERSONA
+from backend.database import SessionLocal, JobPost, JobFingerprintBand, JobScore, ArchivedJobLink, Config, init_db
+
+PIPELINE_QUEUE_SIZE = 4 # Batches in flight between two stages; bounds memory and applies backpressure
+RESUME_BATCH_SIZE = 25 # Checkpointed jobs are replayed into a stage in batches of this size
+LINK_LOOKUP_CHUNK = 500 # Links per IN (...) query; stays under SQLite's bound-parameter limit
+_END_OF_STREAM = None
+
+class PipelineAborted(Exception):
+    """Raised by a stage to stop the whole cycle (e.g. the validator flagged a critical error)."""
+
+def _merge_alternate_links(row, links):
+    """Appends `links` to a stored job's alternate links, skipping its own link and repeats."""
+    merged = json.loads(row.alternate_links or "[]")
+    for link in links:
+        if link and link != row.link and link not in merged:
+            merged.append(link)
+    row.alternate_links = json.dumps(merged)
 
 class OrchestratorAgent:
     def __init__(self):
@@ -18,9 +40,17 @@ class OrchestratorAgent:
         self.validator = ValidatorAgent()
         self.corrector = SelfCorrectorAgent()
         self.evaluator = EvaluatorAgent()
+        # Set per cycle: industry check folded into the scoring call (see run_pipeline)
+        self.fused_pass = False
+        # Async job source for the pipeline; load tests swap in a synthetic feed
+        self.scraper = scrape_all_jobs
 
     def initialize(self):
         log_agent_action("Orchestrator", "System initializing...", "INFO")
+        init_db()
+        backfilled = salary.backfill()
+        if backfilled:
+            log_agent_action("Orchestrator", f"Parsed salaries of {backfilled} stored jobs.", "INFO")
         # Ensure persona exists
         if not os.path.exists(self.learner.persona_file):
             self.learner.build_persona()
@@ -30,74 +60,366 @@ class OrchestratorAgent:
     def run_cycle(self):
         log_agent_action("Orchestrator", f"Starting Cycle at {datetime.now()}", "INFO")
         
-        # 1. Scrape
-        log_agent_action("Orchestrator", "Launching Scraper...", "INFO")
+        # Scrape -> Validate -> Deduplicate -> Score -> Save, streamed page by page
         try:
-            raw_jobs = asyncio.run(scrape_all_jobs())
+            stats = asyncio.run(self.run_pipeline())
         except Exception as e:
-            log_agent_action("Orchestrator", f"Scraper failed with error: {e}", "ERROR")
-            return
-
-        if not raw_jobs:
-            log_agent_action("Orchestrator", "No jobs found this cycle.", "INFO")
+            log_agent_action("Orchestrator", f"Pipeline failed with error: {e}", "ERROR")
             return
 
-        # 2. Validate
-        validated_jobs = self.validator.validate_jobs(raw_jobs)
-        
-        # 3. Self-Correction Check
-        if self.validator.critical_error_flag:
+        # Self-Correction Check
+        if stats["aborted"]:
             log_agent_action("Orchestrator", "Critical error detected! Handing over to Self-Corrector.", "CRITICAL")
             self.corrector.attempt_repair()
             return
 
-        if not validated_jobs:
+        if not stats["scraped"]:
+            log_agent_action("Orchestrator", "No jobs found this cycle.", "INFO")
+        elif not stats["validated"]:
             log_agent_action("Orchestrator", "No jobs passed validation.", "INFO")
-            return
-
-        # 4. Deduplicate (against DB)
-        new_jobs = self.deduplicate(validated_jobs)
-        if not new_jobs:
+        elif not stats["new"]:
             log_agent_action("Orchestrator", "All jobs already seen.", "INFO")
-            return
 
-        # 5. Score
-        scored_jobs = self.evaluator.score_jobs(new_jobs)
+        log_agent_action("Orchestrator", f"Cycle complete. Scraped {stats['scraped']}, validated {stats['validated']}, new {stats['new']}, saved {stats['saved']}.", "SUCCESS")
+
+        # Embed the new jobs for similarity search
+        try:
+            added = embeddings.get_index().sync()
+            log_agent_action("Orchestrator", f"Embedding index updated with {added} jobs.", "INFO")
+        except Exception as e:
+            log_agent_action("Orchestrator", f"Embedding index update failed: {e}", "ERROR")
+
+        # Archive old logs and jobs and give the freed pages back
+        retention.run_retention()
+
+    async def run_pipeline(self):
+        """
+        Runs the cycle as concurrent stages joined by bounded queues.
+        Each scraped page flows through validation, dedup and scoring and is written
+        to the DB as soon as it is scored; a full queue blocks the stage feeding it.
+        Blocking LLM and DB calls run in worker threads so the scraper keeps going.
+        Every stage checkpoints its output, and a cycle left unfinished by a crash is
+        resumed here: each stage first replays the jobs checkpointed at its input.
+        """
+        # One config snapshot per cycle; API writes mid-cycle invalidate it
+        cfg = await asyncio.to_thread(config.refresh)
+        await asyncio.to_thread(self.evaluator.reload_persona)
+        # With both the industry check and scoring active, one LLM call per batch does both,
+        # after dedup; fused_llm_pass=false keeps separate validate -> dedup -> score calls
+        self.fused_pass = cfg.fused_llm_pass and bool(cfg.target_industries) and bool(self.evaluator.persona)
+        cycle_id, backlog, scrape_done, seen_keys = await asyncio.to_thread(checkpoints.start_or_resume_cycle)
+        metrics.start_run(cycle_id)
+        for stage, jobs in backlog.items():
+            metrics.incr("resumed_jobs", len(jobs), stage=stage.lower())
+        try:
+            return await self._run_stages(cycle_id, backlog, scrape_done, seen_keys)
+        finally:
+            run_id = await asyncio.to_thread(metrics.finish_run)
+            log_agent_action("Orchestrator", f"Run metrics stored (run {run_id}).", "INFO")
+
+    async def _run_stages(self, cycle_id, backlog, scrape_done, seen_keys):
+        stats = {"scraped": 0, "validated": 0, "new": 0, "saved": 0, "aborted": False, "scrape_failed": False, "save_failed": False}
+        scraped = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        validated = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        unique = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        scored = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        # Near-duplicate state of the cycle (see collapse_near_duplicates), restored on resume
+        cycle_index, alternates = await asyncio.to_thread(self.restore_collapse_state, cycle_id)
+
+        stages = [
+            asyncio.create_task(self._scrape_stage(scraped, stats, scrape_done, seen_keys)),
+            asyncio.create_task(self._validate_stage(cycle_id, scraped, validated, stats, backlog.get(checkpoints.SCRAPED))),
+            asyncio.create_task(self._dedup_stage(cycle_id, validated, unique, stats, backlog.get(checkpoints.VALIDATED), cycle_index, alternates)),
+            asyncio.create_task(self._score_stage(cycle_id, unique, scored, backlog.get(checkpoints.UNIQUE))),
+            asyncio.create_task(self._save_stage(cycle_id, scored, stats, backlog.get(checkpoints.SCORED), alternates)),
+        ]
+        try:
+            await asyncio.gather(*stages)
+        except PipelineAborted:
+            stats["aborted"] = True
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+
+        # Any other failure propagates and leaves the cycle RUNNING, to be resumed next run
+        if stats["aborted"]:
+            await asyncio.to_thread(checkpoints.finish_cycle, cycle_id, "ABORTED")
+        elif stats["scrape_failed"]:
+            log_agent_action("Orchestrator", f"Cycle {cycle_id} left open; the next run resumes scraping where it stopped.", "WARNING")
+        elif stats["save_failed"]:
+            log_agent_action("Orchestrator", f"Cycle {cycle_id} left open; the next run saves the scored jobs that failed to save.", "WARNING")
+        else:
+            await asyncio.to_thread(checkpoints.finish_cycle, cycle_id, "COMPLETED")
+        return stats
+
+    async def _stream(self, inbox, backlog=None):
+        """Yields a stage's checkpointed backlog first, then batches from its inbox until end of stream."""
+        backlog = backlog or []
+        for i in range(0, len(backlog), RESUME_BATCH_SIZE):
+            yield backlog[i:i + RESUME_BATCH_SIZE]
+        while True:
+            batch = await inbox.get()
+            if batch is _END_OF_STREAM:
+                return
+            yield batch
+
+    async def _scrape_stage(self, outbox, stats, scrape_done, seen_keys):
+        if scrape_done:
+            log_agent_action("Orchestrator", "Scraping already completed for this cycle; skipping.", "INFO")
+        else:
+            log_agent_action("Orchestrator", "Launching Scraper...", "INFO")
+            try:
+                # Keys already checkpointed are pre-claimed so their pages aren't fetched again
+                await self.scraper(sink=outbox, seen=seen_keys)
+            except Exception as e:
+                # Whatever was already streamed downstream is still processed
+                log_agent_action("Orchestrator", f"Scraper failed with error: {e}", "ERROR")
+                stats["scrape_failed"] = True
+        await outbox.put(_END_OF_STREAM)
+
+    async def _validate_stage(self, cycle_id, inbox, outbox, stats, backlog):
+        async for batch in self._stream(inbox, backlog):
+            await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, batch, checkpoints.SCRAPED)
+            stats["scraped"] += len(batch)
+            valid_jobs = await asyncio.to_thread(self.validator.validate_jobs, batch, not self.fused_pass)
+            if self.validator.critical_error_flag:
+                raise PipelineAborted()
+            valid_ids = {id(job) for job in valid_jobs}
+            await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, [j for j in batch if id(j) not in valid_ids], checkpoints.REJECTED)
+            await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, valid_jobs, checkpoints.VALIDATED)
+            stats["validated"] += len(valid_jobs)
+            if valid_jobs:
+                await outbox.put(valid_jobs)
+        # Only now is every scraped job durable, so a resumed cycle may skip scraping
+        if not stats["scrape_failed"]:
+            await asyncio.to_thread(checkpoints.mark_scrape_done, cycle_id)
+        await outbox.put(_END_OF_STREAM)
+
+    async def _dedup_stage(self, cycle_id, inbox, outbox, stats, backlog, cycle_index=None, alternates=None):
+        # Cycle-wide state so later batches are checked against earlier, not yet saved, ones
+        seen_links = set()
+        cycle_index = {} if cycle_index is None else cycle_index
+        async for batch in self._stream(inbox, backlog):
+            with metrics.timer("dedup"):
+                new_jobs = await asyncio.to_thread(self.deduplicate, batch, seen_links)
+            metrics.incr("jobs_in", len(batch), stage="dedup")
+            metrics.incr("jobs_out", len(new_jobs), stage="dedup")
+            if new_jobs:
+                new_jobs = await asyncio.to_thread(self.collapse_near_duplicates, new_jobs, cycle_index, alternates)
+            new_ids = {id(job) for job in new_jobs}
+            await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, [j for j in batch if id(j) not in new_ids], checkpoints.DUPLICATE)
+            await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, new_jobs, checkpoints.UNIQUE)
+            stats["new"] += len(new_jobs)
+            if new_jobs:
+                await outbox.put(new_jobs)
+        await outbox.put(_END_OF_STREAM)
+
+    async def _score_stage(self, cycle_id, inbox, outbox, backlog):
+        # Regroup into full evaluator batches so streaming doesn't add LLM calls
+        pending = []
+        async for batch in self._stream(inbox, backlog):
+            pending.extend(batch)
+            while len(pending) >= self.evaluator.batch_size:
+                chunk, pending = pending[:self.evaluator.batch_size], pending[self.evaluator.batch_size:]
+                await outbox.put(await self._score_chunk(cycle_id, chunk))
+        if pending:
+            await outbox.put(await self._score_chunk(cycle_id, pending))
+        await outbox.put(_END_OF_STREAM)
 
-        # 6. Save to DB
-        self.save_results_to_db(scored_jobs)
+    async def _score_chunk(self, cycle_id, chunk):
+        if self.fused_pass:
+            scored_jobs, rejected = await asyncio.to_thread(
+                self.evaluator.screen_and_score, chunk, config.get_config().target_industries)
+            await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, rejected, checkpoints.REJECTED)
+        else:
+            scored_jobs = await asyncio.to_thread(self.evaluator.score_jobs, chunk)
+        # Further candidates score the same jobs; one call per batch covers all of them
+        await asyncio.to_thread(self.evaluator.score_extra_personas, scored_jobs)
+        await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, scored_jobs, checkpoints.SCORED)
+        return scored_jobs
+
+    async def _save_stage(self, cycle_id, inbox, stats, backlog, alternates=None):
+        if backlog:
+            # A run that stopped between saving a batch and checkpointing it left those jobs SCORED
+            stored = await asyncio.to_thread(self.find_existing_links, [job.get('Link') for job in backlog])
+            await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, [j for j in backlog if j.get('Link') in stored], checkpoints.SAVED)
+            backlog = [job for job in backlog if job.get('Link') not in stored]
+        async for batch in self._stream(inbox, backlog):
+            saved = await asyncio.to_thread(self.save_results_to_db, batch)
+            stats["saved"] += saved
+            # A batch is saved in one transaction; a failed one stays SCORED to be retried on resume
+            if saved == len(batch):
+                await asyncio.to_thread(checkpoints.checkpoint_jobs, cycle_id, batch, checkpoints.SAVED)
+            else:
+                stats["save_failed"] = True
+        # Dedup has finished by now, so every collapsed link is known and its job stored
+        if alternates:
+            await asyncio.to_thread(self.attach_alternate_links, alternates)
+
+    def find_existing_links(self, links):
+        """
+        Returns which of `links` are already stored (or were archived by retention), using
+        chunked IN queries on the link indexes, so the cost scales with the batch rather than the table.
+        """
+        links = list(links)
+        found = set()
+        db = SessionLocal()
+        try:
+            for i in range(0, len(links), LINK_LOOKUP_CHUNK):
+                chunk = links[i:i + LINK_LOOKUP_CHUNK]
+                found.update(r[0] for r in db.query(JobPost.link).filter(JobPost.link.in_(chunk)))
+                found.update(r[0] for r in db.query(ArchivedJobLink.link).filter(ArchivedJobLink.link.in_(chunk)))
+            return found
+        finally:
+            db.close()
+
+    def deduplicate(self, jobs, seen_links=None):
+        """
+        Drops jobs whose canonical link is already stored or was seen earlier in the cycle.
+        seen_links: set of canonical links carried across the batches of one cycle.
+        """
+        seen_links = set() if seen_links is None else seen_links
         
-        log_agent_action("Orchestrator", "Cycle complete.", "SUCCESS")
+        candidates = []
+        for job in jobs:
+            # Handle both Title Case and lowercase keys just in case
+            link = job.get('Link') or job.get('link')
+            if link:
+                candidates.append((job, link.strip(), canonicalize_link(link, job.get('Source') or job.get('source'))))
+
+        # Rows stored before links were canonicalized may hold the raw form
+        stored = self.find_existing_links({raw for _, raw, _ in candidates} | {canonical for _, _, canonical in candidates})
+        
+        unique_jobs = []
+        for job, raw, canonical in candidates:
+            if canonical in seen_links or canonical in stored or raw in stored:
+                continue
+            unique_jobs.append(job)
+            seen_links.add(canonical)
+        
+        return unique_jobs
+
+    def collapse_near_duplicates(self, jobs, cycle_index=None, alternates=None):
+        """
+        Clusters near-duplicate postings so only one representative per role is scored.
+        Alternate links are kept on the representative; a cluster matching an already
+        stored posting is attached to that row instead of being scored again.
+        cycle_index: bucket -> in-flight representatives from earlier batches of this cycle.
+        alternates: link -> links collapsed into that in-flight representative, which may
+        already have been saved; attach_alternate_links() writes them once the cycle is saved.
+        """
+        with metrics.timer("near_dup"):
+            return self._collapse_near_duplicates(jobs, cycle_index, alternates)
+
+    def _collapse_near_duplicates(self, jobs, cycle_index, alternates):
+        representatives = []
+        for cluster in cluster_jobs(jobs):
+            representative = jobs[cluster[0]]
+            representative['alternate_links'] = [jobs[i].get('Link') for i in cluster[1:]]
+            representatives.append(representative)
 
-    def deduplicate(self, jobs):
         db = SessionLocal()
         try:
-            # Get all existing links
-            existing_links = {r[0] for r in db.query(JobPost.link).all()}
-            
-            unique_jobs = []
-            # We use a set to track links we've seen in this batch + existing DB links
-            seen_links = set(existing_links)
-            
-            for job in jobs:
-                # Handle both Title Case and lowercase keys just in case
-                link = job.get('Link') or job.get('link')
-                
-                if link:
-                    link = link.strip()
-                    if link not in seen_links:
-                        unique_jobs.append(job)
-                        seen_links.add(link)
-            
-            return unique_jobs
+            fresh_jobs = []
+            attached = 0
+            for job in representatives:
+                signature = fingerprint(job)
+                if not has_features(signature):
+                    job['fingerprint'] = None
+                    fresh_jobs.append(job)
+                    continue
+                job['fingerprint'] = encode_signature(signature)
+
+                # Candidates come from indexed bucket lookups, never a table scan
+                buckets = band_keys(signature)
+                candidate_ids = {r[0] for r in db.query(JobFingerprintBand.job_id)
+                                 .filter(JobFingerprintBand.bucket.in_(buckets))}
+                match = None
+                if candidate_ids:
+                    for candidate in db.query(JobPost).filter(JobPost.id.in_(candidate_ids)):
+                        if candidate.fingerprint and similarity(signature, decode_signature(candidate.fingerprint)) >= SIMILARITY_THRESHOLD:
+                            match = candidate
+                            break
+
+                in_flight = None
+                if not match and cycle_index is not None:
+                    for bucket in buckets:
+                        for other in cycle_index.get(bucket, ()):
+                            if similarity(signature, decode_signature(other['fingerprint'])) >= SIMILARITY_THRESHOLD:
+                                in_flight = other
+                                break
+                        if in_flight:
+                            break
+
+                if match:
+                    _merge_alternate_links(match, [job.get('Link')] + job['alternate_links'])
+                    attached += 1
+                elif in_flight:
+                    # Kept in the job's DUPLICATE checkpoint, so a resumed cycle can rebuild alternates
+                    job['duplicate_of'] = in_flight.get('Link')
+                    if alternates is not None:
+                        alternates.setdefault(in_flight.get('Link'), []).extend([job.get('Link')] + job['alternate_links'])
+                else:
+                    fresh_jobs.append(job)
+                    if cycle_index is not None:
+                        for bucket in buckets:
+                            cycle_index.setdefault(bucket, []).append(job)
+            db.commit()
+
+            metrics.incr("jobs_in", len(jobs))
+            metrics.incr("jobs_out", len(fresh_jobs))
+            metrics.incr("matched_stored", attached)
+            log_agent_action("Orchestrator", f"Near-duplicate check: {len(jobs)} jobs -> {len(representatives)} clusters, {attached} matched stored leads.", "INFO")
+            return fresh_jobs
+        finally:
+            db.close()
+
+    def restore_collapse_state(self, cycle_id):
+        """
+        Rebuilds (cycle_index, alternates) from a cycle's checkpoints: every job that passed
+        the near-duplicate check with a fingerprint, and every duplicate collapsed into one of them.
+        Empty for a new cycle.
+        """
+        cycle_index, alternates = {}, {}
+        for stage, job in checkpoints.cycle_jobs(cycle_id):
+            if stage == checkpoints.DUPLICATE:
+                if job.get('duplicate_of'):
+                    alternates.setdefault(job['duplicate_of'], []).extend([job.get('Link')] + (job.get('alternate_links') or []))
+            elif job.get('fingerprint'):
+                for bucket in band_keys(decode_signature(job['fingerprint'])):
+                    cycle_index.setdefault(bucket, []).append(job)
+        return cycle_index, alternates
+
+    def attach_alternate_links(self, alternates):
+        """Adds the links collapsed into in-flight jobs to their stored rows. Returns how many rows changed."""
+        db = SessionLocal()
+        try:
+            updated = 0
+            links = list(alternates)
+            for i in range(0, len(links), LINK_LOOKUP_CHUNK):
+                for row in db.query(JobPost).filter(JobPost.link.in_(links[i:i + LINK_LOOKUP_CHUNK])):
+                    _merge_alternate_links(row, alternates[row.link])
+                    updated += 1
+            db.commit()
+            return updated
         finally:
             db.close()
 
     def save_results_to_db(self, jobs):
+        """Saves scored jobs and returns how many rows were written."""
+        with metrics.timer("db_write"):
+            count = self._save_results(jobs)
+        metrics.incr("jobs_out", count, stage="db_write")
+        return count
+
+    def _save_results(self, jobs):
         db = SessionLocal()
         count = 0
+        new_rows = []
         try:
-            for job_data in jobs:
+            salaries = salary.records([job_data.get('Salary') for job_data in jobs])
+            for job_data, parsed_salary in zip(jobs, salaries):
                 # Convert date if needed
                 posted_date = job_data.get('Posted Date')
                 if isinstance(posted_date, datetime):
@@ -111,20 +433,40 @@ class OrchestratorAgent:
                     posted_date_text=job_data.get('Posted Date Text'),
                     posted_date=posted_date,
                     salary=job_data.get('Salary'),
+                    **parsed_salary,
                     applicants=job_data.get('Applicants'),
                     job_type=job_data.get('Job Type'),
                     source=job_data.get('Source'),
                     match_score=job_data.get('match_score', 0),
                     match_reasoning=job_data.get('match_reasoning', ""),
-                    is_external=False
+                    persona_version=job_data.get('persona_version'),
+                    persona_similarity=job_data.get('persona_similarity'),
+                    is_external=False,
+                    fingerprint=job_data.get('fingerprint'),
+                    alternate_links=json.dumps(job_data.get('alternate_links') or [])
                 )
                 db.add(new_job)
+                new_rows.append(new_job)
                 count += 1
+            
+            # Index fingerprints and store per-persona scores once row ids are assigned
+            db.flush()
+            for job_data, row in zip(jobs, new_rows):
+                if row.fingerprint:
+                    for bucket in band_keys(decode_signature(row.fingerprint)):
+                        db.add(JobFingerprintBand(bucket=bucket, job_id=row.id))
+                if job_data.get('persona_version') is not None:
+                    db.add(JobScore(job_id=row.id, persona=DEFAULT_PERSONA, score=row.match_score,
+                                    reasoning=row.match_reasoning, persona_version=row.persona_version))
+                for name, (score, reasoning, version) in (job_data.get('persona_scores') or {}).items():
+                    db.add(JobScore(job_id=row.id, persona=name, score=score, reasoning=reasoning, persona_version=version))
             db.commit()
             log_agent_action("Orchestrator", f"{count} new leads saved to Database.", "SUCCESS")
+            return count
         except Exception as e:
             db.rollback()
             log_agent_action("Orchestrator", f"Error saving to DB: {e}", "ERROR")
+            return 0
         finally:
             db.close()
 
@@ -136,7 +478,7 @@ class OrchestratorAgent:
         
         while True:
             # Dynamic Interval Check
-            interval_minutes = int(get_config_value("schedule_interval", "30"))
+            interval_minutes = config.get_config().schedule_interval
             log_agent_action("Orchestrator", f"Next run in {interval_minutes} minutes.", "INFO")
             
             # We sleep in short bursts to check for config changes or stop signals
@@ -1,49 +1,43 @@
-import json
-from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from models.job_model import JobPost
-from utils.persistence import log_agent_action, get_config_value
+from utils.persistence import log_agent_action
+from utils.config import get_config
 from utils.llm_client import get_llm_response, clean_json_response
+from utils import metrics
+from utils.dates import FreshnessPolicy
 
 class ValidatorAgent:
     def __init__(self):
         self.critical_error_flag = False
+        self.freshness = None # Loaded per validate_jobs call, from the current config snapshot
 
-    def validate_job(self, job: JobPost) -> bool:
+    def validate_job(self, job: JobPost, check_industry: bool = True) -> bool:
         """
         Validates a job post against rules and industry relevance.
+        check_industry=False skips the LLM industry check (done by the fused scoring pass instead).
         """
         # 1. Basic Data Integrity
         if not job.title:
             log_agent_action("Validator", f"Invalid job data: missing title", status="ERROR")
             return False
 
-        # 2. Date Check (7 Days)
-        if job.posted_date:
-            seven_days_ago = datetime.now() - timedelta(days=7)
-            # Ensure posted_date is datetime or date
-            if isinstance(job.posted_date, (datetime, str)):
-                 # If it's a string, we might need to parse it, but let's assume it's handled or we skip strict check for now
-                 pass
-            elif job.posted_date < seven_days_ago.date(): # Compare dates
-                log_agent_action("Validator", f"Job too old: {job.title} ({job.posted_date})", status="INFO")
-                return False
+        # 2. Date Check (per-source freshness window). The scrapers already drop stale
+        # listings; this catches jobs from other paths (resumed checkpoints, external adds).
+        # Runs before the LLM check so a stale job never costs a call.
+        freshness = self.freshness or FreshnessPolicy.from_config()
+        if job.posted_date and freshness.is_stale(job.posted_date, job.source):
+            log_agent_action("Validator", f"Job too old: {job.title} ({job.posted_date})", status="INFO")
+            metrics.incr("rejected_stale", source=job.source)
+            return False
 
-        # 3. Industry Validation (LLM)
-        target_industries_json = get_config_value("target_industries")
-        if target_industries_json:
-            try:
-                target_industries = json.loads(target_industries_json)
-                if target_industries:
-                    # We only check if we have a valid list
-                    # To avoid excessive API calls, we could limit this or cache it.
-                    # For now, we'll do it for every job as requested.
-                    is_relevant = self.check_industry_relevance(job, target_industries)
-                    if not is_relevant:
-                        log_agent_action("Validator", f"Job filtered out (Industry Mismatch): {job.title} at {job.company}", status="INFO")
-                        return False
-            except json.JSONDecodeError:
-                log_agent_action("Validator", "Error parsing target_industries config", status="ERROR")
+        # 3. Industry Validation (LLM), against the list parsed once per config snapshot
+        target_industries = get_config().target_industries if check_industry else None
+        if target_industries:
+            is_relevant = self.check_industry_relevance(job, target_industries)
+            if not is_relevant:
+                log_agent_action("Validator", f"Job filtered out (Industry Mismatch): {job.title} at {job.company}", status="INFO")
+                metrics.incr("rejected_industry", source=job.source)
+                return False
 
         log_agent_action("Validator", f"Job validated: {job.title}", status="SUCCESS")
         return True
@@ -76,11 +70,20 @@ class ValidatorAgent:
             log_agent_action("Validator", f"LLM Industry Check Failed: {e}", status="ERROR")
             return True
 
-    def validate_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def validate_jobs(self, jobs: List[Dict[str, Any]], check_industry: bool = True) -> List[Dict[str, Any]]:
         """
         Validates a list of job dictionaries.
         Returns only the valid jobs.
         """
+        self.freshness = FreshnessPolicy.from_config()
+        with metrics.timer("validate"):
+            valid_jobs = self._validate_all(jobs, check_industry)
+        metrics.incr("jobs_in", len(jobs), stage="validate")
+        metrics.incr("jobs_out", len(valid_jobs), stage="validate")
+        log_agent_action("Validator", f"Validated {len(valid_jobs)}/{len(jobs)} jobs", status="INFO")
+        return valid_jobs
+
+    def _validate_all(self, jobs: List[Dict[str, Any]], check_industry: bool = True) -> List[Dict[str, Any]]:
         valid_jobs = []
         for job_dict in jobs:
             # Convert dict to JobPost for validation
@@ -98,11 +101,9 @@ class ValidatorAgent:
                     source=job_dict.get('Source') or job_dict.get('source', '')
                 )
                 
-                if self.validate_job(job):
+                if self.validate_job(job, check_industry):
                     valid_jobs.append(job_dict)
             except Exception as e:
                 log_agent_action("Validator", f"Error validating job: {e}", status="ERROR")
                 continue
-        
-        log_agent_action("Validator", f"Validated {len(valid_jobs)}/{len(jobs)} jobs", status="INFO")
         return valid_jobs
@@ -1,9 +1,16 @@
 from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import date, datetime
-from backend.database import get_db, JobPost, AgentLog, Config, init_db
+import json
+from backend.database import get_db, JobPost, JobFingerprintBand, JobScore, AgentLog, Config, RunMetrics, init_db
+from utils import retention, score_cache, rescore, search
+from utils import persona as persona_versions
+from utils.config import get_config as get_config_snapshot, invalidate as invalidate_config
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(title="AI Job Portal API")
@@ -21,6 +28,13 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     init_db()
+    # Salary parsing needs pandas; only load it while rows are still unparsed
+    if get_config_snapshot().get("salary_backfilled") != "true":
+        from utils import salary
+        salary.backfill()
+    # Resume a re-score only if the previous process exited in the middle of one
+    if rescore.interrupted():
+        rescore.start()
 
 # --- Pydantic Schemas ---
 class JobPostSchema(BaseModel):
@@ -31,13 +45,20 @@ class JobPostSchema(BaseModel):
     link: str
     posted_date: Optional[date]
     salary: str
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    salary_day_rate: Optional[bool] = None
+    salary_currency: Optional[str] = None
     match_score: int
     match_reasoning: Optional[str]
+    persona_version: Optional[int] = None
+    persona_similarity: Optional[float] = None
     is_applied: bool
     user_remarks: Optional[str]
     user_feedback_comment: Optional[str]
     source: str
     is_external: bool
+    alternate_links: Optional[str]
     created_at: Optional[datetime]
 
     class Config:
@@ -63,6 +84,7 @@ class LogSchema(BaseModel):
 class ConfigSchema(BaseModel):
     key: str
     value: Optional[str] = ""
+    version: Optional[int] = None # On writes: the version the client read; omit to overwrite unconditionally
 
     class Config:
         orm_mode = True
@@ -70,9 +92,84 @@ class ConfigSchema(BaseModel):
 # --- Endpoints ---
 
 @app.get("/jobs", response_model=List[JobPostSchema])
-def get_jobs(db: Session = Depends(get_db)):
-    # Sort by match_score DESC, then posted_date DESC
-    return db.query(JobPost).order_by(JobPost.match_score.desc(), JobPost.posted_date.desc()).all()
+def get_jobs(persona: Optional[str] = None, min_salary: Optional[float] = None, max_salary: Optional[float] = None,
+             day_rate: Optional[bool] = None, sort: str = "score", db: Session = Depends(get_db)):
+    """
+    Jobs, best match first (sort=salary: highest annualized salary first).
+    min_salary/max_salary keep jobs whose annualized range overlaps the given one;
+    day_rate filters contract day-rate roles in or out. Filters skip jobs without a parsed salary.
+    """
+    named = persona and persona != persona_versions.DEFAULT_PERSONA
+    query = db.query(JobPost, JobScore).join(
+        JobScore, (JobScore.job_id == JobPost.id) & (JobScore.persona == persona)) if named else db.query(JobPost)
+    if min_salary is not None:
+        query = query.filter(JobPost.salary_max >= min_salary)
+    if max_salary is not None:
+        query = query.filter(JobPost.salary_min <= max_salary)
+    if day_rate is not None:
+        query = query.filter(JobPost.salary_day_rate.is_(day_rate))
+
+    score = JobScore.score if named else JobPost.match_score
+    if sort == "salary":
+        query = query.order_by(JobPost.salary_max.desc().nulls_last(), score.desc())
+    else:
+        # Sort by match_score DESC, then posted_date DESC
+        query = query.order_by(score.desc(), JobPost.posted_date.desc())
+    if not named:
+        return query.all()
+
+    # A named persona's view: the shared jobs with that persona's scores
+    rows = query.all()
+    return [_job_dict(job, match_score=s.score, match_reasoning=s.reasoning, persona_version=s.persona_version)
+            for job, s in rows]
+
+def _job_dict(job: JobPost, **overrides):
+    return {**{c.name: getattr(job, c.name) for c in JobPost.__table__.columns}, **overrides}
+
+def _ranked_jobs(db: Session, hits):
+    """JobPost rows for (job_id, similarity) hits, in hit order; ids since deleted or archived are skipped."""
+    jobs = {j.id: j for j in db.query(JobPost).filter(JobPost.id.in_([job_id for job_id, _ in hits]))}
+    return [_job_dict(jobs[job_id], similarity=round(sim, 4)) for job_id, sim in hits if job_id in jobs]
+
+@app.get("/jobs/search")
+def search_jobs(q: str, page: int = 1, page_size: int = 50, db: Session = Depends(get_db)):
+    """Ranked full-text search over title, company, location, salary, reasoning and remarks.
+    Supports "quoted phrases" and prefix* terms; all terms must match."""
+    total, hits = search.search_jobs(db, q, page, page_size)
+    jobs = {j.id: j for j in db.query(JobPost).filter(JobPost.id.in_([h["id"] for h in hits]))}
+    return {
+        "total": total,
+        "page": page,
+        "page_size": min(max(page_size, 1), search.MAX_PAGE_SIZE),
+        "results": [_job_dict(jobs[h["id"]], rank=h["rank"], snippet=h["snippet"]) for h in hits if h["id"] in jobs],
+    }
+
+@app.get("/jobs/semantic")
+def semantic_jobs(persona: str = "default", k: int = 20, db: Session = Depends(get_db)):
+    """Top-k jobs by embedding similarity to a persona's keywords and skills (no LLM call)"""
+    data = persona_versions.load_personas().get(persona)
+    if not data:
+        raise HTTPException(status_code=404, detail="Persona not found")
+    from utils import embeddings
+    index = embeddings.get_index()
+    index.sync()
+    query = index.encoder.encode([embeddings.persona_text(data)])[0]
+    # Over-fetch so rows removed since indexing don't shorten the list
+    return _ranked_jobs(db, index.search(query, k * 2))[:k]
+
+@app.get("/jobs/{job_id}/similar")
+def similar_jobs(job_id: int, k: int = 10, db: Session = Depends(get_db)):
+    """More like this: the k jobs most similar to the given one"""
+    job = db.query(JobPost).filter(JobPost.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    from utils import embeddings
+    index = embeddings.get_index()
+    index.sync()
+    query = index.vector(job_id)
+    if query is None:
+        query = index.encoder.encode([embeddings.job_text(job)])[0]
+    return _ranked_jobs(db, index.search(query, k * 2, exclude=[job_id]))[:k]
 
 @app.patch("/jobs/{job_id}", response_model=JobPostSchema)
 def update_job(job_id: int, update_data: JobUpdateSchema, db: Session = Depends(get_db)):
@@ -131,8 +228,13 @@ def add_external_job(job_data: ExternalJobSchema, background_tasks: BackgroundTa
 @app.delete("/jobs")
 def delete_jobs(job_ids: List[int], db: Session = Depends(get_db)):
     try:
+        db.query(JobFingerprintBand).filter(JobFingerprintBand.job_id.in_(job_ids)).delete(synchronize_session=False)
+        db.query(JobScore).filter(JobScore.job_id.in_(job_ids)).delete(synchronize_session=False)
         db.query(JobPost).filter(JobPost.id.in_(job_ids)).delete(synchronize_session=False)
         db.commit()
+        # SQLite reuses a deleted highest id, so its vector must go before the next insert
+        from utils import embeddings
+        embeddings.get_index().remove(job_ids)
         return {"message": f"Deleted {len(job_ids)} jobs"}
     except Exception as e:
         db.rollback()
@@ -147,6 +249,15 @@ def analyze_feedback(job_id: int, db: Session = Depends(get_db)):
     if not job.user_feedback_comment:
         return {"message": "No feedback to analyze"}
 
+    # Same feedback on the same scored job: reuse the analysis instead of another LLM call.
+    # The key leaves out the current reasoning, which the first analysis itself rewrites.
+    cache_key = score_cache.text_key("feedback", job.title, job.company, job.match_score, job.user_feedback_comment)
+    cached = score_cache.get_many([cache_key]).get(cache_key)
+    if cached:
+        job.match_reasoning = cached
+        db.commit()
+        return {"message": "Reasoning updated", "new_reasoning": cached}
+
     # Call LLM to analyze feedback
     from utils.llm_client import get_llm_response
     prompt = f"""
@@ -170,6 +281,7 @@ def analyze_feedback(job_id: int, db: Session = Depends(get_db)):
     if new_reasoning:
         job.match_reasoning = new_reasoning.strip()
         db.commit()
+        score_cache.put_many({cache_key: job.match_reasoning}, "feedback")
         return {"message": "Reasoning updated", "new_reasoning": new_reasoning}
     
     raise HTTPException(status_code=500, detail="Failed to generate analysis")
@@ -188,24 +300,116 @@ def clear_logs(db: Session = Depends(get_db)):
 def get_logs(limit: int = 50, db: Session = Depends(get_db)):
     return db.query(AgentLog).order_by(AgentLog.timestamp.desc()).limit(limit).all()
 
+# --- Retention ---
+
+@app.get("/maintenance/storage")
+def get_storage():
+    return retention.storage_stats()
+
+@app.post("/maintenance/retention")
+def trigger_retention():
+    """Archives logs and jobs past their retention policy now and reports the space reclaimed."""
+    if scraper_status["state"] == "RUNNING":
+        raise HTTPException(status_code=400, detail="Scraper is running; retention runs at the end of the cycle")
+    report = retention.run_retention()
+    if "error" in report:
+        raise HTTPException(status_code=500, detail=report["error"])
+    return report
+
+@app.post("/maintenance/vacuum")
+def enable_incremental_vacuum():
+    """Switches the database to incremental auto-vacuum: a one-off full VACUUM that locks the database while it runs."""
+    if scraper_status["state"] == "RUNNING":
+        raise HTTPException(status_code=400, detail="Scraper is running; switch the vacuum mode between cycles")
+    switched = retention.enable_incremental_vacuum()
+    return {"switched": switched, **retention.storage_stats()}
+
+@app.post("/maintenance/embeddings")
+def rebuild_embeddings():
+    """Re-embeds all jobs, dropping vectors of deleted or archived ones."""
+    from utils import embeddings
+    return {"indexed": embeddings.get_index().rebuild()}
+
+# --- Run Metrics ---
+
+def _run_metrics_dict(row: RunMetrics):
+    data = json.loads(row.data or "{}")
+    data.update({"id": row.id, "cycle_id": row.cycle_id, "started_at": row.started_at, "finished_at": row.finished_at})
+    return data
+
+@app.get("/metrics/runs")
+def get_run_metrics(limit: int = 20, db: Session = Depends(get_db)):
+    """Per-run stage timings and counters, newest first."""
+    rows = db.query(RunMetrics).order_by(RunMetrics.id.desc()).limit(limit).all()
+    return [_run_metrics_dict(row) for row in rows]
+
+@app.get("/metrics/runs/{run_id}")
+def get_run_metrics_detail(run_id: int, db: Session = Depends(get_db)):
+    row = db.query(RunMetrics).filter(RunMetrics.id == run_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return _run_metrics_dict(row)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_prometheus_metrics(db: Session = Depends(get_db)):
+    """Prometheus scrape target: running totals over all runs plus gauges for the latest one."""
+    from utils import metrics
+    latest = db.query(RunMetrics.data).order_by(RunMetrics.id.desc()).first()
+    return metrics.prometheus_text(metrics.totals(), json.loads(latest[0] or "{}") if latest else None)
+
 @app.get("/config", response_model=List[ConfigSchema])
 def get_config(db: Session = Depends(get_db)):
     return db.query(Config).all()
 
+def upsert_config(db: Session, configs: List[ConfigSchema]):
+    """
+    Writes config items in one transaction: one SELECT for all affected keys, then one
+    INSERT ... ON CONFLICT statement for the changed ones, bumping their versions.
+    An item whose version is stale and whose value differs from the stored one is a
+    conflict; then nothing is written and the current values are raised as a 409.
+    """
+    items = {c.key: c for c in configs}  # Last write for a key wins within one payload
+    current = {key: (value, version or 0) for key, value, version in
+               db.query(Config.key, Config.value, Config.version).filter(Config.key.in_(list(items)))}
+
+    conflicts, changed = [], []
+    for key, item in items.items():
+        value, version = current.get(key, (None, 0))
+        if key in current and value == item.value:
+            continue  # No-op, even from a stale editor
+        if item.version is not None and item.version != version:
+            conflicts.append({"key": key, "value": value, "version": version})
+            continue
+        changed.append({"key": key, "value": item.value, "version": version + 1})
+
+    if conflicts:
+        raise HTTPException(status_code=409, detail={"message": "Config was changed by someone else", "conflicts": conflicts})
+
+    if changed:
+        statement = sqlite_insert(Config).values(changed)
+        statement = statement.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"value": statement.excluded.value, "version": statement.excluded.version},
+            # Skips rows another writer changed since the SELECT above
+            where=func.coalesce(Config.version, 0) == statement.excluded.version - 1,
+        )
+        if db.execute(statement).rowcount != len(changed):
+            db.rollback()
+            raise HTTPException(status_code=409, detail={"message": "Config was changed by someone else", "conflicts": []})
+    db.commit()
+    # Drop cached snapshots only once the whole batch is committed
+    invalidate_config()
+    return {c["key"]: c["version"] for c in changed}
+
 @app.post("/config")
 def update_config(config: ConfigSchema, db: Session = Depends(get_db)):
     print(f"Received config update: {config}")
     try:
-        existing = db.query(Config).filter(Config.key == config.key).first()
-        if existing:
-            existing.value = config.value
-            print(f"Updated existing key: {config.key}")
-        else:
-            new_config = Config(key=config.key, value=config.value)
-            db.add(new_config)
-            print(f"Added new key: {config.key}")
-        db.commit()
-        return {"message": "Config updated"}
+        versions = upsert_config(db, [config])
+        return {"message": "Config updated", "versions": versions}
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         print(f"Error updating config: {e}")
         db.rollback()
@@ -215,24 +419,30 @@ def update_config(config: ConfigSchema, db: Session = Depends(get_db)):
 def update_config_bulk(configs: List[ConfigSchema], db: Session = Depends(get_db)):
     print(f"Received bulk config update: {len(configs)} items")
     try:
-        for config in configs:
-            existing = db.query(Config).filter(Config.key == config.key).first()
-            if existing:
-                existing.value = config.value
-            else:
-                new_config = Config(key=config.key, value=config.value)
-                db.add(new_config)
-        db.commit()
-        return {"message": "Bulk config updated"}
+        versions = upsert_config(db, configs)
+        return {"message": "Bulk config updated", "updated": len(versions), "versions": versions}
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         print(f"Error updating bulk config: {e}")
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-from fastapi import BackgroundTasks
-from agents.orchestrator import OrchestratorAgent
+import threading
+
+# The orchestrator pulls in the whole scraping and LLM stack (playwright, pandas, the agents),
+# so it is imported and built on the first run rather than when the API starts
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
 
-orchestrator = OrchestratorAgent()
+def get_orchestrator():
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            from agents.orchestrator import OrchestratorAgent
+            _orchestrator = OrchestratorAgent()
+        return _orchestrator
 
 # Global State for Scraper Status
 scraper_status = {
@@ -260,7 +470,7 @@ def trigger_run(background_tasks: BackgroundTasks):
 def run_orchestrator_wrapper():
     try:
         scraper_status["message"] = "Scraper running..."
-        orchestrator.run_cycle()
+        get_orchestrator().run_cycle()
         scraper_status["state"] = "IDLE"
         scraper_status["message"] = "Run complete"
     except Exception as e:
@@ -269,17 +479,30 @@ def run_orchestrator_wrapper():
         print(f"Orchestrator Error: {e}")
 
 # --- Persona Management ---
-import json
 import os
 
 PERSONA_FILE = "success_persona.json"
 
+def _persona_path(name: str) -> str:
+    if name == persona_versions.DEFAULT_PERSONA:
+        return PERSONA_FILE
+    try:
+        return persona_versions.persona_file(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/personas")
+def list_personas():
+    """Personas sharing the job corpus; each is scored into job_scores"""
+    return persona_versions.persona_names()
+
 @app.get("/persona")
-def get_persona():
-    """Get the current success persona"""
+def get_persona(name: str = persona_versions.DEFAULT_PERSONA):
+    """Get the current success persona (or a named one)"""
+    path = _persona_path(name)
     try:
-        if os.path.exists(PERSONA_FILE):
-            with open(PERSONA_FILE, 'r') as f:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
                 persona = json.load(f)
             return persona
         else:
@@ -288,11 +511,34 @@ def get_persona():
         raise HTTPException(status_code=500, detail=f"Error reading persona: {str(e)}")
 
 @app.post("/persona")
-def update_persona(persona: dict):
-    """Update the success persona"""
+def update_persona(persona: dict, name: str = persona_versions.DEFAULT_PERSONA):
+    """Update (or add) a persona; stored jobs are re-scored against it in the background"""
+    path = _persona_path(name)
     try:
-        with open(PERSONA_FILE, 'w') as f:
-            json.dump(persona, f, indent=4)
-        return {"message": "Persona updated successfully"}
+        version = persona_versions.save_persona(persona, "api", path, name)
+        rescore.start()
+        return {"message": "Persona updated successfully", "version": version}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating persona: {str(e)}")
+
+@app.get("/persona/rescore")
+def get_rescore_status():
+    """Progress of the background re-score"""
+    status = dict(rescore.rescore_status)
+    if status["state"] != "RUNNING":
+        version = persona_versions.current_version()
+        status["persona_version"] = version
+        status["remaining"] = persona_versions.outdated_count(version) if version is not None else 0
+    return status
+
+@app.post("/persona/rescore")
+def start_rescore():
+    """Re-scores jobs scored under an older persona version (resumes where the last run stopped)"""
+    if not rescore.start():
+        raise HTTPException(status_code=400, detail="Re-scoring is already running")
+    return {"message": "Re-scoring started in background"}
+
+@app.delete("/persona/rescore")
+def stop_rescore():
+    rescore.stop()
+    return {"message": "Re-scoring will stop after the current batch"}
@@ -1,10 +1,12 @@
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Text, DateTime, Date
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, Float, Text, DateTime, Date, LargeBinary, UniqueConstraint, Index, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import os
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./job_portal.db"
+# Overridable so tools like loadtest_pipeline.py can work on a scratch database
+SQLALCHEMY_DATABASE_URL = os.getenv("JOB_PORTAL_DB_URL", "sqlite:///./job_portal.db")
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
@@ -24,6 +26,11 @@ class JobPost(Base):
     posted_date_text = Column(String)
     posted_date = Column(Date, nullable=True)
     salary = Column(String)
+    # Parsed from salary at ingest (utils/salary.py): annualized range, day-rate flag, ISO currency
+    salary_min = Column(Float, nullable=True, index=True)
+    salary_max = Column(Float, nullable=True, index=True)
+    salary_day_rate = Column(Boolean, nullable=True, index=True)
+    salary_currency = Column(String, nullable=True)
     applicants = Column(String)
     job_type = Column(String)
     source = Column(String)
@@ -31,6 +38,8 @@ class JobPost(Base):
     # AI Scoring
     match_score = Column(Integer, default=0)
     match_reasoning = Column(Text)
+    persona_version = Column(Integer, nullable=True, index=True) # PersonaVersion.id that produced match_score
+    persona_similarity = Column(Float, nullable=True) # Embedding cosine similarity, set when the prefilter skipped the LLM
     
     # User Interaction
     is_applied = Column(Boolean, default=False)
@@ -38,8 +47,59 @@ class JobPost(Base):
     user_feedback_comment = Column(Text, nullable=True) # For Learner Agent
     is_external = Column(Boolean, default=False)
     
+    # Near-duplicate tracking
+    fingerprint = Column(Text, nullable=True) # MinHash signature, see utils/near_dup.py
+    alternate_links = Column(Text, nullable=True) # JSON list of the same posting on other boards
+    
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class JobFingerprintBand(Base):
+    """LSH band buckets for JobPost.fingerprint, so near-duplicate lookups are indexed."""
+    __tablename__ = "job_fingerprint_bands"
+
+    bucket = Column(String, primary_key=True, index=True)
+    job_id = Column(Integer, primary_key=True, index=True)
+
+class ScrapeCycle(Base):
+    """One orchestrator run; a cycle left RUNNING by a crash is resumed by the next run."""
+    __tablename__ = "scrape_cycles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+    status = Column(String, default="RUNNING", index=True) # "RUNNING", "COMPLETED", "ABORTED", "ABANDONED"
+    scrape_done = Column(Boolean, default=False)
+
+class CycleJob(Base):
+    """Checkpoint of one job's progress through a cycle (see utils/checkpoints.py)."""
+    __tablename__ = "cycle_jobs"
+    __table_args__ = (UniqueConstraint("cycle_id", "job_key"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    cycle_id = Column(Integer, index=True)
+    job_key = Column(String)
+    stage = Column(String, index=True) # "SCRAPED", "VALIDATED", "REJECTED", "UNIQUE", "DUPLICATE", "SCORED", "SAVED"
+    payload = Column(Text) # Job dict as JSON, including any score already paid for
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class RunMetrics(Base):
+    """Timings and counters of one orchestrator run (see utils/metrics.py)."""
+    __tablename__ = "run_metrics"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cycle_id = Column(Integer, index=True, nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    finished_at = Column(DateTime, nullable=True)
+    data = Column(Text) # JSON: {"wall_seconds", "stages": [...], "counters": [...]}
+
+class RunMetricsTotals(Base):
+    """Running sums over every stored run (a single row), so old run_metrics rows can be pruned."""
+    __tablename__ = "run_metrics_totals"
+
+    id = Column(Integer, primary_key=True)
+    data = Column(Text) # JSON: {"runs", "stages": [...], "counters": [...]}
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
 class AgentLog(Base):
     __tablename__ = "agent_logs"
 
@@ -49,14 +109,143 @@ class AgentLog(Base):
     message = Column(Text)
     status = Column(String) # "INFO", "SUCCESS", "ERROR", "CRITICAL"
 
+# --- Retention archives (see utils/retention.py) ---
+# Each archive row holds one chunk of moved rows as zlib-compressed JSON.
+
+class AgentLogArchive(Base):
+    __tablename__ = "agent_logs_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    first_id = Column(Integer)
+    last_id = Column(Integer)
+    row_count = Column(Integer)
+    oldest = Column(DateTime)
+    newest = Column(DateTime)
+    payload = Column(LargeBinary)
+
+class JobPostArchive(Base):
+    __tablename__ = "job_posts_archive"
+
+    id = Column(Integer, primary_key=True, index=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    first_id = Column(Integer)
+    last_id = Column(Integer)
+    row_count = Column(Integer)
+    oldest = Column(DateTime)
+    newest = Column(DateTime)
+    payload = Column(LargeBinary)
+
+class ArchivedJobLink(Base):
+    """Links of archived jobs, so a reappearing posting is still recognised as seen."""
+    __tablename__ = "archived_job_links"
+
+    link = Column(String, primary_key=True)
+
+class ScoreCache(Base):
+    """LLM results keyed by a hash of the job's content and the persona (see utils/score_cache.py)."""
+    __tablename__ = "score_cache"
+
+    key = Column(String, primary_key=True)
+    kind = Column(String) # "score", "fused", "feedback"
+    value = Column(Text) # JSON result
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_used = Column(DateTime, default=datetime.utcnow, index=True)
+    hits = Column(Integer, default=0)
+
+class JobScore(Base):
+    """Score of a job for one persona; the shared job corpus is scored once per persona."""
+    __tablename__ = "job_scores"
+    __table_args__ = (Index("ix_job_scores_persona_score", "persona", "score"),)
+
+    job_id = Column(Integer, primary_key=True, index=True)
+    persona = Column(String, primary_key=True)
+    score = Column(Integer, default=0)
+    reasoning = Column(Text)
+    persona_version = Column(Integer, nullable=True)
+    scored_at = Column(DateTime, default=datetime.utcnow)
+
+class PersonaVersion(Base):
+    """Every distinct Success Persona, in the order it took effect (see utils/persona.py)."""
+    __tablename__ = "persona_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, default="default", index=True) # Persona name; "default" is success_persona.json
+    content_hash = Column(String, index=True)
+    persona = Column(Text) # JSON
+    source = Column(String) # "api", "learner", "file"
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class PageSnapshot(Base):
+    """One fetch of a detail page; the HTML itself is a content-addressed blob (see utils/snapshots.py)."""
+    __tablename__ = "page_snapshots"
+    __table_args__ = (Index("ix_page_snapshots_link_fetched", "link", "fetched_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    link = Column(String)
+    source = Column(String, index=True)
+    kind = Column(String, default="detail")
+    content_hash = Column(String, index=True) # sha256 of the HTML, names the blob
+    size = Column(Integer) # Uncompressed bytes
+    fetched_at = Column(DateTime, default=datetime.utcnow, index=True)
+
 class Config(Base):
     __tablename__ = "config"
 
     key = Column(String, primary_key=True, index=True)
     value = Column(String)
+    version = Column(Integer, default=1) # Bumped on every change; writers send the version they read
+
+def migrate_columns():
+    """Adds columns and indexes introduced after a table was first created (create_all never alters)."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+# Full-text index over job_posts (external content: the text lives only in job_posts)
+FTS_COLUMNS = ("title", "company", "location", "salary", "match_reasoning", "user_remarks")
+
+def ensure_fts():
+    """Creates the FTS5 table and the triggers that keep it in sync; fills it on first creation."""
+    cols = ", ".join(FTS_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    with engine.begin() as conn:
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'job_posts_fts'")).first()
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS job_posts_fts USING fts5({cols}, "
+            f"content='job_posts', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS job_posts_fts_ai AFTER INSERT ON job_posts BEGIN "
+            f"INSERT INTO job_posts_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS job_posts_fts_ad AFTER DELETE ON job_posts BEGIN "
+            f"INSERT INTO job_posts_fts(job_posts_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"))
+        # Only edits to indexed text re-index a row; toggling is_applied etc. costs nothing
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS job_posts_fts_au AFTER UPDATE OF {cols} ON job_posts BEGIN "
+            f"INSERT INTO job_posts_fts(job_posts_fts, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+            f"INSERT INTO job_posts_fts(rowid, {cols}) VALUES (new.id, {new_cols}); END"))
+        if not exists:
+            conn.execute(text("INSERT INTO job_posts_fts(job_posts_fts) VALUES ('rebuild')"))
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite" and not inspect(conn).get_table_names():
+            # Only settable before the first table exists; existing databases switch via POST /maintenance/vacuum
+            conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        Base.metadata.create_all(bind=conn)
+    migrate_columns()
+    ensure_fts()
     db = SessionLocal()
     
     # Initialize default config if not exists
@@ -64,7 +253,16 @@ def init_db():
         "keywords": '["Technical Project Manager", "Product Owner"]',
         "location": "London",
         "schedule_interval": "30",
-        "target_industries": '["FinTech", "Capital Markets", "Asset Management", "Security Brokers", "Fund House", "Investment Banking"]'
+        "target_industries": '["FinTech", "Capital Markets", "Asset Management", "Security Brokers", "Fund House", "Investment Banking"]',
+        "log_retention_days": "14",
+        "log_max_rows": "50000",
+        "job_retention_days": "30",
+        "fused_llm_pass": "true",
+        "score_cache_ttl_days": "30",
+        "score_cache_max_entries": "50000",
+        "rescore_calls_per_minute": "10",
+        "snapshot_retention_days": "90",
+        "metrics_retention_days": "90"
     }
     
     for key, value in defaults.items():
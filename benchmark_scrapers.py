@@ -0,0 +1,160 @@
+"""
+Offline scraper benchmark.
+
+Record live listing and detail pages once, then replay them through the real scrapers
+with no network access and no politeness delays:
+
+    python benchmark_scrapers.py record --archive fixtures/scraper_replay --sources reed linkedin
+    python benchmark_scrapers.py replay --archive fixtures/scraper_replay --json bench.json
+    python benchmark_scrapers.py replay --archive fixtures/scraper_replay --baseline bench.json
+
+Replay reports pages/sec, jobs/sec and per-source page latency percentiles, and exits
+non-zero when jobs/sec falls more than --tolerance below a baseline report. A replay
+reads listing dates against the recording time and uses the freshness windows saved
+with the recording, so it finds the same pages and jobs however old the archive is and
+whatever the current config. It makes no LLM calls (TotalJobs detail fields stay N/A)
+and stores no page snapshots.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+import job_scraper
+from job_scraper import scrape_all_jobs
+from utils import metrics
+from utils.replay import FixtureArchive, recorder, replayer
+from utils.dates import FreshnessPolicy
+from backend.database import init_db
+
+DEFAULT_ARCHIVE = "fixtures/scraper_replay"
+DEFAULT_SOURCES = ['indeed', 'totaljobs', 'cwjobs', 'reed', 'glassdoor', 'linkedin']
+
+
+def record(archive_path, keywords, sources, test_mode):
+    archive = FixtureArchive(archive_path)
+    freshness = FreshnessPolicy.from_config()
+    jobs = asyncio.run(scrape_all_jobs(test_mode=test_mode, enabled_sources=sources, keywords=keywords,
+                                       setup_context=recorder(archive), freshness=freshness))
+    # Listing URLs embed the freshness windows; a replay must use the same ones
+    archive.save(keywords=keywords, sources=sources, test_mode=test_mode,
+                 freshness_days=freshness.default_days, freshness_days_by_source=freshness.by_source)
+    print(f"Recorded {len(archive.entries)} responses ({len(jobs)} jobs) to {archive_path}")
+
+
+def replay(archive_path):
+    archive = FixtureArchive(archive_path)
+    if not archive.entries:
+        print(f"No recorded responses in {archive_path}. Run 'record' first.")
+        sys.exit(2)
+
+    meta = archive.meta
+    misses = []
+    if "freshness_days" in meta:
+        freshness = FreshnessPolicy(meta["freshness_days"], meta.get("freshness_days_by_source"))
+    else:
+        print("Archive predates saved freshness windows; using the current config (listing URLs may miss).")
+        freshness = FreshnessPolicy.from_config()
+    job_scraper.POLITENESS = 0
+    job_scraper.CLOCK = datetime.fromisoformat(meta["recorded_at"]) if meta.get("recorded_at") else None
+    job_scraper.LLM_DETAILS = False
+    job_scraper.SNAPSHOT_PAGES = False
+    run = metrics.start_run()
+    start = time.perf_counter()
+    try:
+        jobs = asyncio.run(scrape_all_jobs(test_mode=meta.get("test_mode", False),
+                                           enabled_sources=meta.get("sources", DEFAULT_SOURCES),
+                                           keywords=meta.get("keywords"),
+                                           setup_context=replayer(archive, misses), freshness=freshness))
+    finally:
+        wall = time.perf_counter() - start
+        data = run.to_dict()
+        metrics.finish_run(store=False)
+
+    return build_report(data, wall, len(jobs), misses)
+
+
+def build_report(data, wall, job_count, misses):
+    counters = data["counters"]
+    pages = sum(c["value"] for c in counters if c["name"] == "requests")
+
+    sources = {}
+    for s in data["stages"]:
+        if not s["source"]:
+            continue
+        entry = sources.setdefault(s["source"], {"jobs": 0})
+        if s["stage"] == "scrape":
+            entry["seconds"] = s["seconds"]
+        elif s["stage"] in ("listing_fetch", "detail_fetch"):
+            entry[s["stage"]] = {"pages": s["count"], "p50": s["p50"], "p95": s["p95"]}
+    for c in counters:
+        if c["name"] == "jobs_out" and c["stage"] == "scrape" and c["source"] in sources:
+            sources[c["source"]]["jobs"] += c["value"]
+
+    return {
+        "wall_seconds": round(wall, 3),
+        "pages": pages,
+        "jobs": job_count,
+        "pages_per_sec": round(pages / wall, 2) if wall else 0,
+        "jobs_per_sec": round(job_count / wall, 2) if wall else 0,
+        "unrecorded_pages": len(misses),
+        "sources": sources,
+    }
+
+
+def print_report(report):
+    print(f"\nReplayed {report['pages']} pages, {report['jobs']} jobs in {report['wall_seconds']}s")
+    print(f"  {report['pages_per_sec']} pages/sec, {report['jobs_per_sec']} jobs/sec")
+    if report["unrecorded_pages"]:
+        print(f"  WARNING: {report['unrecorded_pages']} pages were not in the archive (served as 404)")
+    print(f"\n{'SOURCE':<12} {'JOBS':>5} {'SECS':>8} {'LIST p50/p95':>16} {'DETAIL p50/p95':>16}")
+    for source, s in sorted(report["sources"].items()):
+        listing = s.get("listing_fetch", {})
+        detail = s.get("detail_fetch", {})
+        print(f"{source:<12} {s['jobs']:>5} {s.get('seconds', 0):>8.2f} "
+              f"{listing.get('p50', 0):>7.3f}/{listing.get('p95', 0):<8.3f} "
+              f"{detail.get('p50', 0):>7.3f}/{detail.get('p95', 0):<8.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record job board pages and benchmark the scrapers against them offline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Scrape live and save every page to a fixture archive")
+    rec.add_argument("--archive", default=DEFAULT_ARCHIVE)
+    rec.add_argument("--keywords", nargs="+", default=["Technical Project Manager"])
+    rec.add_argument("--sources", nargs="+", default=DEFAULT_SOURCES)
+    rec.add_argument("--test-mode", action="store_true", help="Limit each source to 5 jobs")
+
+    rep = sub.add_parser("replay", help="Run the scrapers against a fixture archive and report throughput")
+    rep.add_argument("--archive", default=DEFAULT_ARCHIVE)
+    rep.add_argument("--json", help="Write the report to this file")
+    rep.add_argument("--baseline", help="Previous report to compare jobs/sec against")
+    rep.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional slowdown vs the baseline")
+
+    args = parser.parse_args()
+    init_db()
+
+    if args.command == "record":
+        record(args.archive, args.keywords, args.sources, args.test_mode)
+        return
+
+    report = replay(args.archive)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        floor = baseline["jobs_per_sec"] * (1 - args.tolerance)
+        if report["jobs_per_sec"] < floor:
+            print(f"\nREGRESSION: {report['jobs_per_sec']} jobs/sec is below {floor:.2f} (baseline {baseline['jobs_per_sec']})")
+            sys.exit(1)
+        print(f"\nOK: within {args.tolerance:.0%} of baseline ({baseline['jobs_per_sec']} jobs/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+API cold-start benchmark.
+
+Starts fresh interpreters that import backend.api, run the startup hook and serve one
+GET /jobs, and reports import time, time to the first response, peak RSS and which heavy
+dependencies got loaded along the way (none of them should be, until a run or an LLM
+endpoint needs them):
+
+    python benchmark_startup.py --repeat 5 --top 15
+    python benchmark_startup.py --json startup.json
+    python benchmark_startup.py --baseline startup.json
+
+Exits non-zero when the median time to first response is more than --tolerance above a
+baseline report. Uses a scratch SQLite database unless --db is given.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Modules the API must not need to serve /jobs
+HEAVY_MODULES = ["pandas", "numpy", "google.generativeai", "playwright", "schedule",
+                 "job_scraper", "agents.orchestrator", "agents.evaluator", "utils.embeddings", "utils.salary"]
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import backend.api
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(backend.api.app) as client:
+    started = time.perf_counter()
+    status = client.get("/jobs").status_code
+    first = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "startup_seconds": started - start,
+    "first_response_seconds": first - start,
+    "status": status,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_loaded": [m for m in HEAVY if m in sys.modules],
+}))
+"""
+
+
+def run_child(env, importtime=False):
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", f"HEAVY = {HEAVY_MODULES!r}\n" + CHILD]
+    proc = subprocess.run(args, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit(2)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def slowest_imports(importtime_log, top):
+    """(cumulative microseconds, module) of the slowest imports made by backend.api and the test client."""
+    rows = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+    # Nesting shows as indentation: one space for what the child imports, three for what those import
+    depth = lambda name: len(name) - len(name.lstrip(" "))
+    shallow = [(us, name.strip()) for us, name in rows if depth(name) == 3]
+    return sorted(shallow, reverse=True)[:top]
+
+
+def benchmark(db_url, repeat, top):
+    env = dict(os.environ, JOB_PORTAL_DB_URL=db_url, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    run_child(env)  # First run creates the schema and warms the OS file cache
+    runs = [run_child(env)[0] for _ in range(repeat)]
+    _, log = run_child(env, importtime=True)
+
+    def median(key):
+        return round(statistics.median(r[key] for r in runs), 3)
+
+    return {
+        "repeat": repeat,
+        "import_seconds": median("import_seconds"),
+        "startup_seconds": median("startup_seconds"),
+        "first_response_seconds": median("first_response_seconds"),
+        "max_rss_mb": round(statistics.median(r["max_rss_mb"] for r in runs), 1),
+        "heavy_loaded": runs[-1]["heavy_loaded"],
+        "slowest_imports": [{"module": m, "seconds": round(us / 1e6, 3)} for us, m in slowest_imports(log, top)],
+    }
+
+
+def print_report(report):
+    print(f"\nAPI cold start (median of {report['repeat']}):")
+    print(f"  import backend.api    {report['import_seconds']:.3f}s")
+    print(f"  startup hook done     {report['startup_seconds']:.3f}s")
+    print(f"  first GET /jobs       {report['first_response_seconds']:.3f}s")
+    print(f"  peak RSS              {report['max_rss_mb']:.1f} MiB")
+    print(f"  heavy modules loaded  {', '.join(report['heavy_loaded']) or 'none'}")
+    print(f"\n{'SLOWEST IMPORTS':<40} {'SECS':>7}")
+    for entry in report["slowest_imports"]:
+        print(f"{entry['module']:<40} {entry['seconds']:>7.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import time, time to first response and memory.")
+    parser.add_argument("--db", help="SQLite file to start against (default: a scratch file)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--baseline", help="Previous report to compare time to first response against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional slowdown vs the baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = args.db or os.path.join(scratch, "startup_bench.db")
+        report = benchmark(f"sqlite:///{os.path.abspath(db_path)}", args.repeat, args.top)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        ceiling = baseline["first_response_seconds"] * (1 + args.tolerance)
+        if report["first_response_seconds"] > ceiling:
+            print(f"\nREGRESSION: first response in {report['first_response_seconds']}s, above {ceiling:.3f}s "
+                  f"(baseline {baseline['first_response_seconds']}s)")
+            sys.exit(1)
+        print(f"\nOK: within {args.tolerance:.0%} of baseline ({baseline['first_response_seconds']}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ export default function ConfigPanel() {
         target_industries: [],
         enabled_sources: ['indeed', 'totaljobs', 'cwjobs', 'reed', 'glassdoor', 'linkedin']
     });
+    // Version of each key as loaded, sent back on save so stale tabs can't overwrite newer settings
+    const [versions, setVersions] = useState({});
     const [loading, setLoading] = useState(true);
     const [saveStatus, setSaveStatus] = useState(null);
     const [scraperStatus, setScraperStatus] = useState({ state: 'IDLE', message: '' });
@@ -52,7 +54,9 @@ export default function ConfigPanel() {
         try {
             const res = await axios.get(`${API_URL}/config`);
             const configData = {};
+            const versionData = {};
             res.data.forEach(item => {
+                versionData[item.key] = item.version ?? 0;
                 try {
                     configData[item.key] = JSON.parse(item.value);
                 } catch (e) {
@@ -60,6 +64,7 @@ export default function ConfigPanel() {
                 }
             });
             setConfig(prev => ({ ...prev, ...configData }));
+            setVersions(versionData);
             setLoading(false);
         } catch (err) {
             console.error("Error fetching config:", err);
@@ -170,14 +175,23 @@ export default function ConfigPanel() {
                 value: JSON.stringify(payload.enabled_sources || [])
             });
 
-            await axios.post(`${API_URL}/config/bulk`, bulkData);
+            await axios.post(`${API_URL}/config/bulk`, bulkData.map(item => ({
+                ...item,
+                version: versions[item.key] ?? 0
+            })));
             await fetchConfig();
 
             setSaveStatus('success');
             setTimeout(() => setSaveStatus(null), 3000);
         } catch (err) {
             console.error(err);
-            setSaveStatus('error');
+            if (err.response?.status === 409) {
+                // Saved from another tab meanwhile: show the latest settings instead of overwriting them
+                await fetchConfig();
+                setSaveStatus('conflict');
+            } else {
+                setSaveStatus('error');
+            }
         }
     };
 
@@ -329,6 +343,11 @@ export default function ConfigPanel() {
                             Error saving settings.
                         </span>
                     )}
+                    {saveStatus === 'conflict' && (
+                        <span className="text-error text-sm font-medium">
+                            Settings were changed elsewhere. The latest values are loaded; review and save again.
+                        </span>
+                    )}
                 </div>
 
                 {/* Persona Editor */}
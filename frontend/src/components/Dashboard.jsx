@@ -90,7 +90,6 @@ export default function Dashboard() {
             }
         };
         loadLayout();
-        fetchJobs();
     }, []);
 
     // Save settings (Debounced)
@@ -108,10 +107,46 @@ export default function Dashboard() {
         return () => clearTimeout(timeoutId);
     }, [columnOrder, columnWidths, rowHeight]);
 
+    // Job whose "more like this" results are shown instead of the full list
+    const [similarTo, setSimilarTo] = useState(null);
+
     const fetchJobs = async () => {
         try {
             const res = await axios.get(`${API_URL}/jobs`);
             setJobs(res.data);
+            setSimilarTo(null);
+        } catch (err) {
+            console.error(err);
+        }
+    };
+
+    // Full-text search runs on the server (FTS5); an empty box shows every job again
+    const [searchQuery, setSearchQuery] = useState('');
+
+    // Also does the initial load, with the box empty
+    useEffect(() => {
+        if (!searchQuery.trim()) {
+            fetchJobs();
+            return;
+        }
+        const timeoutId = setTimeout(async () => {
+            try {
+                const res = await axios.get(`${API_URL}/jobs/search`, { params: { q: searchQuery, page_size: 200 } });
+                setJobs(res.data.results);
+                setSimilarTo(null);
+            } catch (err) {
+                console.error(err);
+            }
+        }, 300);
+
+        return () => clearTimeout(timeoutId);
+    }, [searchQuery]);
+
+    const showSimilar = async (job) => {
+        try {
+            const res = await axios.get(`${API_URL}/jobs/${job.id}/similar`, { params: { k: 20 } });
+            setJobs(res.data);
+            setSimilarTo(job);
         } catch (err) {
             console.error(err);
         }
@@ -302,6 +337,10 @@ export default function Dashboard() {
         if (sortBy === 'posted_date' || sortBy === 'created_at') {
             aVal = aVal ? new Date(aVal) : new Date(0);
             bVal = bVal ? new Date(bVal) : new Date(0);
+        } else if (sortBy === 'salary') {
+            // Parsed server-side into annualized figures; unparsed salaries sort last
+            aVal = a.salary_max ?? -1;
+            bVal = b.salary_max ?? -1;
         }
 
         if (aVal < bVal) return sortOrder === 'asc' ? -1 : 1;
@@ -309,6 +348,14 @@ export default function Dashboard() {
         return 0;
     });
 
+    const parseLinks = (json) => {
+        try {
+            return (JSON.parse(json || '[]') || []).filter(link => link && link.startsWith('http'));
+        } catch (e) {
+            return [];
+        }
+    };
+
     const formatDate = (dateStr) => {
         if (!dateStr) return 'N/A';
         const date = new Date(dateStr);
@@ -571,6 +618,16 @@ export default function Dashboard() {
                         }}>
                             {job.location} • {job.source}
                         </div>
+                        {parseLinks(job.alternate_links).length > 0 && (
+                            <div style={{ fontSize: '0.75rem', opacity: 0.7 }}>
+                                Also on:{' '}
+                                {parseLinks(job.alternate_links).map((link, i) => (
+                                    <a key={i} href={link} target="_blank" rel="noopener noreferrer" style={{ marginRight: '0.4rem', color: 'var(--primary)' }}>
+                                        {new URL(link).hostname.replace('www.', '')}
+                                    </a>
+                                ))}
+                            </div>
+                        )}
                     </td>
                 );
             case 'company':
@@ -609,6 +666,14 @@ export default function Dashboard() {
                             >
                                 👍
                             </button>
+                            <button
+                                className="btn-icon"
+                                onClick={() => showSimilar(job)}
+                                title="More like this"
+                                style={{ padding: '4px' }}
+                            >
+                                ≈
+                            </button>
                             <a
                                 href={job.link}
                                 target="_blank"
@@ -643,6 +708,14 @@ export default function Dashboard() {
                     <span style={{ fontSize: '1.1rem', color: 'var(--text-secondary)' }}>
                         {filteredJobs.length} {filteredJobs.length === 1 ? 'job' : 'jobs'} found
                     </span>
+                    {similarTo && (
+                        <span style={{ fontSize: '0.95rem', color: 'var(--text-secondary)' }}>
+                            similar to <strong>{similarTo.title}</strong> at {similarTo.company}{' '}
+                            <button className="btn" style={{ padding: '0.25rem 0.75rem', fontSize: '0.8rem' }} onClick={fetchJobs}>
+                                Show all
+                            </button>
+                        </span>
+                    )}
                 </div>
                 <div style={{ display: 'flex', gap: '1rem', alignItems: 'center' }}>
                     {scraperStatus.state === 'RUNNING' && (
@@ -651,6 +724,14 @@ export default function Dashboard() {
                         </span>
                     )}
 
+                    <input
+                        type="text"
+                        placeholder='Search jobs ("phrase", prefix*)'
+                        value={searchQuery}
+                        onChange={(e) => setSearchQuery(e.target.value)}
+                        style={{ padding: '0.4rem 0.75rem', borderRadius: '6px', border: '1px solid var(--border)', minWidth: '240px' }}
+                    />
+
                     {/* View Settings Dropdown */}
                     <div style={{ position: 'relative' }}>
                         <button className="btn" onClick={() => setShowSettings(!showSettings)}>
@@ -1,82 +1,89 @@
 import asyncio
 from playwright.async_api import async_playwright
-import pandas as pd
 import urllib.parse
 import os
-from datetime import datetime, timedelta
 import re
-from utils.persistence import log_agent_action, get_config_value
-import json
+from datetime import datetime
+from utils.persistence import log_agent_action
+from utils.config import get_config
+from utils.job_keys import canonicalize_link, job_key
+from utils import metrics, snapshots, extractors, parse_pool
+from utils.export import export_jobs
+from utils.dates import parse_relative_date, FreshnessPolicy
 import random
 
-def parse_relative_date(date_str):
-    """Parses relative date strings like '3 days ago' or '17 October' into a datetime object."""
-    if not date_str or date_str == "N/A":
-        return None
-    
-    today = datetime.now()
-    date_str = date_str.lower().strip()
-    
-    # Clean up common prefixes like "published:", "posted:", "active:"
-    date_str = re.sub(r'^(published|posted|active):\s*', '', date_str)
-    date_str = date_str.strip()
-    
+def claim_job(job, seen):
+    """
+    Canonicalizes the job's link and reserves its key in the cycle-wide seen set.
+    Returns False if the posting was already claimed this cycle.
+    """
+    job["Link"] = canonicalize_link(job["Link"], job.get("Source"))
+    key = job_key(job)
+    if key is None:
+        return True
+    if key in seen:
+        metrics.incr("cycle_dedup_hits", source=job.get("Source"), stage="scrape")
+        return False
+    seen.add(key)
+    return True
+
+def is_stale(job, freshness):
+    """
+    True if the listing is older than its source's freshness window. Checked on the
+    listing card, so stale postings never cost a detail fetch or an LLM call.
+    """
+    if freshness.is_stale(job.get("Posted Date"), job.get("Source"), now=scrape_now()):
+        metrics.incr("skipped_stale", source=job.get("Source"), stage="scrape")
+        return True
+    return False
+
+# Multiplier for every delay between requests. Offline replays set it to 0 so
+# benchmarks measure scraping work rather than politeness.
+POLITENESS = 1.0
+# Offline replays also pin the clock to the recording time, so recorded card dates are
+# judged as they were when fetched, and make no LLM calls and keep no page snapshots
+CLOCK = None
+LLM_DETAILS = True
+SNAPSHOT_PAGES = True
+
+def scrape_now():
+    """The time listing dates are read against: CLOCK when pinned, else now."""
+    return CLOCK or datetime.now()
+
+async def polite_sleep(seconds):
+    """Waits between requests so we don't hammer the job boards."""
+    if POLITENESS > 0:
+        await asyncio.sleep(seconds * POLITENESS)
+
+async def fetch_page(page, url, source, kind, timeout):
+    """Navigates to a listing or detail page, recording its load time and request count."""
+    with metrics.timer(f"{kind}_fetch", source):
+        metrics.incr("requests", source=source)
+        return await page.goto(url, timeout=timeout)
+
+async def snapshot_page(link, html, source):
+    """Keeps a fetched detail page for re-extraction; hashing and compression run in the parse pool."""
+    if not html or not SNAPSHOT_PAGES or not get_config().snapshot_pages:
+        return
     try:
-        if "just posted" in date_str or "today" in date_str or date_str == "0 days ago":
-            return today
-        
-        if "yesterday" in date_str:
-            return today - timedelta(days=1)
-        
-        # Regex for "X days/weeks/months ago"
-        match = re.search(r'(\d+)\s+(day|week|month|hour|minute)s?\s+ago', date_str)
-        if match:
-            num = int(match.group(1))
-            unit = match.group(2)
-            
-            if unit == "day":
-                return today - timedelta(days=num)
-            elif unit == "week":
-                return today - timedelta(weeks=num)
-            elif unit == "month":
-                return today - timedelta(days=num*30)
-            elif unit == "hour":
-                return today - timedelta(hours=num)
-            elif unit == "minute":
-                return today - timedelta(minutes=num)
-        
-        # Handle dates like "17 October" or "21 November"
-        match = re.search(r'(\d+)\s+(january|february|march|april|may|june|july|august|september|october|november|december)', date_str)
-        if match:
-            day = int(match.group(1))
-            month_name = match.group(2)
-            
-            # Map month names to numbers
-            months = {
-                'january': 1, 'february': 2, 'march': 3, 'april': 4,
-                'may': 5, 'june': 6, 'july': 7, 'august': 8,
-                'september': 9, 'october': 10, 'november': 11, 'december': 12
-            }
-            month = months[month_name]
-            
-            # Assume current year, but if the date is in the future, use previous year
-            year = today.year
-            parsed_date = datetime(year, month, day)
-            if parsed_date > today:
-                parsed_date = datetime(year - 1, month, day)
-            
-            return parsed_date
-        
-        return None
-    except:
-        return None
+        content_hash = await parse_pool.run(snapshots.write_blob, html, snapshots.snapshot_dir())
+        await asyncio.to_thread(snapshots.record, link, content_hash, len(html.encode("utf-8")), source)
+    except Exception as e:
+        print(f"Could not snapshot {link}: {e}")
+
+async def emit_jobs(sink, jobs):
+    """Hands a page of scraped jobs to a streaming consumer, waiting while it is backed up."""
+    if sink is not None and jobs:
+        await sink.put(list(jobs))
 
-async def scrape_indeed(page, query, limit=None):
+async def scrape_indeed(page, query, limit=None, seen=None, sink=None, freshness=None):
     print(f"Scraping Indeed for: {query}")
     encoded_query = urllib.parse.quote(query)
     base_url = f"https://uk.indeed.com/jobs?q={encoded_query}&l=London&sort=date"
     
     all_jobs = []
+    seen = set() if seen is None else seen
+    freshness = freshness or FreshnessPolicy.from_config()
     
     # If limit is small, only scrape page 1
     pages_to_scrape = [0, 10, 20]
@@ -88,7 +95,7 @@ async def scrape_indeed(page, query, limit=None):
         url = f"{base_url}&start={start}"
         
         try:
-            await page.goto(url, timeout=60000)
+            await fetch_page(page, url, "Indeed", "listing", timeout=60000)
             try:
                 await page.wait_for_selector('.job_seen_beacon', timeout=10000)
             except:
@@ -99,6 +106,8 @@ async def scrape_indeed(page, query, limit=None):
             if not job_cards:
                 break
 
+            page_start = len(all_jobs)
+            stale_on_page = 0
             for card in job_cards:
                 if limit and len(all_jobs) >= limit:
                     break
@@ -122,26 +131,36 @@ async def scrape_indeed(page, query, limit=None):
                     posted_date_str = posted_date_str.replace("Active ", "").strip()
                     salary = await salary_el.inner_text() if salary_el else "N/A"
                     
-                    all_jobs.append({
+                    job = {
                         "Title": title,
                         "Company": company,
                         "Location": location,
                         "Link": link,
                         "Posted Date Text": posted_date_str,
-                        "Posted Date": parse_relative_date(posted_date_str),
+                        "Posted Date": parse_relative_date(posted_date_str, now=scrape_now()),
                         "Salary": salary,
                         "Applicants": "N/A",
                         "Job Type": "N/A",
                         "Apply Method": "Apply",
                         "Source": "Indeed"
-                    })
+                    }
+                    if is_stale(job, freshness):
+                        stale_on_page += 1
+                        continue
+                    if not claim_job(job, seen):
+                        continue
+                    all_jobs.append(job)
                 except Exception as e:
                     continue
             
+            await emit_jobs(sink, all_jobs[page_start:])
             if limit and len(all_jobs) >= limit:
                 break
+            # Results are sorted by date, so a page of only stale listings ends the search
+            if stale_on_page and len(all_jobs) == page_start:
+                break
                 
-            await asyncio.sleep(2)
+            await polite_sleep(2)
         except Exception as e:
             print(f"Error scraping Indeed page: {e}")
             break
@@ -152,26 +171,24 @@ async def scrape_indeed(page, query, limit=None):
 async def scrape_totaljobs_details(page, link):
     """Visits a TotalJobs job page and uses LLM to extract details intelligently."""
     try:
-        await page.goto(link, timeout=30000)
+        await fetch_page(page, link, "TotalJobs", "detail", timeout=30000)
         try:
             await page.wait_for_selector('h1', timeout=5000)
         except:
             pass
 
-        # Get the page content
+        # Get the page content, keeping a copy for later re-extraction
         page_content = await page.content()
+        snapshot = asyncio.create_task(snapshot_page(link, page_content, "TotalJobs"))
         
         # Use LLM to extract job details
-        from utils.llm_extractor import extract_job_details_with_llm
-        extracted_data = await extract_job_details_with_llm(page_content, link)
-        
-        return (
-            extracted_data.get("company", "N/A"),
-            extracted_data.get("salary", "N/A"),
-            extracted_data.get("location", "N/A"),
-            extracted_data.get("job_type", "N/A"),
-            extracted_data.get("posted_date", "N/A")
-        )
+        with metrics.timer("detail_extract", "TotalJobs"):
+            if LLM_DETAILS:
+                details = await extractors.totaljobs_details(page_content, link)
+            else:
+                details = (extractors.NA,) * len(extractors.FIELDS["TotalJobs"])
+        await snapshot
+        return details
         
     except Exception as e:
         print(f"Error extracting job details with LLM: {e}")
@@ -180,12 +197,13 @@ async def scrape_totaljobs_details(page, link):
 async def scrape_totaljobs(page, query):
     print(f"Scraping TotalJobs for: {query}")
     encoded_query = urllib.parse.quote(query)
-async def scrape_totaljobs(page, query, limit=None):
+async def scrape_totaljobs(page, query, limit=None, seen=None, sink=None, freshness=None):
     print(f"Scraping TotalJobs for: {query}")
     encoded_query = urllib.parse.quote(query)
-    base_url = f"https://www.totaljobs.com/jobs/{encoded_query}/in-london?radius=10&postedwithin=7"
-    
     all_jobs = []
+    seen = set() if seen is None else seen
+    freshness = freshness or FreshnessPolicy.from_config()
+    base_url = f"https://www.totaljobs.com/jobs/{encoded_query}/in-london?radius=10&postedwithin={freshness.days('TotalJobs')}"
     
     # If limit is small, only scrape page 1
     pages_to_scrape = range(1, 4)
@@ -197,7 +215,7 @@ async def scrape_totaljobs(page, query, limit=None):
         url = base_url if page_num == 1 else f"{base_url}/page-{page_num}"
     
         try:
-            await page.goto(url, timeout=60000)
+            await fetch_page(page, url, "TotalJobs", "listing", timeout=60000)
             try:
                 await page.wait_for_selector('a[href*="/job/"]', timeout=10000)
             except:
@@ -222,10 +240,7 @@ async def scrape_totaljobs(page, query, limit=None):
 
                     link = f"https://www.totaljobs.com{href}" if href.startswith("/") else href
 
-                    if any(j['Link'] == link for j in all_jobs):
-                        continue
-
-                    page_jobs.append({
+                    job = {
                         "Title": title.strip(),
                         "Company": "N/A",  # Will be filled from detail page
                         "Location": "N/A",  # Will be filled from detail page
@@ -237,7 +252,11 @@ async def scrape_totaljobs(page, query, limit=None):
                         "Job Type": "N/A",  # Will be filled from detail page
                         "Apply Method": "Apply",
                         "Source": "TotalJobs"
-                    })
+                    }
+                    # Claimed before the detail fetch so repeats never cost a page visit
+                    if not claim_job(job, seen):
+                        continue
+                    page_jobs.append(job)
                 except Exception as e:
                     continue
             
@@ -255,11 +274,14 @@ async def scrape_totaljobs(page, query, limit=None):
                     job["Location"] = location
                     job["Job Type"] = job_type
                     job["Posted Date Text"] = posted_date
-                    job["Posted Date"] = parse_relative_date(posted_date)
-                    await asyncio.sleep(1)  # Be polite
+                    job["Posted Date"] = parse_relative_date(posted_date, now=scrape_now())
+                    await polite_sleep(1)  # Be polite
             
+            # The date is only on the detail page; drop stale jobs before validation and scoring
+            page_jobs = [job for job in page_jobs if not is_stale(job, freshness)]
             all_jobs.extend(page_jobs)
-            await asyncio.sleep(2)
+            await emit_jobs(sink, page_jobs)
+            await polite_sleep(2)
         except Exception as e:
             print(f"Error scraping TotalJobs page: {e}")
             break
@@ -267,18 +289,20 @@ async def scrape_totaljobs(page, query, limit=None):
     print(f"Found {len(all_jobs)} jobs on TotalJobs.")
     return all_jobs
 
-async def scrape_cwjobs(page, query):
+async def scrape_cwjobs(page, query, seen=None, sink=None, freshness=None):
     print(f"Scraping CWJobs for: {query}")
     encoded_query = urllib.parse.quote(query)
     base_url = f"https://www.cwjobs.co.uk/jobs/{encoded_query}/in-london"
     
     all_jobs = []
+    seen = set() if seen is None else seen
+    freshness = freshness or FreshnessPolicy.from_config()
     for page_num in range(1, 4):
         print(f"  CWJobs Page {page_num}...")
         url = base_url if page_num == 1 else f"{base_url}/page-{page_num}"
     
         try:
-            await page.goto(url, timeout=60000)
+            await fetch_page(page, url, "CWJobs", "listing", timeout=60000)
             try:
                 await page.wait_for_selector('a[href*="/job/"]', timeout=10000)
             except:
@@ -289,6 +313,7 @@ async def scrape_cwjobs(page, query):
             if not job_links:
                 break
             
+            page_start = len(all_jobs)
             page_jobs_count = 0
             for link_el in job_links:
                 try:
@@ -324,22 +349,24 @@ async def scrape_cwjobs(page, query):
                     elif "Permanent" in card_text:
                         job_type = "Permanent"
 
-                    if any(j['Link'] == link for j in all_jobs):
-                        continue
-
-                    all_jobs.append({
+                    job = {
                         "Title": title.strip(),
                         "Company": "N/A",
                         "Location": "N/A",
                         "Link": link,
                         "Posted Date Text": posted_date_str,
-                        "Posted Date": parse_relative_date(posted_date_str),
+                        "Posted Date": parse_relative_date(posted_date_str, now=scrape_now()),
                         "Salary": salary,
                         "Applicants": "N/A",
                         "Job Type": job_type,
                         "Apply Method": "Apply",
                         "Source": "CWJobs"
-                    })
+                    }
+                    if is_stale(job, freshness):
+                        continue
+                    if not claim_job(job, seen):
+                        continue
+                    all_jobs.append(job)
                     page_jobs_count += 1
                 except Exception as e:
                     continue
@@ -347,7 +374,8 @@ async def scrape_cwjobs(page, query):
             if page_jobs_count == 0:
                 break
                 
-            await asyncio.sleep(2)
+            await emit_jobs(sink, all_jobs[page_start:])
+            await polite_sleep(2)
         except Exception as e:
             print(f"Error scraping CWJobs page: {e}")
             break
@@ -358,71 +386,30 @@ async def scrape_cwjobs(page, query):
 async def scrape_reed_details(page, link):
     """Visits a Reed job page to extract details."""
     try:
-        await page.goto(link, timeout=30000)
+        await fetch_page(page, link, "Reed", "detail", timeout=30000)
         try:
             await page.wait_for_selector('h1', timeout=5000)
         except:
             pass
 
-        # Extract posted date and company (e.g., "Yesterday by Grant Thornton" or "17 October by Gold Group Ltd")
-        posted_date_str = "N/A"
-        company = "N/A"
-        try:
-            # Look for the date/company line - avoid salary patterns with £
-            page_text = await page.content()
-            
-            # Try to find elements with date information
-            date_elements = await page.query_selector_all('span, div, time')
-            for el in date_elements:
-                text = await el.inner_text()
-                text = text.strip()
-                
-                # Skip if it contains £ (salary)
-                if '£' in text:
-                    continue
-                
-                # Look for "Yesterday by Company" or "17 October by Company"
-                match = re.search(r'(yesterday|\d+\s+\w+)\s+by\s+(.+)', text, re.IGNORECASE)
-                if match:
-                    posted_date_str = match.group(1).strip()
-                    company = match.group(2).strip()
-                    break
-                
-                # Look for just date patterns (without "by")
-                if not match and len(text) < 50:  # Short text only
-                    # Check for "Yesterday", "17 October", etc.
-                    if re.search(r'(yesterday|today|\d+\s+(january|february|march|april|may|june|july|august|september|october|november|december))', text, re.IGNORECASE):
-                        if 'by' not in text.lower():
-                            posted_date_str = text
-        except:
-            pass
-
-        # Extract job type (e.g., "Contract, full-time")
-        job_type = "N/A"
-        try:
-            # Look for job type keywords
-            page_text = await page.content()
-            if re.search(r'Permanent,?\s+full-time', page_text, re.IGNORECASE):
-                job_type = "Permanent, full-time"
-            elif 'Permanent' in page_text:
-                job_type = "Permanent"
-            elif re.search(r'Contract,?\s+full-time', page_text, re.IGNORECASE):
-                job_type = "Contract, full-time"
-            elif 'Contract' in page_text:
-                job_type = "Contract"
-        except:
-            pass
-        
-        return posted_date_str, company, job_type
+        page_content = await page.content()
+        snapshot = asyncio.create_task(snapshot_page(link, page_content, "Reed"))
+        # Parsed in a worker process so other pages keep loading meanwhile
+        with metrics.timer("detail_extract", "Reed"):
+            details = await parse_pool.run(extractors.reed_details, page_content)
+        await snapshot
+        return details
     except Exception as e:
         return "N/A", "N/A", "N/A"
 
-async def scrape_reed(page, query, limit=None):
+async def scrape_reed(page, query, limit=None, seen=None, sink=None, freshness=None):
     print(f"Scraping Reed for: {query}")
     encoded_keywords = urllib.parse.quote(query)
     base_url = f"https://www.reed.co.uk/jobs?keywords={encoded_keywords}&location=London&sortby=DisplayDate"
     
     all_jobs = []
+    seen = set() if seen is None else seen
+    freshness = freshness or FreshnessPolicy.from_config()
     
     # If limit is small, only scrape page 1
     pages_to_scrape = range(1, 4)
@@ -434,20 +421,20 @@ async def scrape_reed(page, query, limit=None):
         url = base_url if page_num == 1 else f"{base_url}&pageno={page_num}"
     
         try:
-            await page.goto(url, timeout=60000)
+            await fetch_page(page, url, "Reed", "listing", timeout=60000)
             
             if page_num == 1:
                 try:
-                    await asyncio.sleep(2)
+                    await polite_sleep(2)
                     reject_btn = await page.query_selector('button:has-text("Reject All")')
                     if reject_btn:
                         print("  Clicking 'Reject All' on Reed...")
                         await reject_btn.click()
-                        await asyncio.sleep(2)
+                        await polite_sleep(2)
                 except Exception as e:
                     print(f"  Cookie dialog handling: {e}")
             
-            await asyncio.sleep(2)
+            await polite_sleep(2)
             
             try:
                 await page.wait_for_selector('article.job-result, div[class*="job-card"], div[data-qa="job-card"]', timeout=10000)
@@ -495,22 +482,33 @@ async def scrape_reed(page, query, limit=None):
                     location = await location_el.inner_text() if location_el else "N/A"
                     salary = await salary_el.inner_text() if salary_el else "N/A"
 
-                    if any(j['Link'] == link for j in all_jobs):
-                        continue
+                    # Cards usually carry "17 October by Company"; enough to skip stale jobs before the detail fetch
+                    posted_date_str = "N/A"
+                    posted_el = await card.query_selector('[class*="posted-by"], [data-qa*="posted-by"]')
+                    if posted_el:
+                        date_match = re.search(r'(yesterday|today|\d+\s+\w+)\s+by\s', await posted_el.inner_text(), re.IGNORECASE)
+                        if date_match:
+                            posted_date_str = date_match.group(1)
 
-                    page_jobs.append({
+                    job = {
                         "Title": title.strip(),
                         "Company": "N/A",  # Will be filled from detail page
                         "Location": location.strip(),
                         "Link": link,
-                        "Posted Date Text": "N/A",  # Will be filled from detail page
-                        "Posted Date": None,
+                        "Posted Date Text": posted_date_str,  # Confirmed from detail page
+                        "Posted Date": parse_relative_date(posted_date_str, now=scrape_now()),
                         "Salary": salary.strip(),
                         "Applicants": "N/A",
                         "Job Type": "N/A",  # Will be filled from detail page
                         "Apply Method": "Apply",
                         "Source": "Reed"
-                    })
+                    }
+                    if is_stale(job, freshness):
+                        continue
+                    # Claimed before the detail fetch so repeats never cost a page visit
+                    if not claim_job(job, seen):
+                        continue
+                    page_jobs.append(job)
                 except Exception as e:
                     continue
             
@@ -523,14 +521,17 @@ async def scrape_reed(page, query, limit=None):
             for job in page_jobs:
                 if job["Link"] != "N/A":
                     posted_date, company, job_type = await scrape_reed_details(page, job["Link"])
-                    job["Posted Date Text"] = posted_date
-                    job["Posted Date"] = parse_relative_date(posted_date)
+                    if posted_date != "N/A":
+                        job["Posted Date Text"] = posted_date
+                        job["Posted Date"] = parse_relative_date(posted_date, now=scrape_now())
                     job["Company"] = company
                     job["Job Type"] = job_type
-                    await asyncio.sleep(1)  # Be polite
+                    await polite_sleep(1)  # Be polite
             
+            page_jobs = [job for job in page_jobs if not is_stale(job, freshness)]
             all_jobs.extend(page_jobs)
-            await asyncio.sleep(2)
+            await emit_jobs(sink, page_jobs)
+            await polite_sleep(2)
         except Exception as e:
             print(f"Error scraping Reed page: {e}")
             break
@@ -538,22 +539,23 @@ async def scrape_reed(page, query, limit=None):
     print(f"Found {len(all_jobs)} jobs on Reed.")
     return all_jobs
 
-async def scrape_glassdoor(page, query, limit=None):
+async def scrape_glassdoor(page, query, limit=None, seen=None, sink=None, freshness=None):
     print(f"Scraping Glassdoor for: {query}")
     encoded_query = urllib.parse.quote(query)
-    base_url = f"https://www.glassdoor.co.uk/Job/jobs.htm?sc.keyword={encoded_query}&locT=C&locId=2671300&fromAge=7"
-    
     all_jobs = []
+    seen = set() if seen is None else seen
+    freshness = freshness or FreshnessPolicy.from_config()
+    base_url = f"https://www.glassdoor.co.uk/Job/jobs.htm?sc.keyword={encoded_query}&locT=C&locId=2671300&fromAge={freshness.days('Glassdoor')}"
     print(f"  Glassdoor Page 1...")
     
     try:
-        await page.goto(base_url, timeout=60000)
+        await fetch_page(page, base_url, "Glassdoor", "listing", timeout=60000)
         
         try:
             accept_btn = await page.query_selector('button:has-text("Accept")')
             if accept_btn:
                 await accept_btn.click()
-                await asyncio.sleep(1)
+                await polite_sleep(1)
         except:
             pass
         
@@ -593,24 +595,28 @@ async def scrape_glassdoor(page, query, limit=None):
                 salary = await salary_el.inner_text() if salary_el else "N/A"
                 posted_date_str = await date_el.inner_text() if date_el else "N/A"
 
-                if any(j['Link'] == link for j in all_jobs):
-                    continue
-
-                all_jobs.append({
+                job = {
                     "Title": title.strip(),
                     "Company": company.strip(),
                     "Location": location.strip(),
                     "Link": link,
                     "Posted Date Text": posted_date_str,
-                    "Posted Date": parse_relative_date(posted_date_str),
+                    "Posted Date": parse_relative_date(posted_date_str, now=scrape_now()),
                     "Salary": salary.strip(),
                     "Applicants": "N/A",
                     "Job Type": "N/A",
                     "Apply Method": "Apply",
                     "Source": "Glassdoor"
-                })
+                }
+                if is_stale(job, freshness):
+                    continue
+                if not claim_job(job, seen):
+                    continue
+                all_jobs.append(job)
             except Exception as e:
                 continue
+        
+        await emit_jobs(sink, all_jobs)
     except Exception as e:
         print(f"Error scraping Glassdoor: {e}")
         
@@ -620,62 +626,30 @@ async def scrape_glassdoor(page, query, limit=None):
 async def scrape_linkedin_details(page, link):
     """Visits a LinkedIn job page to extract details."""
     try:
-        await page.goto(link, timeout=30000)
+        await fetch_page(page, link, "LinkedIn", "detail", timeout=30000)
         try:
             await page.wait_for_selector('.top-card-layout__entity-info', timeout=5000)
         except:
             pass
 
-        applicants = "N/A"
-        try:
-            app_el = await page.query_selector('.num-applicants__caption')
-            if app_el:
-                applicants = await app_el.inner_text()
-            else:
-                content = await page.content()
-                match = re.search(r'(\d+)\s+applicants?', content)
-                if match:
-                    applicants = f"{match.group(1)} applicants"
-        except:
-            pass
-
-        job_type = "N/A"
-        try:
-            badges = await page.query_selector_all('.job-details-jobs-unified-top-card__job-insight')
-            for badge in badges:
-                text = await badge.inner_text()
-                if "Remote" in text:
-                    job_type = "Remote"
-                    break
-                elif "Hybrid" in text:
-                    job_type = "Hybrid"
-                    break
-                elif "On-site" in text:
-                    job_type = "On-site"
-                    break
-        except:
-            pass
-
-        apply_method = "Apply"
-        try:
-            easy_apply_btn = await page.query_selector('button.jobs-apply-button--top-card')
-            if easy_apply_btn:
-                btn_text = await easy_apply_btn.inner_text()
-                if "Easy Apply" in btn_text:
-                    apply_method = "Easy Apply"
-        except:
-            pass
-        
-        return applicants.strip(), job_type, apply_method
+        page_content = await page.content()
+        snapshot = asyncio.create_task(snapshot_page(link, page_content, "LinkedIn"))
+        # Parsed in a worker process so other pages keep loading meanwhile
+        with metrics.timer("detail_extract", "LinkedIn"):
+            details = await parse_pool.run(extractors.linkedin_details, page_content)
+        await snapshot
+        return details
     except Exception as e:
         return "N/A", "N/A", "Apply"
 
-async def scrape_linkedin(page, query, limit=None):
+async def scrape_linkedin(page, query, limit=None, seen=None, sink=None, freshness=None):
     print(f"Scraping LinkedIn (Public) for: {query}")
     encoded_query = urllib.parse.quote(query)
-    base_url = f"https://www.linkedin.com/jobs/search?keywords={encoded_query}&location=London&f_TPR=r604800"
-    
     all_jobs = []
+    seen = set() if seen is None else seen
+    freshness = freshness or FreshnessPolicy.from_config()
+    # f_TPR is the listing age limit in seconds
+    base_url = f"https://www.linkedin.com/jobs/search?keywords={encoded_query}&location=London&f_TPR=r{freshness.days('LinkedIn') * 86400}"
     # If limit is small (e.g. 5), we only need the first page (start=0)
     pages_to_scrape = [0, 25, 50]
     if limit and limit <= 25:
@@ -686,7 +660,7 @@ async def scrape_linkedin(page, query, limit=None):
         url = f"{base_url}&start={start}"
         
         try:
-            await page.goto(url, timeout=60000)
+            await fetch_page(page, url, "LinkedIn", "listing", timeout=60000)
             try:
                 await page.wait_for_selector('.jobs-search__results-list', timeout=10000)
             except:
@@ -716,9 +690,6 @@ async def scrape_linkedin(page, query, limit=None):
                     location = await location_el.inner_text() if location_el else "N/A"
                     link = await link_el.get_attribute('href') if link_el else "N/A"
                     posted_date_str = await date_el.inner_text() if date_el else "N/A"
-                    
-                    if "?" in link:
-                        link = link.split("?")[0]
 
                     job_data = {
                         "Title": title.strip(),
@@ -726,7 +697,7 @@ async def scrape_linkedin(page, query, limit=None):
                         "Location": location.strip(),
                         "Link": link,
                         "Posted Date Text": posted_date_str.strip(),
-                        "Posted Date": parse_relative_date(posted_date_str.strip()),
+                        "Posted Date": parse_relative_date(posted_date_str.strip(), now=scrape_now()),
                         "Salary": "N/A",
                         "Applicants": "N/A",
                         "Job Type": "N/A",
@@ -734,6 +705,11 @@ async def scrape_linkedin(page, query, limit=None):
                         "Source": "LinkedIn"
                     }
                     
+                    if is_stale(job_data, freshness):
+                        continue
+                    # Claimed before the detail fetch so repeats never cost a page visit
+                    if not claim_job(job_data, seen):
+                        continue
                     page_jobs.append(job_data)
                 except Exception as e:
                     continue
@@ -749,13 +725,14 @@ async def scrape_linkedin(page, query, limit=None):
                     job["Applicants"] = applicants
                     job["Job Type"] = job_type
                     job["Apply Method"] = apply_method
-                    await asyncio.sleep(1)
+                    await polite_sleep(1)
             
             all_jobs.extend(page_jobs)
+            await emit_jobs(sink, page_jobs)
             if limit and len(all_jobs) >= limit:
                 break
                 
-            await asyncio.sleep(2)
+            await polite_sleep(2)
         except Exception as e:
             print(f"Error scraping LinkedIn page: {e}")
             break
@@ -763,147 +740,123 @@ async def scrape_linkedin(page, query, limit=None):
     print(f"Found {len(all_jobs)} jobs on LinkedIn.")
     return all_jobs
 
-async def scrape_all_jobs(test_mode=False, enabled_sources=None):
+async def scrape_all_jobs(test_mode=False, enabled_sources=None, sink=None, seen=None, keywords=None, setup_context=None,
+                          freshness=None):
     """
     Main function to scrape all configured job boards using keywords from the database.
     enabled_sources: list of source names to scrape (e.g., ['linkedin', 'reed'])
+    sink: optional bounded asyncio.Queue; each page of jobs is put on it as soon as it is
+          scraped (blocking while the consumer is behind) instead of being accumulated
+          into the returned list.
+    seen: optional set of job keys already claimed (e.g. by a resumed cycle); those
+          postings are skipped before any detail fetch.
+          Listings older than their source's freshness window (see utils.dates.FreshnessPolicy)
+          are dropped as soon as their date is known.
+    keywords: optional list overriding the configured keywords.
+    setup_context: optional async callable run on the browser context before scraping
+          (e.g. utils.replay.recorder / replayer).
+    freshness: optional FreshnessPolicy overriding the configured windows.
     """
-    # Fetch keywords from DB
-    keywords_json = get_config_value("keywords")
-    if not keywords_json:
-        log_agent_action("Scraper", "No keywords found in configuration. Using default.", status="WARNING")
-        keywords = ["Technical Project Manager"]
-    else:
-        try:
-            keywords = json.loads(keywords_json)
-        except json.JSONDecodeError:
-            keywords = [keywords_json] # Fallback if stored as plain string
+    cfg = get_config()
+
+    # Keywords and sources from the config snapshot unless given
+    if keywords is None:
+        if not cfg.get("keywords"):
+            log_agent_action("Scraper", "No keywords found in configuration. Using default.", status="WARNING")
+        keywords = cfg.keywords
 
-    # Fetch enabled sources from DB if not provided
     if enabled_sources is None:
-        sources_json = get_config_value("enabled_sources")
-        if sources_json:
-            try:
-                enabled_sources = json.loads(sources_json)
-            except json.JSONDecodeError:
-                enabled_sources = ['totaljobs', 'reed', 'glassdoor', 'linkedin']
-        else:
-            # Default to all sources
-            enabled_sources = ['indeed', 'totaljobs', 'cwjobs', 'reed', 'glassdoor', 'linkedin']
+        enabled_sources = cfg.enabled_sources
 
     log_agent_action("Scraper", f"Starting scrape for keywords: {keywords} (Test Mode: {test_mode})", status="INFO")
     log_agent_action("Scraper", f"Enabled sources: {enabled_sources}", status="INFO")
     
-    # Fetch jobs_per_source limit
-    jobs_per_source_str = get_config_value("jobs_per_source", "60")
-    try:
-        jobs_per_source = int(jobs_per_source_str)
-    except ValueError:
-        jobs_per_source = 60
-
     all_jobs = []
-    limit = 5 if test_mode else jobs_per_source
+    limit = 5 if test_mode else cfg.jobs_per_source
+    # Canonical keys of every posting claimed this cycle, shared across keywords and sources
+    seen = set() if seen is None else seen
+    freshness = freshness or FreshnessPolicy.from_config()
+    # Parse workers start up while the browser launches
+    warming = asyncio.create_task(asyncio.to_thread(parse_pool.warm))
     
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         context = await browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
         )
+        if setup_context:
+            await setup_context(context)
         page = await context.new_page()
+        await warming
         
         for keyword in keywords:
             log_agent_action("Scraper", f"Scraping for keyword: {keyword}", status="INFO")
             
             # Indeed
             if 'indeed' in enabled_sources:
-                indeed_jobs = await scrape_indeed(page, keyword, limit=limit)
-                all_jobs.extend(indeed_jobs)
+                with metrics.timer("scrape", "Indeed"):
+                    indeed_jobs = await scrape_indeed(page, keyword, limit=limit, seen=seen, sink=sink, freshness=freshness)
+                metrics.incr("jobs_out", len(indeed_jobs), source="Indeed", stage="scrape")
+                if sink is None:
+                    all_jobs.extend(indeed_jobs)
             
             # TotalJobs
             if 'totaljobs' in enabled_sources:
-                totaljobs_jobs = await scrape_totaljobs(page, keyword, limit=limit)
-                all_jobs.extend(totaljobs_jobs)
+                with metrics.timer("scrape", "TotalJobs"):
+                    totaljobs_jobs = await scrape_totaljobs(page, keyword, limit=limit, seen=seen, sink=sink, freshness=freshness)
+                metrics.incr("jobs_out", len(totaljobs_jobs), source="TotalJobs", stage="scrape")
+                if sink is None:
+                    all_jobs.extend(totaljobs_jobs)
             
             # CWJobs
             if 'cwjobs' in enabled_sources:
-                cwjobs_jobs = await scrape_cwjobs(page, keyword)
-                all_jobs.extend(cwjobs_jobs)
+                with metrics.timer("scrape", "CWJobs"):
+                    cwjobs_jobs = await scrape_cwjobs(page, keyword, seen=seen, sink=sink, freshness=freshness)
+                metrics.incr("jobs_out", len(cwjobs_jobs), source="CWJobs", stage="scrape")
+                if sink is None:
+                    all_jobs.extend(cwjobs_jobs)
             
             # Reed
             if 'reed' in enabled_sources:
-                reed_jobs = await scrape_reed(page, keyword, limit=limit)
-                all_jobs.extend(reed_jobs)
+                with metrics.timer("scrape", "Reed"):
+                    reed_jobs = await scrape_reed(page, keyword, limit=limit, seen=seen, sink=sink, freshness=freshness)
+                metrics.incr("jobs_out", len(reed_jobs), source="Reed", stage="scrape")
+                if sink is None:
+                    all_jobs.extend(reed_jobs)
             
             # Glassdoor
             if 'glassdoor' in enabled_sources:
-                glassdoor_jobs = await scrape_glassdoor(page, keyword, limit=limit)
-                all_jobs.extend(glassdoor_jobs)
+                with metrics.timer("scrape", "Glassdoor"):
+                    glassdoor_jobs = await scrape_glassdoor(page, keyword, limit=limit, seen=seen, sink=sink, freshness=freshness)
+                metrics.incr("jobs_out", len(glassdoor_jobs), source="Glassdoor", stage="scrape")
+                if sink is None:
+                    all_jobs.extend(glassdoor_jobs)
 
             # LinkedIn
             if 'linkedin' in enabled_sources:
-                linkedin_jobs = await scrape_linkedin(page, keyword, limit=limit)
-                all_jobs.extend(linkedin_jobs)
+                with metrics.timer("scrape", "LinkedIn"):
+                    linkedin_jobs = await scrape_linkedin(page, keyword, limit=limit, seen=seen, sink=sink, freshness=freshness)
+                metrics.incr("jobs_out", len(linkedin_jobs), source="LinkedIn", stage="scrape")
+                if sink is None:
+                    all_jobs.extend(linkedin_jobs)
             
             # Random delay between keywords to be polite
-            await asyncio.sleep(random.uniform(2, 5))
+            await polite_sleep(random.uniform(2, 5))
 
         await browser.close()
         
     return all_jobs
 
-def save_jobs_to_excel(jobs, filename):
+def save_jobs_to_excel(jobs, filename, formats=()):
+    """Saves jobs inside their source's freshness window (or undated) to `filename`; see utils/export.py. Returns the row count."""
     if not jobs:
         print("No jobs to save.")
-        return
+        return 0
 
-    df = pd.DataFrame(jobs)
-    
-    seven_days_ago = datetime.now() - timedelta(days=7)
-    
-    def is_recent_or_unknown(row):
-        date = row['Posted Date']
-        if pd.isna(date) or date == "N/A" or date is None:
-            return True
-        return date >= seven_days_ago
-
-    df = df[df.apply(is_recent_or_unknown, axis=1)]
-    df = df.sort_values(by='Posted Date', ascending=False, na_position='last')
-    df = df.drop(columns=['Posted Date'])
-    df = df.rename(columns={'Posted Date Text': 'Posted Date'})
-    
-    print(f"Total jobs to save (Recent + Unknown): {len(df)}")
-    
-    df.to_excel(filename, index=False)
-    
-    from openpyxl import load_workbook
-    from openpyxl.styles import Font
-    wb = load_workbook(filename)
-    ws = wb.active
-    
-    for column_cells in ws.columns:
-        length = max(len(str(cell.value) or "") for cell in column_cells)
-        col_letter = column_cells[0].column_letter
-        
-        if ws.cell(row=1, column=column_cells[0].column).value == "Link":
-            ws.column_dimensions[col_letter].width = 80
-        else:
-            ws.column_dimensions[col_letter].width = min(length + 2, 50)
-
-    link_col_idx = None
-    for col in range(1, ws.max_column + 1):
-        if ws.cell(row=1, column=col).value == "Link":
-            link_col_idx = col
-            break
-    
-    if link_col_idx:
-        for row in range(2, ws.max_row + 1):
-            cell = ws.cell(row=row, column=link_col_idx)
-            if cell.value and str(cell.value).startswith("http"):
-                cell.hyperlink = cell.value
-                cell.font = Font(color="0000FF", underline="single")
-    
-    wb.save(filename)
+    count = export_jobs(jobs, filename, formats)
+    print(f"Total jobs to save (Recent + Unknown): {count}")
     print(f"Saved to {filename}")
+    return count
 
 if __name__ == "__main__":
     jobs = asyncio.run(scrape_all_jobs())
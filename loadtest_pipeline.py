@@ -0,0 +1,306 @@
+"""
+End-to-end pipeline load test with synthetic job corpora.
+
+Seeds a scratch database to each requested size with synthetic postings, then drives
+validate, deduplicate, near-duplicate collapse, score, save, GET /jobs and the full
+streaming pipeline against it with a stubbed LLM, and reports throughput, latency and
+memory per stage:
+
+    python loadtest_pipeline.py --sizes 10000 100000 1000000 --batch 2000 --json loadtest.json
+
+Never point --db at job_portal.db; the tool writes to the database it is given.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+TITLES = ["Technical Project Manager", "Product Owner", "Product Manager", "Delivery Manager",
+          "Programme Manager", "Business Analyst", "Scrum Master", "Data Product Manager",
+          "IT Project Manager", "Change Manager", "Platform Product Owner", "Release Manager"]
+SENIORITY = ["", "", "Senior ", "Lead ", "Junior ", "Principal "]
+COMPANY_WORDS = ["Capital", "Markets", "Asset", "Fin", "Quant", "Ledger", "Brook", "Harbour", "Sterling",
+                 "Nova", "Apex", "Vertex", "Summit", "Bridge", "Crown", "Atlas", "Orbit", "Pillar"]
+COMPANY_SUFFIXES = ["Ltd", "Limited", "Group", "plc", "Partners", ""]
+LOCATIONS = ["London", "City of London", "Canary Wharf, London", "London (Hybrid)", "Remote", "Greater London"]
+SOURCES = [
+    ("Reed", "https://www.reed.co.uk/jobs/{slug}/{id}"),
+    ("TotalJobs", "https://www.totaljobs.com/job/{slug}/acme-job{id}"),
+    ("CWJobs", "https://www.cwjobs.co.uk/job/{slug}/acme-job{id}"),
+    ("Indeed", "https://uk.indeed.com/viewjob?jk={id:x}"),
+    ("LinkedIn", "https://www.linkedin.com/jobs/view/{id}"),
+    ("Glassdoor", "https://www.glassdoor.co.uk/job-listing/{slug}.htm?jl={id}"),
+]
+
+
+def _salary(rng, low):
+    style = rng.randrange(4)
+    if style == 0:
+        return f"£{low:,} - £{low + 10000:,}"
+    if style == 1:
+        return f"£{low // 1000}k - £{(low + 10000) // 1000}k"
+    if style == 2:
+        return f"Up to £{rng.choice([450, 550, 650, 750])} per day"
+    return "Competitive"
+
+
+class CorpusGenerator:
+    """Deterministic synthetic postings with configurable exact and near-duplicate rates."""
+
+    def __init__(self, seed, exact_dup_rate, near_dup_rate):
+        self.rng = random.Random(seed)
+        self.exact_dup_rate = exact_dup_rate
+        self.near_dup_rate = near_dup_rate
+        self.next_id = 1_000_000
+        self.sample = []  # Reservoir of generated postings that later jobs may duplicate
+        self.generated = 0
+
+    def _fresh(self):
+        rng = self.rng
+        self.next_id += 1
+        title = f"{rng.choice(SENIORITY)}{rng.choice(TITLES)}"
+        company = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.randint(1, 5000)} {rng.choice(COMPANY_SUFFIXES)}".strip()
+        return self._posting(title, company, rng.choice(LOCATIONS), rng.randrange(35, 120) * 1000, self.next_id)
+
+    def _posting(self, title, company, location, salary_low, job_id):
+        rng = self.rng
+        source, pattern = rng.choice(SOURCES)
+        posted = datetime.now() - timedelta(days=rng.randint(0, 6), hours=rng.randint(0, 23))
+        return {
+            "Title": title,
+            "Company": company,
+            "Location": location,
+            "Link": pattern.format(slug=re.sub(r'[^a-z0-9]+', '-', title.lower()), id=job_id),
+            "Posted Date Text": f"{(datetime.now() - posted).days} days ago",
+            "Posted Date": posted,
+            "Salary": _salary(rng, salary_low),
+            "Applicants": "N/A",
+            "Job Type": rng.choice(["Permanent", "Contract", "N/A"]),
+            "Apply Method": "Apply",
+            "Source": source,
+            "_salary_low": salary_low,
+        }
+
+    def job(self):
+        rng = self.rng
+        r = rng.random()
+        if self.sample and r < self.exact_dup_rate:
+            job = dict(rng.choice(self.sample))  # Same posting surfaced again
+        elif self.sample and r < self.exact_dup_rate + self.near_dup_rate:
+            base = rng.choice(self.sample)  # Same role on another board
+            self.next_id += 1
+            job = self._posting(base["Title"], base["Company"], base["Location"], base["_salary_low"], self.next_id)
+        else:
+            job = self._fresh()
+
+        self.generated += 1
+        if len(self.sample) < 20000:
+            self.sample.append(job)
+        elif rng.random() < 20000 / self.generated:
+            self.sample[rng.randrange(20000)] = job
+        return job
+
+    def batch(self, n):
+        return [self.job() for _ in range(n)]
+
+
+def stub_llm(latency):
+    """Canned Gemini stand-in that answers each prompt shape the agents send."""
+    rng = random.Random(7)
+
+    def respond(prompt, model_name):
+        if latency:
+            time.sleep(latency)
+        if "Respond with ONLY 'YES' or 'NO'" in prompt:
+            return "YES" if rng.random() < 0.85 else "NO"
+        count = len(re.findall(r'^\s*Job \d+:', prompt, re.MULTILINE))
+        wanted = re.findall(r'^\s*Score for: (.+)$', prompt, re.MULTILINE)
+        if wanted:
+            return json.dumps([{"job_number": i + 1, "persona": name.strip(), "score": rng.randint(20, 95),
+                                "reasoning": "Synthetic score."}
+                               for i, names in enumerate(wanted) for name in names.split(",")])
+        if count and '"relevant"' in prompt:
+            return json.dumps([{"job_number": i + 1, "relevant": rng.random() < 0.85, "score": rng.randint(20, 95),
+                                "reasoning": "Synthetic score."} for i in range(count)])
+        if count:
+            return json.dumps([{"job_number": i + 1, "score": rng.randint(20, 95), "reasoning": "Synthetic score."}
+                               for i in range(count)])
+        return json.dumps({"score": rng.randint(20, 95), "reasoning": "Synthetic score."})
+    return respond
+
+
+def _rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def measure(name, rows_in, fn, trace_memory):
+    """Runs one stage and returns its throughput/latency/memory figures alongside its result."""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    stage = {"stage": name, "rows_in": rows_in, "seconds": round(seconds, 3),
+             "rows_per_sec": round(rows_in / seconds, 1) if seconds else None,
+             "ms_per_row": round(seconds * 1000 / rows_in, 3) if rows_in else None,
+             "peak_rss_mb": _rss_mb()}
+    if trace_memory:
+        stage["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+    if isinstance(result, list):
+        stage["rows_out"] = len(result)
+    print(f"    {name:<14} {stage['rows_in']:>8} in {stage['seconds']:>8.3f}s  "
+          f"{stage['rows_per_sec'] or 0:>10.1f} rows/s  rss {stage['peak_rss_mb']} MB")
+    return stage, result
+
+
+def seed(generator, target_rows, with_fingerprints, chunk=5000):
+    """Bulk-inserts synthetic history until job_posts holds target_rows rows."""
+    from backend.database import SessionLocal, JobPost, JobFingerprintBand
+    from utils.near_dup import fingerprint, band_keys, encode_signature, has_features
+
+    db = SessionLocal()
+    try:
+        existing = db.query(JobPost).count()
+        start = time.perf_counter()
+        while existing < target_rows:
+            jobs = generator.batch(min(chunk, target_rows - existing))
+            rows, seen = [], set()
+            for job in jobs:
+                if job["Link"] in seen:
+                    continue
+                seen.add(job["Link"])
+                signature = fingerprint(job) if with_fingerprints else None
+                rows.append({
+                    "title": job["Title"], "company": job["Company"], "location": job["Location"],
+                    "link": job["Link"], "posted_date_text": job["Posted Date Text"],
+                    "posted_date": job["Posted Date"].date(), "salary": job["Salary"],
+                    "applicants": job["Applicants"], "job_type": job["Job Type"], "source": job["Source"],
+                    "match_score": generator.rng.randint(0, 100), "match_reasoning": "Seeded.",
+                    "is_applied": False, "is_external": False, "created_at": datetime.utcnow(),
+                    "fingerprint": encode_signature(signature) if signature and has_features(signature) else None,
+                })
+            # Skip links a previous chunk already stored
+            stored = {r[0] for r in db.query(JobPost.link).filter(JobPost.link.in_(list(seen)))} if existing else set()
+            rows = [r for r in rows if r["link"] not in stored]
+            if rows:
+                db.execute(JobPost.__table__.insert(), rows)
+                if with_fingerprints:
+                    fresh = [r["link"] for r in rows if r["fingerprint"]]
+                    ids = dict(db.query(JobPost.link, JobPost.id).filter(JobPost.link.in_(fresh)))
+                    bands = [{"bucket": b, "job_id": ids[r["link"]]}
+                             for r in rows if r["fingerprint"] for b in band_keys(tuple(int(v, 16) for v in r["fingerprint"].split(",")))]
+                    db.execute(JobFingerprintBand.__table__.insert(), bands)
+                db.commit()
+            existing += len(rows)
+        print(f"  Seeded to {existing} rows in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+
+def api_get_jobs():
+    """Times GET /jobs through the real app when the test client is available."""
+    try:
+        from fastapi.testclient import TestClient
+        from backend.api import app
+        client = TestClient(app)
+        return lambda: client.get("/jobs").json()
+    except (ImportError, RuntimeError):  # The test client raises RuntimeError when httpx is missing
+        from backend.api import get_jobs, _job_dict
+        from backend.database import SessionLocal
+
+        def call():
+            db = SessionLocal()
+            try:
+                return [_job_dict(j) for j in get_jobs(db=db)]
+            finally:
+                db.close()
+        return call
+
+
+def run_size(size, generator, args, orchestrator):
+    from utils import metrics
+
+    print(f"\n=== {size:,} rows ===")
+    seed(generator, size, not args.no_fingerprints)
+    batch = generator.batch(args.batch)
+    stages = []
+
+    stage, valid = measure("validate", len(batch), lambda: orchestrator.validator.validate_jobs(batch), args.trace_memory)
+    stages.append(stage)
+    stage, unique = measure("deduplicate", len(valid), lambda: orchestrator.deduplicate(valid), args.trace_memory)
+    stages.append(stage)
+    stage, fresh = measure("near_dup", len(unique), lambda: orchestrator.collapse_near_duplicates(unique), args.trace_memory)
+    stages.append(stage)
+    stage, scored = measure("score", len(fresh), lambda: orchestrator.evaluator.score_jobs(fresh), args.trace_memory)
+    stages.append(stage)
+    stage, _ = measure("save", len(scored), lambda: orchestrator.save_results_to_db(scored), args.trace_memory)
+    stages.append(stage)
+    get_jobs = api_get_jobs()
+    stage, listed = measure("api_get_jobs", size, get_jobs, args.trace_memory)
+    stages.append(stage)
+
+    # Full streaming pipeline over a fresh batch, fed in scraper-sized pages
+    pipeline_batch = generator.batch(args.batch)
+
+    async def synthetic_scraper(sink=None, seen=None, **kwargs):
+        for i in range(0, len(pipeline_batch), 25):
+            await sink.put(pipeline_batch[i:i + 25])
+        return []
+
+    orchestrator.scraper = synthetic_scraper
+    stage, stats = measure("pipeline", len(pipeline_batch), lambda: asyncio.run(orchestrator.run_pipeline()), args.trace_memory)
+    stage["pipeline_stats"] = stats
+    stages.append(stage)
+    return {"size": size, "batch": args.batch, "stages": stages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the scoring pipeline and API against synthetic corpora.")
+    parser.add_argument("--db", default="loadtest_job_portal.db", help="Scratch SQLite file (created if missing)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000], help="Table sizes to test, ascending")
+    parser.add_argument("--batch", type=int, default=1000, help="Jobs per simulated cycle")
+    parser.add_argument("--exact-dup-rate", type=float, default=0.25, help="Share of jobs re-surfacing an earlier link")
+    parser.add_argument("--near-dup-rate", type=float, default=0.15, help="Share of jobs reposting an earlier role on another board")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the stubbed LLM sleeps per call")
+    parser.add_argument("--no-fingerprints", action="store_true", help="Seed without near-duplicate fingerprints (faster)")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report tracemalloc peaks (slows stages)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    if os.path.basename(args.db) == "job_portal.db":
+        print("Refusing to load-test the live job_portal.db; pass a scratch --db.")
+        sys.exit(2)
+    os.environ["JOB_PORTAL_DB_URL"] = f"sqlite:///{args.db}"
+
+    # Imported after the DB URL is set so every module binds to the scratch database
+    from backend.database import init_db
+    from utils.llm_client import set_llm_override
+    from agents.orchestrator import OrchestratorAgent
+
+    init_db()
+    set_llm_override(stub_llm(args.llm_latency))
+    orchestrator = OrchestratorAgent()
+    generator = CorpusGenerator(args.seed, args.exact_dup_rate, args.near_dup_rate)
+
+    report = {"started_at": datetime.now().isoformat(), "db": args.db, "runs": []}
+    for size in sorted(args.sizes):
+        report["runs"].append(run_size(size, generator, args, orchestrator))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
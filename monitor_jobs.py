@@ -1,9 +1,9 @@
 import asyncio
-import pandas as pd
 import os
-import glob
 from datetime import datetime
 from job_scraper import scrape_all_jobs, save_jobs_to_excel
+from utils.export import links_path
+from utils.seen_links import SeenLinksStore
 from plyer import notification
 
 def send_notification(title, message):
@@ -18,46 +18,6 @@ def send_notification(title, message):
     except Exception as e:
         print(f"Notification error: {e}")
 
-def get_seen_links(directory="."):
-    """
-    Builds a set of all job links seen in the latest main file and subsequent new_jobs files.
-    """
-    seen_links = set()
-    
-    # 1. Find the latest main file (jobs_v*.xlsx or jobs_master.xlsx)
-    # We look for files starting with "jobs_" but NOT "new_jobs_"
-    main_files = [f for f in glob.glob(os.path.join(directory, "jobs_*.xlsx")) 
-                  if not os.path.basename(f).startswith("new_jobs_")]
-    
-    latest_main_file = None
-    if main_files:
-        latest_main_file = max(main_files, key=os.path.getmtime)
-        print(f"Latest main file: {latest_main_file}")
-        try:
-            df = pd.read_excel(latest_main_file)
-            if 'Link' in df.columns:
-                seen_links.update(df['Link'].astype(str).tolist())
-        except Exception as e:
-            print(f"Error reading {latest_main_file}: {e}")
-            
-    # 2. Find all new_jobs_*.xlsx files created AFTER the main file
-    new_files = glob.glob(os.path.join(directory, "new_jobs_*.xlsx"))
-    
-    for f in new_files:
-        # If we have a main file, only check new_jobs files that are newer than it
-        if latest_main_file and os.path.getmtime(f) <= os.path.getmtime(latest_main_file):
-            continue
-            
-        try:
-            df = pd.read_excel(f)
-            if 'Link' in df.columns:
-                seen_links.update(df['Link'].astype(str).tolist())
-        except Exception as e:
-            print(f"Error reading {f}: {e}")
-            
-    print(f"Total seen jobs loaded: {len(seen_links)}")
-    return seen_links
-
 def main():
     print("Starting monitoring job...")
     
@@ -67,8 +27,13 @@ def main():
         print("No jobs found during this run.")
         return
 
-    # 2. Get set of already seen links
-    seen_links = get_seen_links()
+    # 2. Look this batch up in the seen-links store (picking up any exports written elsewhere)
+    store = SeenLinksStore()
+    imported = store.sync()
+    if imported:
+        print(f"Imported {imported} links from new export files.")
+    seen_links = store.seen(job['Link'] for job in current_jobs)
+    print(f"{len(seen_links)} of {len(current_jobs)} jobs already seen ({len(store)} links in store).")
     
     # 3. Identify new jobs
     new_jobs = [job for job in current_jobs if job['Link'] not in seen_links]
@@ -81,33 +46,29 @@ def main():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         new_filename = f"new_jobs_{timestamp}.xlsx"
         
-        # save_jobs_to_excel will filter out old jobs. 
-        # We need to check if any remained after saving.
-        save_jobs_to_excel(new_jobs, new_filename)
+        # save_jobs_to_excel will filter out old jobs and returns how many remained.
+        count = save_jobs_to_excel(new_jobs, new_filename)
         
-        # Check if file was created and has rows
-        if os.path.exists(new_filename):
-            try:
-                df = pd.read_excel(new_filename)
-                if not df.empty:
-                    count = len(df)
-                    print(f"Successfully saved {count} new jobs to {new_filename}")
-                    
-                    # Send notification
-                    send_notification(
-                        title="New Jobs Found!",
-                        message=f"Found {count} new job postings"
-                    )
-                else:
-                    print("New jobs were found but filtered out (older than 7 days).")
-                    os.remove(new_filename) # Clean up empty file
-            except:
-                pass
+        if count:
+            store.add_file(new_filename)
+            print(f"Successfully saved {count} new jobs to {new_filename}")
+            
+            # Send notification
+            send_notification(
+                title="New Jobs Found!",
+                message=f"Found {count} new job postings"
+            )
+        elif os.path.exists(new_filename):
+            print("New jobs were found but filtered out (older than 7 days).")
+            os.remove(new_filename) # Clean up empty file
+            if os.path.exists(links_path(new_filename)):
+                os.remove(links_path(new_filename))
         else:
             print("No jobs saved (likely all filtered out).")
         
     else:
         print("No new jobs found since last run.")
+    store.close()
 
 if __name__ == "__main__":
     main()
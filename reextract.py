@@ -0,0 +1,204 @@
+"""
+Re-extraction from stored page snapshots.
+
+Replays the newest stored detail page of every job still in the database through the
+current extractors (utils/extractors.py) in a process pool, and writes back the fields
+that changed, so an improved extractor or LLM prompt reaches old jobs without
+re-crawling the boards:
+
+    python reextract.py run --sources Reed LinkedIn --dry-run
+    python reextract.py run --since-days 14 --workers 8
+    python reextract.py run --sources TotalJobs --llm-calls-per-minute 10
+    python reextract.py stats
+    python reextract.py prune --days 90
+
+Boards whose extractor calls the LLM (TotalJobs) are only replayed when named in
+--sources, one page at a time at no more than --llm-calls-per-minute (default
+rescore_calls_per_minute); a dry run skips them. Relative posted dates ("3 days ago")
+are resolved against the snapshot's fetch time.
+"""
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from backend.database import init_db, SessionLocal, JobPost
+from utils.persistence import log_agent_action
+from utils.dates import parse_relative_date
+from utils.config import get_config
+from utils import extractors, salary, snapshots
+
+CHUNK_SIZE = 500 # Snapshots read, extracted and written back per step
+LLM_CHUNK_SIZE = 10 # Per step for LLM extractors, so an interrupted run loses few paid calls
+
+# Job dict keys the extractors fill, and the JobPost columns they are stored in
+COLUMNS = {
+    "Company": "company",
+    "Salary": "salary",
+    "Location": "location",
+    "Job Type": "job_type",
+    "Posted Date Text": "posted_date_text",
+    "Applicants": "applicants",
+}
+
+
+def _extract(task):
+    """Worker: loads one snapshot and runs its source's extractor. Returns (job id, fields or error)."""
+    job_id, source, link, content_hash, directory = task
+    try:
+        html = snapshots.read_blob(content_hash, directory)
+        return job_id, extractors.extract(source, html, link)
+    except Exception as e:
+        return job_id, e
+
+
+def _changes(row, fields, fetched_at):
+    """Column updates for `row`; an extractor's "N/A" never overwrites a stored value."""
+    values = {}
+    for key, value in fields.items():
+        column = COLUMNS.get(key)
+        if column and value and value != extractors.NA and value != getattr(row, column):
+            values[column] = value
+    if "posted_date_text" in values:
+        posted = parse_relative_date(values["posted_date_text"], now=fetched_at)
+        if posted is not None:
+            values["posted_date"] = posted.date()
+    if "salary" in values:
+        values.update(salary.parse_salary(values["salary"]))
+    return values
+
+
+def _latest_rows(db, sources, since):
+    """Jobs joined to the newest snapshot of their link, in id order."""
+    latest = snapshots.latest_query(db, sources, since).subquery()
+    return (db.query(JobPost, latest.c.source, latest.c.content_hash, latest.c.fetched_at)
+            .join(latest, latest.c.link == JobPost.link)
+            .order_by(JobPost.id))
+
+
+def _chunks(query, summary, limit, size=CHUNK_SIZE):
+    """Yields the rows of `query` `size` at a time, until `limit` jobs have been replayed in total."""
+    last_id = 0
+    while not (limit and summary["replayed"] >= limit):
+        rows = query.filter(JobPost.id > last_id).limit(min(size, limit - summary["replayed"]) if limit else size).all()
+        if not rows:
+            return
+        last_id = rows[-1][0].id
+        yield rows
+
+
+def _write_back(db, rows, results, summary, dry_run):
+    values = []
+    for job, _, _, fetched_at in rows:
+        fields = results[job.id]
+        if isinstance(fields, Exception):
+            summary["errors"] += 1
+            print(f"Could not re-extract {job.link}: {fields}")
+            continue
+        changes = _changes(job, fields, fetched_at)
+        if changes:
+            summary["fields"].update(k for k in changes if k in COLUMNS.values())
+            values.append({"id": job.id, **changes})
+    summary["replayed"] += len(rows)
+    summary["updated"] += len(values)
+    if values and not dry_run:
+        db.execute(update(JobPost), values)
+        db.commit()
+
+
+def reextract(sources=None, since_days=None, workers=None, dry_run=False, limit=None, llm_calls_per_minute=None):
+    """
+    Replays snapshots and updates jobs. Returns a summary of what was (or would be) changed.
+    sources defaults to every board whose extractor needs no LLM; LLM boards must be named.
+    """
+    sources = sources or [s for s in extractors.FIELDS if s not in extractors.LLM_SOURCES]
+    local_sources = [s for s in sources if s not in extractors.LLM_SOURCES]
+    llm_sources = [s for s in sources if s in extractors.LLM_SOURCES]
+    since = datetime.utcnow() - timedelta(days=since_days) if since_days else None
+    directory = snapshots.snapshot_dir()
+    summary = {"replayed": 0, "updated": 0, "errors": 0, "skipped": [], "fields": Counter()}
+    start = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        if local_sources:
+            workers = workers or os.cpu_count()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for rows in _chunks(_latest_rows(db, local_sources, since), summary, limit):
+                    tasks = [(job.id, source, job.link, content_hash, directory) for job, source, content_hash, _ in rows]
+                    results = dict(pool.map(_extract, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+                    _write_back(db, rows, results, summary, dry_run)
+
+        if llm_sources and dry_run:
+            # A dry run must not spend LLM calls
+            summary["skipped"] = llm_sources
+        elif llm_sources:
+            per_minute = get_config().rescore_calls_per_minute if llm_calls_per_minute is None else llm_calls_per_minute
+            interval = 60.0 / per_minute if per_minute > 0 else 0
+            next_at = 0.0
+            for rows in _chunks(_latest_rows(db, llm_sources, since), summary, limit, LLM_CHUNK_SIZE):
+                results = {}
+                for job, source, content_hash, _ in rows:
+                    delay = next_at - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_at = time.monotonic() + interval
+                    job_id, fields = _extract((job.id, source, job.link, content_hash, directory))
+                    results[job_id] = fields
+                _write_back(db, rows, results, summary, dry_run)
+    finally:
+        db.close()
+
+    summary["seconds"] = round(time.perf_counter() - start, 2)
+    summary["fields"] = dict(summary["fields"])
+    if not dry_run and summary["replayed"]:
+        log_agent_action("Reextractor", f"Re-extracted {summary['replayed']} stored pages; updated {summary['updated']} jobs.", "SUCCESS")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run the detail extractors over stored page snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Replay snapshots through the extractors and update changed jobs")
+    run.add_argument("--sources", nargs="+", choices=list(extractors.FIELDS),
+                     help=f"Only these boards (default: all but {', '.join(extractors.LLM_SOURCES)}, whose extractor calls the LLM)")
+    run.add_argument("--since-days", type=int, help="Only pages fetched in the last N days")
+    run.add_argument("--workers", type=int, help="Extractor processes (default: one per CPU)")
+    run.add_argument("--llm-calls-per-minute", type=int, help="Rate limit for LLM extractors (default: rescore_calls_per_minute)")
+    run.add_argument("--limit", type=int, help="Stop after this many jobs")
+    run.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+
+    sub.add_parser("stats", help="Show snapshot store size and deduplication")
+
+    prune = sub.add_parser("prune", help="Drop old snapshots and unreferenced pages")
+    prune.add_argument("--days", type=int, help="Override snapshot_retention_days")
+
+    args = parser.parse_args()
+    init_db()
+
+    if args.command == "stats":
+        s = snapshots.stats()
+        ratio = s["raw_bytes"] / s["stored_bytes"] if s["stored_bytes"] else 0
+        print(f"{s['fetches']} fetches of {s['pages']} distinct pages; "
+              f"{s['raw_bytes'] / 2**20:.1f} MiB raw, {s['stored_bytes'] / 2**20:.1f} MiB stored ({s['codec']}, {ratio:.1f}x)")
+        return
+    if args.command == "prune":
+        removed = snapshots.prune(args.days)
+        print(f"Removed {removed['rows']} snapshot rows and {removed['blobs']} pages.")
+        return
+
+    summary = reextract(args.sources, args.since_days, args.workers, args.dry_run, args.limit, args.llm_calls_per_minute)
+    verb = "would update" if args.dry_run else "updated"
+    print(f"Replayed {summary['replayed']} pages in {summary['seconds']}s; {verb} {summary['updated']} jobs "
+          f"({summary['errors']} errors).")
+    if summary["skipped"]:
+        print(f"Skipped {', '.join(summary['skipped'])}: a dry run makes no LLM calls.")
+    for column, count in sorted(summary["fields"].items()):
+        print(f"  {column:<18} {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from utils.near_dup import cluster_jobs, fingerprint, has_features, shingles
+
+
+def _job(title, company="N/A", location="N/A", salary="N/A", link="https://example.com/1"):
+    return {"Title": title, "Company": company, "Location": location, "Salary": salary, "Link": link}
+
+
+def test_jobs_without_company_are_never_merged():
+    # CWJobs cards carry no company or location, so only the title is known
+    a = _job("Technical Project Manager", link="https://www.cwjobs.co.uk/job/1")
+    b = _job("Technical Project Manager", link="https://www.cwjobs.co.uk/job/2")
+    assert shingles(a) == set()
+    assert not has_features(fingerprint(a))
+    assert cluster_jobs([a, b]) == [[0], [1]]
+
+
+def test_jobs_without_title_are_never_merged():
+    a = _job("N/A", company="Acme Capital Ltd", location="London")
+    b = _job("N/A", company="Acme Capital Ltd", location="London")
+    assert cluster_jobs([a, b]) == [[0], [1]]
+
+
+def test_same_posting_on_two_boards_is_merged():
+    a = _job("Senior Technical Project Manager", "Acme Capital Ltd", "London", "£70,000 - £80,000")
+    b = _job("Senior Technical Project Manager", "Acme Capital Limited", "London (Hybrid)", "£70k - £80k")
+    assert cluster_jobs([a, b]) == [[0, 1]]
@@ -0,0 +1,148 @@
+"""
+Cycle checkpoints.
+Every job's progress through the pipeline is persisted per stage, so a cycle that dies
+mid-way (browser crash, LLM outage, process restart) is resumed by the next run from
+the last completed stage, without re-scraping pages or re-paying for LLM calls.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple
+from sqlalchemy.dialects.sqlite import insert
+from backend.database import SessionLocal, ScrapeCycle, CycleJob
+from utils.job_keys import job_key
+from utils.persistence import log_agent_action
+from utils import metrics
+
+SCRAPED = "SCRAPED"
+VALIDATED = "VALIDATED"
+REJECTED = "REJECTED"
+UNIQUE = "UNIQUE"
+DUPLICATE = "DUPLICATE"
+SCORED = "SCORED"
+SAVED = "SAVED"
+# Stages a resumed cycle still has work for
+PENDING_STAGES = (SCRAPED, VALIDATED, UNIQUE, SCORED)
+
+# A cycle older than this is abandoned rather than resumed; its listings would be stale
+RESUME_WINDOW = timedelta(hours=12)
+
+# Rows per INSERT; five bound parameters each keeps a statement under SQLite's limit of 999
+WRITE_CHUNK = 150
+
+
+def checkpoint_key(job: Dict[str, Any]) -> str:
+    return job_key(job) or job.get('Link') or job.get('link')
+
+
+def _serialize(job: Dict[str, Any]) -> str:
+    return json.dumps(job, default=str)
+
+
+def _deserialize(payload: str) -> Dict[str, Any]:
+    job = json.loads(payload)
+    posted_date = job.get('Posted Date')
+    if isinstance(posted_date, str):
+        try:
+            job['Posted Date'] = datetime.fromisoformat(posted_date)
+        except ValueError:
+            job['Posted Date'] = None
+    return job
+
+
+def start_or_resume_cycle() -> Tuple[int, Dict[str, List[Dict[str, Any]]], bool, set]:
+    """
+    Opens a cycle. If the previous one was left RUNNING within the resume window, it is
+    resumed: returns its id, pending jobs grouped by stage, whether scraping had finished,
+    and the keys of every job it already scraped (so the scraper skips them).
+    """
+    db = SessionLocal()
+    try:
+        cycle = db.query(ScrapeCycle).filter(ScrapeCycle.status == "RUNNING").order_by(ScrapeCycle.id.desc()).first()
+        if cycle and cycle.started_at < datetime.utcnow() - RESUME_WINDOW:
+            cycle.status = "ABANDONED"
+            cycle.finished_at = datetime.utcnow()
+            db.query(CycleJob).filter(CycleJob.cycle_id == cycle.id).delete(synchronize_session=False)
+            db.commit()
+            cycle = None
+
+        if not cycle:
+            cycle = ScrapeCycle(status="RUNNING", started_at=datetime.utcnow())
+            db.add(cycle)
+            db.commit()
+            return cycle.id, {}, False, set()
+
+        backlog = {stage: [] for stage in PENDING_STAGES}
+        seen_keys = set()
+        for key, stage, payload in db.query(CycleJob.job_key, CycleJob.stage, CycleJob.payload).filter(CycleJob.cycle_id == cycle.id):
+            seen_keys.add(key)
+            if stage in backlog:
+                backlog[stage].append(_deserialize(payload))
+
+        summary = ", ".join(f"{len(jobs)} {stage.lower()}" for stage, jobs in backlog.items() if jobs) or "nothing pending"
+        log_agent_action("Orchestrator", f"Resuming cycle {cycle.id} ({summary}; scraping {'done' if cycle.scrape_done else 'incomplete'}).", "INFO")
+        return cycle.id, backlog, bool(cycle.scrape_done), seen_keys
+    finally:
+        db.close()
+
+
+def checkpoint_jobs(cycle_id: int, jobs: List[Dict[str, Any]], stage: str):
+    """
+    Records that `jobs` reached `stage`, in one statement per batch. A failed write raises,
+    which stops the pipeline and leaves the cycle RUNNING to be resumed from what was recorded.
+    """
+    if not jobs:
+        return
+    rows = [
+        {"cycle_id": cycle_id, "job_key": checkpoint_key(job), "stage": stage,
+         "payload": _serialize(job), "updated_at": datetime.utcnow()}
+        for job in jobs
+    ]
+    db = SessionLocal()
+    try:
+        with metrics.timer("checkpoint"):
+            # One transaction for the batch, written in chunks
+            for i in range(0, len(rows), WRITE_CHUNK):
+                statement = insert(CycleJob).values(rows[i:i + WRITE_CHUNK])
+                statement = statement.on_conflict_do_update(
+                    index_elements=["cycle_id", "job_key"],
+                    set_={"stage": statement.excluded.stage, "payload": statement.excluded.payload,
+                          "updated_at": statement.excluded.updated_at},
+                )
+                db.execute(statement)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def cycle_jobs(cycle_id: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """(stage, job) for every job checkpointed in the cycle."""
+    db = SessionLocal()
+    try:
+        return [(stage, _deserialize(payload))
+                for stage, payload in db.query(CycleJob.stage, CycleJob.payload).filter(CycleJob.cycle_id == cycle_id)]
+    finally:
+        db.close()
+
+
+def mark_scrape_done(cycle_id: int):
+    db = SessionLocal()
+    try:
+        db.query(ScrapeCycle).filter(ScrapeCycle.id == cycle_id).update({"scrape_done": True})
+        db.commit()
+    finally:
+        db.close()
+
+
+def finish_cycle(cycle_id: int, status: str = "COMPLETED"):
+    """Closes a cycle and drops its job checkpoints, which are only needed to resume."""
+    db = SessionLocal()
+    try:
+        db.query(ScrapeCycle).filter(ScrapeCycle.id == cycle_id).update(
+            {"status": status, "finished_at": datetime.utcnow()})
+        db.query(CycleJob).filter(CycleJob.cycle_id == cycle_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
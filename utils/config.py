@@ -0,0 +1,153 @@
+"""
+Typed config snapshot.
+All Config rows are read in one query and parsed once (JSON lists, ints) into a
+ConfigSnapshot that per-job code reads from memory. The orchestrator refreshes it at the
+start of every cycle; writes through the API or set_config_value invalidate it, so the
+next read reloads and registered listeners are told about the change.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Callable
+from backend.database import SessionLocal, Config
+
+ALL_SOURCES = ['indeed', 'totaljobs', 'cwjobs', 'reed', 'glassdoor', 'linkedin']
+
+
+def _int(raw: Dict[str, str], key: str, default: int) -> int:
+    try:
+        return int(raw.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _float(raw: Dict[str, str], key: str, default: float) -> float:
+    try:
+        return float(raw.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _json(raw: Dict[str, str], key: str, default, on_error=None):
+    if not raw.get(key):
+        return default
+    try:
+        return json.loads(raw[key])
+    except json.JSONDecodeError:
+        if on_error is not None:
+            return on_error(raw[key])
+        print(f"Config: could not parse {key}; using default.")
+        return default
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    keywords: List[str]
+    location: str
+    schedule_interval: int
+    target_industries: List[str]
+    enabled_sources: List[str]
+    jobs_per_source: int
+    freshness_days: int
+    freshness_days_by_source: Dict[str, int]
+    log_retention_days: int
+    log_max_rows: int
+    job_retention_days: int
+    retention_archive_dir: Optional[str]
+    fused_llm_pass: bool
+    score_cache_ttl_days: int
+    score_cache_max_entries: int
+    rescore_calls_per_minute: int
+    embedding_prefilter_threshold: float
+    snapshot_pages: bool
+    snapshot_retention_days: int
+    metrics_retention_days: int
+    parse_workers: int
+    raw: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls, raw: Dict[str, str]) -> "ConfigSnapshot":
+        by_source = _json(raw, "freshness_days_by_source", {})
+        return cls(
+            # A plain (non-JSON) keyword string is treated as a single keyword
+            keywords=_json(raw, "keywords", ["Technical Project Manager"], on_error=lambda v: [v]),
+            location=raw.get("location", "London"),
+            schedule_interval=_int(raw, "schedule_interval", 30),
+            target_industries=_json(raw, "target_industries", []),
+            enabled_sources=_json(raw, "enabled_sources", ALL_SOURCES,
+                                  on_error=lambda v: ['totaljobs', 'reed', 'glassdoor', 'linkedin']),
+            jobs_per_source=_int(raw, "jobs_per_source", 60),
+            freshness_days=_int(raw, "freshness_days", 7),
+            freshness_days_by_source=by_source if isinstance(by_source, dict) else {},
+            log_retention_days=_int(raw, "log_retention_days", 14),
+            log_max_rows=_int(raw, "log_max_rows", 50000),
+            job_retention_days=_int(raw, "job_retention_days", 30),
+            retention_archive_dir=raw.get("retention_archive_dir") or None,
+            fused_llm_pass=raw.get("fused_llm_pass", "true").strip().lower() not in ("false", "0", "no", "off"),
+            score_cache_ttl_days=_int(raw, "score_cache_ttl_days", 30),
+            score_cache_max_entries=_int(raw, "score_cache_max_entries", 50000),
+            rescore_calls_per_minute=_int(raw, "rescore_calls_per_minute", 10),
+            # 0 disables the pre-filter; otherwise jobs less similar to the persona skip the LLM
+            embedding_prefilter_threshold=_float(raw, "embedding_prefilter_threshold", 0.0),
+            snapshot_pages=raw.get("snapshot_pages", "true").strip().lower() not in ("false", "0", "no", "off"),
+            snapshot_retention_days=_int(raw, "snapshot_retention_days", 90),
+            metrics_retention_days=_int(raw, "metrics_retention_days", 90),
+            # 0 parses on the event loop instead of in worker processes
+            parse_workers=_int(raw, "parse_workers", os.cpu_count() or 1),
+            raw=dict(raw),
+        )
+
+    def get(self, key: str, default: str = None) -> Optional[str]:
+        """Raw string value, for settings without a typed field."""
+        return self.raw.get(key, default)
+
+
+_lock = threading.Lock()
+_snapshot: Optional[ConfigSnapshot] = None
+_listeners: List[Callable[[], None]] = []
+
+
+def load_snapshot() -> ConfigSnapshot:
+    db = SessionLocal()
+    try:
+        return ConfigSnapshot.from_rows({key: value for key, value in db.query(Config.key, Config.value)})
+    finally:
+        db.close()
+
+
+def get_config() -> ConfigSnapshot:
+    """The current snapshot, loaded on first use or after an invalidation."""
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is None:
+        with _lock:
+            if _snapshot is None:
+                _snapshot = load_snapshot()
+            snapshot = _snapshot
+    return snapshot
+
+
+def refresh() -> ConfigSnapshot:
+    """Reloads the snapshot now; the orchestrator calls this once per cycle."""
+    global _snapshot
+    with _lock:
+        _snapshot = load_snapshot()
+        return _snapshot
+
+
+def invalidate():
+    """Marks the snapshot stale after a config write and notifies listeners."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+    for listener in list(_listeners):
+        try:
+            listener()
+        except Exception as e:
+            print(f"Config listener error: {e}")
+
+
+def on_change(listener: Callable[[], None]):
+    """Registers a callback run after every config write."""
+    _listeners.append(listener)
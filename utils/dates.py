@@ -0,0 +1,189 @@
+"""
+Posted-date normalization.
+Job boards show posting dates as relative text ("3 days ago", "30+ days ago", "an hour ago",
+"Just posted") or as calendar dates ("17 October", "Oct 17, 2025", "2025-10-17", "17/10/2025").
+parse_relative_date handles one string as the scrapers extract it; parse_dates does the same
+for a whole pandas column at once with the same precompiled patterns, and freshness_mask
+turns parsed dates into a keep/drop mask in one vectorized comparison. FreshnessPolicy
+holds the per-source freshness windows the scrapers and the validator enforce.
+"""
+import re
+from datetime import datetime, timedelta
+from typing import Optional, Dict
+import pandas as pd
+
+_PREFIX = re.compile(r'^(?:published|posted|reposted|active|updated)\s*:?\s*')
+_TODAY = re.compile(r'just posted|just now|today|moments? ago|\b0\s+days?\s+ago')
+_YESTERDAY = re.compile(r'yesterday')
+_RELATIVE = re.compile(r'\b(\d+|an?|one)\s*\+?\s*(minute|min|hour|hr|day|week|month|h|d|w)s?\s+ago')
+
+_MONTH = (r'(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+_DAY_MONTH = re.compile(r'\b(\d{1,2})(?:st|nd|rd|th)?\s+' + _MONTH + r'\b\.?(?:,?\s+(\d{4}))?')
+_MONTH_DAY = re.compile(r'\b' + _MONTH + r'\b\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(\d{4}))?')
+_ISO = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+_DMY = re.compile(r'\b(\d{1,2})/(\d{1,2})/(\d{4})\b')  # UK boards: day first
+
+_MONTHS = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+           'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+_UNIT_SECONDS = {'minute': 60, 'min': 60, 'hour': 3600, 'hr': 3600, 'h': 3600,
+                 'day': 86400, 'd': 86400, 'week': 604800, 'w': 604800, 'month': 30 * 86400}
+_NUMBER_WORDS = {'a': '1', 'an': '1', 'one': '1'}
+
+
+def _normalize(date_str: str) -> str:
+    return _PREFIX.sub('', date_str.lower().strip()).strip()
+
+
+def _calendar_date(year, month, day, now: datetime) -> Optional[datetime]:
+    """Builds a date; without a year it is assumed to be the most recent such date."""
+    try:
+        if year:
+            return datetime(int(year), month, int(day))
+        parsed = datetime(now.year, month, int(day))
+        if parsed > now:
+            parsed = datetime(now.year - 1, month, int(day))
+        return parsed
+    except ValueError:
+        return None
+
+
+def parse_relative_date(date_str, now: datetime = None) -> Optional[datetime]:
+    """Parses relative date strings like '3 days ago' or '17 October' into a datetime object."""
+    if not date_str or date_str == "N/A":
+        return None
+
+    now = now or datetime.now()
+    date_str = _normalize(str(date_str))
+
+    if _TODAY.search(date_str):
+        return now
+    if _YESTERDAY.search(date_str):
+        return now - timedelta(days=1)
+
+    match = _RELATIVE.search(date_str)
+    if match:
+        num = int(_NUMBER_WORDS.get(match.group(1), match.group(1)))
+        return now - timedelta(seconds=num * _UNIT_SECONDS[match.group(2)])
+
+    match = _DAY_MONTH.search(date_str)
+    if match:
+        return _calendar_date(match.group(3), _MONTHS[match.group(2)[:3]], match.group(1), now)
+    match = _MONTH_DAY.search(date_str)
+    if match:
+        return _calendar_date(match.group(3), _MONTHS[match.group(1)[:3]], match.group(2), now)
+    match = _ISO.search(date_str)
+    if match:
+        return _calendar_date(match.group(1), int(match.group(2)), match.group(3), now)
+    match = _DMY.search(date_str)
+    if match:
+        return _calendar_date(match.group(3), int(match.group(2)), match.group(1), now)
+    return None
+
+
+def _vector_calendar(year: pd.Series, month: pd.Series, day: pd.Series, now: pd.Timestamp) -> pd.Series:
+    explicit = year.notna()
+    def number(col):
+        return pd.to_numeric(col, errors="coerce").astype("float64")
+
+    frame = pd.DataFrame({"year": number(year).fillna(now.year), "month": number(month), "day": number(day)})
+    dates = pd.to_datetime(frame, errors="coerce")
+    last_year = pd.to_datetime(frame.assign(year=frame["year"] - 1), errors="coerce")
+    return dates.mask(~explicit & (dates > now), last_year)
+
+
+def _parse_unique(s: pd.Series, now: pd.Timestamp) -> pd.Series:
+    """Applies the patterns in parse_relative_date's order, each only to entries still unparsed."""
+    s = s.astype("string").str.lower().str.strip().str.replace(_PREFIX, '', regex=True).str.strip()
+    result = pd.Series(pd.NaT, index=s.index, dtype="datetime64[us]")
+
+    def pending():
+        return s[result.isna() & s.notna()]
+
+    rest = pending()
+    result[rest.index[rest.str.contains(_TODAY)]] = now
+    rest = pending()
+    result[rest.index[rest.str.contains(_YESTERDAY)]] = now - pd.Timedelta(days=1)
+
+    rel = pending().str.extract(_RELATIVE).dropna()
+    num = pd.to_numeric(rel[0].replace(_NUMBER_WORDS), errors="coerce").astype("float64")
+    result[rel.index] = now - pd.to_timedelta(num * rel[1].map(_UNIT_SECONDS).astype("float64"), unit="s")
+
+    for pattern, year, month, day, named in ((_DAY_MONTH, 2, 1, 0, True), (_MONTH_DAY, 2, 0, 1, True),
+                                             (_ISO, 0, 1, 2, False), (_DMY, 2, 1, 0, False)):
+        found = pending().str.extract(pattern).dropna(subset=[month, day])
+        if found.empty:
+            continue
+        months = found[month].str[:3].map(_MONTHS) if named else found[month]
+        result[found.index] = _vector_calendar(found[year], months, found[day], now)
+    return result
+
+
+def parse_dates(values, now: datetime = None) -> pd.Series:
+    """
+    Vectorized parse_relative_date over a column of posted-date strings. Returns a
+    datetime64 Series aligned with `values`; unparseable entries are NaT. Listings repeat
+    the same few strings ("1 day ago", "Just posted"), so each distinct string is parsed once.
+    """
+    now = pd.Timestamp(now or datetime.now())
+    values = pd.Series(values, copy=False)
+    codes, uniques = pd.factorize(values)
+    parsed = _parse_unique(pd.Series(uniques, dtype=object), now)
+    # Missing values have code -1, which picks the trailing NaT
+    parsed = pd.concat([parsed, pd.Series([pd.NaT], dtype=parsed.dtype)]).to_numpy()
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def freshness_mask(dates, days, now: datetime = None, keep_unknown: bool = True) -> pd.Series:
+    """
+    True for dates within the last `days` days (one number, or a Series with one per date);
+    undated entries count as fresh unless keep_unknown is False.
+    """
+    dates = pd.to_datetime(pd.Series(dates, copy=False), errors="coerce")
+    cutoff = pd.Timestamp(now or datetime.now()) - pd.to_timedelta(days, unit="D")
+    return (dates >= cutoff) | (dates.isna() & keep_unknown)
+
+
+DEFAULT_FRESHNESS_DAYS = 7
+
+
+class FreshnessPolicy:
+    """
+    How many days old a listing may be, per source. Configured by `freshness_days` and
+    `freshness_days_by_source` (JSON, e.g. {"LinkedIn": 3}); undated listings count as fresh.
+    """
+
+    def __init__(self, default_days: int = DEFAULT_FRESHNESS_DAYS, by_source: Dict[str, int] = None):
+        self.default_days = default_days
+        self.by_source = {k.lower(): int(v) for k, v in (by_source or {}).items()}
+
+    @classmethod
+    def from_config(cls) -> "FreshnessPolicy":
+        from utils.config import get_config
+        cfg = get_config()
+        return cls(cfg.freshness_days, cfg.freshness_days_by_source)
+
+    def days(self, source: str = None) -> int:
+        return self.by_source.get((source or "").lower(), self.default_days)
+
+    def is_stale(self, posted_date, source: str = None, now: datetime = None) -> bool:
+        if isinstance(posted_date, str):
+            posted_date = parse_relative_date(posted_date, now)
+        if posted_date is None:
+            return False
+        if not isinstance(posted_date, datetime):
+            posted_date = datetime.combine(posted_date, datetime.min.time())
+        cutoff = (now or datetime.now()) - timedelta(days=self.days(source))
+        # Compare calendar days, so a listing from the cutoff day is still in the window
+        return posted_date.date() < cutoff.date()
+
+    def mask(self, dates, sources=None, now: datetime = None) -> pd.Series:
+        """is_stale for a whole column, negated: True for listings inside their source's window or undated."""
+        dates = pd.to_datetime(pd.Series(dates, copy=False), errors="coerce")
+        if sources is None:
+            days = self.default_days
+        else:
+            days = pd.Series(sources, index=dates.index).astype(str).str.lower().map(self.by_source).fillna(self.default_days)
+        # Counting from midnight compares calendar days, as is_stale does
+        today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        return freshness_mask(dates, days, now=today)
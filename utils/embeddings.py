@@ -0,0 +1,280 @@
+"""
+Job embedding index.
+Jobs and personas are encoded into unit vectors by a pluggable encoder: the built-in
+HashingEncoder (signed feature hashing of words and word pairs, CPU-only, no model
+download) or, when `embedding_encoder` is "sentence-transformers:<model>" and that package
+is installed, a sentence-transformers model. Job vectors are appended to a flat float32
+file that is memory-mapped for queries, with a parallel file of job ids, so ranking the
+whole table is one matrix-vector product. The index follows job_posts incrementally by id,
+drops the vectors of deleted jobs, and is rebuilt if the encoder changes.
+"""
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import func
+from backend.database import SessionLocal, JobPost
+from utils.config import get_config
+
+DEFAULT_DIM = 256
+INDEX_DIR = "embeddings"
+SYNC_CHUNK = 5000
+ID_LOOKUP_CHUNK = 500 # Ids per IN (...) query; stays under SQLite's bound-parameter limit
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+# Persona fields that describe what a good job looks like
+PERSONA_FIELDS = ("keywords", "core_skills", "preferred_industries", "experience_level")
+
+
+class HashingEncoder:
+    """Signed feature hashing of words and adjacent word pairs, log-scaled and L2-normalized."""
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = [w.rstrip(".") for w in _TOKEN.findall(text.lower())]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def encode(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text or ""):
+                h = zlib.crc32(feature.encode("utf-8"))
+                out[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        np.copysign(np.log1p(np.abs(out)), out, out=out)
+        return _normalize(out)
+
+
+class SentenceTransformerEncoder:
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers:{model_name}"
+
+    def encode(self, texts: Iterable[str]) -> np.ndarray:
+        return _normalize(np.asarray(self.model.encode(list(texts), batch_size=64), dtype=np.float32))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def make_encoder(spec: str = None):
+    """Encoder for a config spec; falls back to hashing when a model is unavailable."""
+    spec = spec or "hashing"
+    if spec.startswith("sentence-transformers:"):
+        try:
+            return SentenceTransformerEncoder(spec.split(":", 1)[1])
+        except Exception as e:
+            print(f"Embedding model unavailable ({e}); using the hashing encoder.")
+    return HashingEncoder()
+
+
+_ROW_FIELDS = {"Title": "title", "Company": "company", "Location": "location", "Job Type": "job_type"}
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    """Text embedded for a job dict (scraper keys) or JobPost row."""
+    get = job.get if isinstance(job, dict) else lambda k: getattr(job, _ROW_FIELDS[k])
+    title = get("Title") or ""
+    # The title carries most of the signal, so it counts twice
+    return " ".join(str(v) for v in (title, title, get("Company"), get("Location"), get("Job Type")) if v and v != "N/A")
+
+
+def persona_text(persona: Dict[str, Any]) -> str:
+    parts = []
+    for field in PERSONA_FIELDS:
+        value = persona.get(field)
+        parts.extend(value if isinstance(value, list) else [value] if value else [])
+    return " ".join(str(p) for p in parts)
+
+
+class EmbeddingIndex:
+    """Append-only vector store: vectors.f32 (n x dim float32) and ids.i64, memory-mapped for queries."""
+
+    def __init__(self, directory: str = INDEX_DIR, encoder=None):
+        self.directory = directory
+        self.encoder = encoder or make_encoder(get_config().get("embedding_encoder"))
+        self.lock = threading.Lock()
+        self._vectors = None
+        self._ids = None
+        self._check_meta()
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _ids_path(self):
+        return os.path.join(self.directory, "ids.i64")
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.directory, "meta.json")
+
+    def _check_meta(self):
+        """Starts over when the stored vectors came from another encoder."""
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {"encoder": self.encoder.name, "dim": self.encoder.dim}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                if json.load(f) == meta:
+                    return
+        for path in (self._vectors_path, self._ids_path):
+            if os.path.exists(path):
+                os.remove(path)
+        with open(self._meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _load(self):
+        if self._vectors is not None:
+            return
+        dim = self.encoder.dim
+        n_vectors = os.path.getsize(self._vectors_path) // (dim * 4) if os.path.exists(self._vectors_path) else 0
+        n_ids = os.path.getsize(self._ids_path) // 8 if os.path.exists(self._ids_path) else 0
+        n = min(n_vectors, n_ids) # An interrupted append leaves one file longer
+        if n == 0:
+            self._vectors = np.zeros((0, dim), dtype=np.float32)
+            self._ids = np.zeros(0, dtype=np.int64)
+            return
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(n, dim))
+        self._ids = np.fromfile(self._ids_path, dtype=np.int64, count=n)
+
+    def __len__(self):
+        with self.lock:
+            self._load()
+            return len(self._ids)
+
+    def max_id(self) -> int:
+        with self.lock:
+            self._load()
+            return int(self._ids.max()) if len(self._ids) else 0
+
+    def add(self, ids: List[int], texts: List[str]):
+        if not ids:
+            return
+        vectors = self.encoder.encode(texts)
+        with self.lock:
+            self._load()
+            n = len(self._ids)
+            # Drop any half-written tail before appending
+            for path, width in ((self._vectors_path, self.encoder.dim * 4), (self._ids_path, 8)):
+                if os.path.exists(path) and os.path.getsize(path) != n * width:
+                    with open(path, "r+b") as f:
+                        f.truncate(n * width)
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            with open(self._ids_path, "ab") as f:
+                f.write(np.asarray(ids, dtype=np.int64).tobytes())
+            self._vectors = self._ids = None
+
+    def remove(self, ids: Iterable[int]) -> int:
+        """Drops the vectors of `ids` (jobs deleted or archived). Returns how many were dropped."""
+        ids = np.asarray(list(ids), dtype=np.int64)
+        with self.lock:
+            self._load()
+            keep = ~np.isin(self._ids, ids)
+            removed = int(len(keep) - keep.sum())
+            if not removed:
+                return 0
+            # Rewrite both files chunk by chunk, then swap them in; open memmaps keep the old files
+            for path, rows in ((self._vectors_path, self._vectors), (self._ids_path, self._ids)):
+                with open(path + ".tmp", "wb") as f:
+                    for start in range(0, len(keep), SYNC_CHUNK):
+                        f.write(np.ascontiguousarray(rows[start:start + SYNC_CHUNK][keep[start:start + SYNC_CHUNK]]).tobytes())
+            self._vectors = self._ids = None
+            os.replace(self._vectors_path + ".tmp", self._vectors_path)
+            os.replace(self._ids_path + ".tmp", self._ids_path)
+            return removed
+
+    def vector(self, job_id: int) -> Optional[np.ndarray]:
+        with self.lock:
+            self._load()
+            rows = np.nonzero(self._ids == job_id)[0]
+            return np.array(self._vectors[rows[-1]]) if len(rows) else None
+
+    def search(self, query: np.ndarray, k: int = 20, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """Top-k job ids by cosine similarity to `query`."""
+        with self.lock:
+            self._load()
+            if not len(self._ids):
+                return []
+            scores = self._vectors @ np.asarray(query, dtype=np.float32).ravel()
+            ids = self._ids
+        exclude = set(exclude)
+        take = min(len(scores), k + len(exclude))
+        top = np.argpartition(-scores, take - 1)[:take]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top if int(ids[i]) not in exclude][:k]
+
+    def _embed(self, db, ids: List[int]) -> int:
+        added = 0
+        for i in range(0, len(ids), ID_LOOKUP_CHUNK):
+            rows = (db.query(JobPost.id, JobPost.title, JobPost.company, JobPost.location, JobPost.job_type)
+                    .filter(JobPost.id.in_(ids[i:i + ID_LOOKUP_CHUNK])).order_by(JobPost.id).all())
+            self.add([r.id for r in rows], [job_text(r) for r in rows])
+            added += len(rows)
+        return added
+
+    def _reconcile(self, db, high_water: int) -> int:
+        """Drops vectors of jobs that are gone and embeds stored jobs up to `high_water` that have none."""
+        stored = np.fromiter((r[0] for r in db.query(JobPost.id).filter(JobPost.id <= high_water)), dtype=np.int64)
+        with self.lock:
+            self._load()
+            indexed = np.array(self._ids)
+        self.remove(np.setdiff1d(indexed, stored))
+        return self._embed(db, np.setdiff1d(stored, indexed).tolist())
+
+    def sync(self) -> int:
+        """
+        Embeds jobs stored since the last sync and drops the vectors of jobs that are gone.
+        The highest indexed id is the high-water mark. job_posts ids are not AUTOINCREMENT,
+        so SQLite gives a deleted highest id to the next insert; the delete paths call
+        remove() first, and a row count below the mark that disagrees with the index
+        (a delete made elsewhere) triggers a full id comparison. Returns how many were added.
+        """
+        added = 0
+        db = SessionLocal()
+        try:
+            high_water = self.max_id()
+            stored = db.query(func.count(JobPost.id)).filter(JobPost.id <= high_water).scalar() or 0
+            if stored != len(self):
+                added += self._reconcile(db, high_water)
+            while True:
+                rows = (db.query(JobPost.id, JobPost.title, JobPost.company, JobPost.location, JobPost.job_type)
+                        .filter(JobPost.id > self.max_id()).order_by(JobPost.id).limit(SYNC_CHUNK).all())
+                if not rows:
+                    return added
+                self.add([r.id for r in rows], [job_text(r) for r in rows])
+                added += len(rows)
+        finally:
+            db.close()
+
+    def rebuild(self) -> int:
+        """Re-embeds the table from scratch, dropping vectors of deleted or archived jobs."""
+        with self.lock:
+            for path in (self._vectors_path, self._ids_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._vectors = self._ids = None
+        return self.sync()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> EmbeddingIndex:
+    """The shared index over job_posts, created on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = EmbeddingIndex(get_config().get("embedding_index_dir") or INDEX_DIR)
+        return _index
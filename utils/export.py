@@ -0,0 +1,136 @@
+"""
+Job exports.
+Jobs are filtered and sorted as one DataFrame, then streamed to xlsx in a single pass with
+openpyxl's write-only mode: column widths are computed from the frame up front and link
+cells are written already hyperlinked, so the workbook is never reloaded. The same frame
+can also be written as Parquet or CSV, and every export gets a `.links` sidecar (one link
+per line) so monitor_jobs can load seen links without parsing the workbook.
+"""
+import os
+from typing import List, Dict, Any, Iterable, Set
+import pandas as pd
+from utils.dates import parse_dates, FreshnessPolicy
+
+LINK_COLUMN = "Link"
+LINK_WIDTH = 80
+MAX_WIDTH = 50
+LINKS_SUFFIX = ".links"
+
+
+def prepare_frame(jobs: List[Dict[str, Any]], freshness: FreshnessPolicy = None) -> pd.DataFrame:
+    """
+    Keeps jobs inside their source's freshness window (or undated), newest first, with the
+    display date column. freshness defaults to the configured policy.
+    """
+    df = pd.DataFrame(jobs)
+    if "Posted Date" not in df.columns:
+        return df.rename(columns={"Posted Date Text": "Posted Date"})
+
+    posted = pd.to_datetime(df["Posted Date"], errors="coerce")
+    if "Posted Date Text" in df.columns:
+        # Fill dates the scraper could not parse from their text
+        posted = posted.fillna(parse_dates(df["Posted Date Text"]))
+    freshness = freshness or FreshnessPolicy.from_config()
+    keep = freshness.mask(posted, df["Source"] if "Source" in df.columns else None)
+    df = df[keep].assign(_posted=posted[keep])
+    df = df.sort_values(by="_posted", ascending=False, na_position="last")
+    df = df.drop(columns=["Posted Date", "_posted"])
+    return df.rename(columns={"Posted Date Text": "Posted Date"})
+
+
+def column_widths(df: pd.DataFrame) -> List[float]:
+    widths = []
+    for col in df.columns:
+        if col == LINK_COLUMN:
+            widths.append(LINK_WIDTH)
+            continue
+        longest = df[col].dropna().astype(str).str.len().max()
+        widths.append(min(max(0 if pd.isna(longest) else int(longest), len(str(col))) + 2, MAX_WIDTH))
+    return widths
+
+
+def write_xlsx(df: pd.DataFrame, filename: str):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    for i, width in enumerate(column_widths(df), start=1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    link_font = Font(color="0000FF", underline="single")
+    link_idx = df.columns.get_loc(LINK_COLUMN) if LINK_COLUMN in df.columns else None
+    ws.append([str(c) for c in df.columns])
+    for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+        row = list(row)
+        if link_idx is not None and row[link_idx] and str(row[link_idx]).startswith("http"):
+            cell = WriteOnlyCell(ws, value=row[link_idx])
+            cell.hyperlink = row[link_idx]
+            cell.font = link_font
+            row[link_idx] = cell
+        ws.append(row)
+    wb.save(filename)
+
+
+def write_parquet(df: pd.DataFrame, filename: str) -> bool:
+    try:
+        df.to_parquet(filename, index=False)
+        return True
+    except ImportError as e:
+        print(f"Parquet export skipped ({e})")
+        return False
+
+
+def write_csv(df: pd.DataFrame, filename: str):
+    df.to_csv(filename, index=False)
+
+
+def links_path(filename: str) -> str:
+    return filename + LINKS_SUFFIX
+
+
+def write_links(links: Iterable[str], filename: str):
+    """Writes the link sidecar for an export file."""
+    with open(links_path(filename), "w", encoding="utf-8") as f:
+        f.writelines(f"{link}\n" for link in links if link)
+
+
+def read_links(filename: str) -> Set[str]:
+    """Links of an export, from its sidecar if present, else from the file itself."""
+    sidecar = links_path(filename)
+    if os.path.exists(sidecar):
+        with open(sidecar, "r", encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    if filename.endswith(".parquet"):
+        df = pd.read_parquet(filename, columns=[LINK_COLUMN])
+    elif filename.endswith(".csv"):
+        df = pd.read_csv(filename, usecols=[LINK_COLUMN])
+    else:
+        df = pd.read_excel(filename, usecols=[LINK_COLUMN])
+    return set(df[LINK_COLUMN].astype(str))
+
+
+WRITERS = {".xlsx": write_xlsx, ".parquet": write_parquet, ".csv": write_csv}
+
+
+def export_jobs(jobs: List[Dict[str, Any]], filename: str, formats: Iterable[str] = (), freshness: FreshnessPolicy = None) -> int:
+    """
+    Writes the fresh subset of `jobs` to `filename` (format from its extension) plus any
+    extra `formats` (e.g. "parquet", "csv") beside it. Returns the number of rows written.
+    """
+    df = prepare_frame(jobs, freshness)
+    stem, ext = os.path.splitext(filename)
+    targets = [filename] + [f"{stem}.{fmt.lstrip('.')}" for fmt in formats if f".{fmt.lstrip('.')}" != ext]
+
+    links = df[LINK_COLUMN].astype(str).tolist() if LINK_COLUMN in df.columns else []
+    for target in targets:
+        writer = WRITERS.get(os.path.splitext(target)[1])
+        if writer is None:
+            print(f"Unsupported export format: {target}")
+            continue
+        if writer(df, target) is not False:
+            write_links(links, target)
+    return len(df)
@@ -0,0 +1,149 @@
+"""
+Detail-page extractors.
+Each board's detail fields are read from the page HTML alone, so the same code serves a
+live scrape (on page.content()) and a replay of stored snapshots (see utils/snapshots.py
+and reextract.py). Text of matching elements is collected the way Playwright's inner_text
+would report it: in document order, descendants included, script and style skipped. The
+page is tokenized by one regex pass, about twice as fast as html.parser on the large
+pages the boards serve.
+"""
+import asyncio
+import re
+from html import unescape
+from typing import Dict, List, Tuple
+
+NA = "N/A"
+_MONTHS = r'(january|february|march|april|may|june|july|august|september|october|november|december)'
+_REED_BY = re.compile(r'(yesterday|\d+\s+\w+)\s+by\s+(.+)', re.IGNORECASE)
+_REED_DATE = re.compile(r'(yesterday|today|\d+\s+' + _MONTHS + r')', re.IGNORECASE)
+_PERMANENT_FULL_TIME = re.compile(r'Permanent,?\s+full-time', re.IGNORECASE)
+_CONTRACT_FULL_TIME = re.compile(r'Contract,?\s+full-time', re.IGNORECASE)
+_APPLICANTS = re.compile(r'(\d+)\s+applicants?')
+
+
+# Script and style bodies are dropped up front; what is left is tokenized in one pass
+_RAW_TEXT = re.compile(r'<(script|style|noscript|template)\b.*?</\1\s*>', re.S | re.IGNORECASE)
+# One token per match: a start or end tag (with its attribute text), a run of text, or markup to skip
+_TOKEN = re.compile(r'<(/?)([a-zA-Z][\w:-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>|([^<]+)|<!--.*?-->|<[^>]*>?', re.S)
+_CLASS = re.compile(r'\bclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+
+
+def _classes(attrs: str) -> set:
+    match = _CLASS.search(attrs)
+    return set((match.group(1) or match.group(2) or match.group(3) or "").split()) if match else set()
+
+
+def element_texts(html: str, tags: Tuple[str, ...] = None, class_name: str = None) -> List[str]:
+    """
+    Whitespace-normalized inner text of the elements with one of `tags` and/or the CSS class
+    `class_name`, in document order.
+    """
+    html = html or ""
+    if class_name is not None and class_name not in html:
+        return []
+    texts: List[List[str]] = []
+    open_elements: List[Tuple[str, int]] = []  # (tag, index into texts) of matched elements not yet closed
+    for closing, tag, attrs, data in _TOKEN.findall(_RAW_TEXT.sub("", html)):
+        if data:
+            for _, index in open_elements:
+                texts[index].append(data)
+        elif not tag:
+            continue
+        elif closing:
+            tag = tag.lower()
+            for i in range(len(open_elements) - 1, -1, -1):
+                if open_elements[i][0] == tag:
+                    del open_elements[i]
+                    break
+        else:
+            tag = tag.lower()
+            if tags is not None and tag not in tags:
+                continue
+            if class_name is not None and (class_name not in attrs or class_name not in _classes(attrs)):
+                continue
+            if not attrs.endswith("/"):
+                open_elements.append((tag, len(texts)))
+                texts.append([])
+    return [" ".join(unescape("".join(parts)).split()) for parts in texts]
+
+
+def reed_details(html: str) -> Tuple[str, str, str]:
+    """(posted date, company, job type) from a Reed job page."""
+    posted_date, company = NA, NA
+    # The date/company line reads "Yesterday by Grant Thornton" or "17 October by Gold Group Ltd"
+    for text in element_texts(html, tags=("span", "div", "time")):
+        if '£' in text:
+            continue  # Salary
+        match = _REED_BY.search(text)
+        if match:
+            posted_date, company = match.group(1).strip(), match.group(2).strip()
+            break
+        if len(text) < 50 and _REED_DATE.search(text) and 'by' not in text.lower():
+            posted_date = text
+
+    job_type = NA
+    if _PERMANENT_FULL_TIME.search(html):
+        job_type = "Permanent, full-time"
+    elif 'Permanent' in html:
+        job_type = "Permanent"
+    elif _CONTRACT_FULL_TIME.search(html):
+        job_type = "Contract, full-time"
+    elif 'Contract' in html:
+        job_type = "Contract"
+    return posted_date, company, job_type
+
+
+def linkedin_details(html: str) -> Tuple[str, str, str]:
+    """(applicants, job type, apply method) from a LinkedIn job page."""
+    applicants = NA
+    captions = element_texts(html, class_name="num-applicants__caption")
+    if captions:
+        applicants = captions[0]
+    else:
+        match = _APPLICANTS.search(html)
+        if match:
+            applicants = f"{match.group(1)} applicants"
+
+    job_type = NA
+    for text in element_texts(html, class_name="job-details-jobs-unified-top-card__job-insight"):
+        found = next((t for t in ("Remote", "Hybrid", "On-site") if t in text), None)
+        if found:
+            job_type = found
+            break
+
+    apply_method = "Apply"
+    buttons = element_texts(html, tags=("button",), class_name="jobs-apply-button--top-card")
+    if buttons and "Easy Apply" in buttons[0]:
+        apply_method = "Easy Apply"
+    return applicants.strip(), job_type, apply_method
+
+
+async def totaljobs_details(html: str, link: str) -> Tuple[str, str, str, str, str]:
+    """(company, salary, location, job type, posted date) from a TotalJobs page, read by the LLM."""
+    from utils.llm_extractor import extract_job_details_with_llm
+    data = await extract_job_details_with_llm(html, link)
+    return tuple(data.get(k, NA) for k in ("company", "salary", "location", "job_type", "posted_date"))
+
+
+# Boards whose extractor is an LLM call: every page replayed costs an API request
+LLM_SOURCES = ("TotalJobs",)
+
+# Fields each extractor fills, as job dict keys in the order of its result tuple
+FIELDS: Dict[str, Tuple[str, ...]] = {
+    "Reed": ("Posted Date Text", "Company", "Job Type"),
+    "LinkedIn": ("Applicants", "Job Type", "Apply Method"),
+    "TotalJobs": ("Company", "Salary", "Location", "Job Type", "Posted Date Text"),
+}
+
+
+def extract(source: str, html: str, link: str) -> Dict[str, str]:
+    """Runs `source`'s extractor on a stored page (synchronously) and returns its fields by job dict key."""
+    if source == "Reed":
+        values = reed_details(html)
+    elif source == "LinkedIn":
+        values = linkedin_details(html)
+    elif source == "TotalJobs":
+        values = asyncio.run(totaljobs_details(html, link))
+    else:
+        raise ValueError(f"No detail extractor for {source}")
+    return dict(zip(FIELDS[source], values))
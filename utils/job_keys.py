@@ -0,0 +1,79 @@
+"""
+Canonical job keys.
+Strips tracking parameters from job board URLs so the same posting always maps
+to the same key, regardless of which keyword search or page surfaced it.
+"""
+import re
+import urllib.parse
+
+# Query parameters that identify the posting itself, per source.
+# Everything else (refId, trackingId, from, source, tk, ...) is tracking noise.
+_IDENTITY_PARAMS = {
+    "indeed": ("jk", "vjk"),
+    "glassdoor": ("jl", "jobListingId"),
+}
+
+_LINKEDIN_ID_RE = re.compile(r'/jobs/view/(?:[^/?#]*?-)?(\d+)')
+_REED_ID_RE = re.compile(r'/jobs/[^/?#]+/(\d+)')
+_STEPSTONE_ID_RE = re.compile(r'/job/[^?#]*?(?:-job|/)(\d+)')
+
+
+def canonicalize_link(link: str, source: str = None) -> str:
+    """
+    Returns a canonical form of a job link with tracking parameters removed.
+    Unknown sources fall back to dropping the query string and fragment.
+    """
+    if not link or link == "N/A":
+        return link
+
+    link = link.strip()
+    parsed = urllib.parse.urlsplit(link)
+    host = parsed.netloc.lower()
+    if host.startswith("m."):
+        host = "www." + host[2:]
+    path = parsed.path.rstrip("/")
+    source = (source or "").lower()
+
+    if "indeed" in host or source == "indeed":
+        params = urllib.parse.parse_qs(parsed.query)
+        for name in _IDENTITY_PARAMS["indeed"]:
+            if params.get(name):
+                return f"https://{host}/viewjob?jk={params[name][0]}"
+
+    if "linkedin" in host or source == "linkedin":
+        match = _LINKEDIN_ID_RE.search(path)
+        if match:
+            return f"https://www.linkedin.com/jobs/view/{match.group(1)}"
+
+    if "reed" in host or source == "reed":
+        match = _REED_ID_RE.search(path)
+        if match:
+            return f"https://{host}{path}"
+
+    if "glassdoor" in host or source == "glassdoor":
+        params = urllib.parse.parse_qs(parsed.query)
+        for name in _IDENTITY_PARAMS["glassdoor"]:
+            if params.get(name):
+                return f"https://{host}{path}?jl={params[name][0]}"
+
+    return urllib.parse.urlunsplit((parsed.scheme or "https", host, path, "", ""))
+
+
+def job_key(job: dict) -> str:
+    """
+    Returns the cycle-wide dedup key for a scraped job dict.
+    TotalJobs and CWJobs share a backend, so their numeric job ids are keyed
+    without the host to catch the same posting on both boards.
+    """
+    link = job.get('Link') or job.get('link')
+    source = job.get('Source') or job.get('source')
+    canonical = canonicalize_link(link, source)
+    if not canonical or canonical == "N/A":
+        return None
+
+    host = urllib.parse.urlsplit(canonical).netloc
+    if "totaljobs" in host or "cwjobs" in host:
+        match = _STEPSTONE_ID_RE.search(canonical)
+        if match:
+            return f"stepstone:{match.group(1)}"
+    return canonical
@@ -1,40 +1,78 @@
 import os
-import google.generativeai as genai
-from typing import Optional
+import threading
+import time
+from typing import Optional, Callable
 from dotenv import load_dotenv
+from utils import metrics
 
 # Load environment variables
 load_dotenv()
 
-# Configure API key
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if GOOGLE_API_KEY:
-    genai.configure(api_key=GOOGLE_API_KEY)
+
+# google.generativeai takes over half a second to import, so it is loaded on the first real call
+_genai = None
+_genai_lock = threading.Lock()
+
+def _client():
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+            if GOOGLE_API_KEY:
+                genai.configure(api_key=GOOGLE_API_KEY)
+            _genai = genai
+        return _genai
+
+def _generate(model_name: str, prompt: str) -> str:
+    """Runs one generate_content call, recording latency and token usage."""
+    start = time.perf_counter()
+    try:
+        response = _client().GenerativeModel(model_name).generate_content(prompt)
+    except Exception:
+        metrics.record_llm_call(time.perf_counter() - start, ok=False)
+        raise
+    usage = getattr(response, "usage_metadata", None)
+    metrics.record_llm_call(
+        time.perf_counter() - start,
+        prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+        output_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+    )
+    return response.text
+
+# Optional stand-in for Gemini, e.g. a canned responder in loadtest_pipeline.py
+_llm_override: Optional[Callable[[str, str], Optional[str]]] = None
+
+def set_llm_override(responder: Optional[Callable[[str, str], Optional[str]]]):
+    """Routes every get_llm_response call to responder(prompt, model_name); None restores Gemini."""
+    global _llm_override
+    _llm_override = responder
 
 def get_llm_response(prompt: str, model_name: str = "gemini-2.0-flash") -> Optional[str]:
     """
     Generates a response from the Google Gemini model.
     Uses gemini-2.0-flash by default for higher rate limits.
     """
+    if _llm_override is not None:
+        start = time.perf_counter()
+        response = _llm_override(prompt, model_name)
+        metrics.record_llm_call(time.perf_counter() - start, ok=response is not None)
+        return response
+
     if not GOOGLE_API_KEY:
         print("Error: GOOGLE_API_KEY not set.")
         return None
 
     try:
-        model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt)
-        return response.text
+        return _generate(model_name, prompt)
     except Exception as e:
         error_msg = str(e)
         if "429" in error_msg or "quota" in error_msg.lower():
             print(f"LLM Rate Limit: Waiting 2 seconds and retrying with gemini-2.0-flash...")
-            import time
             time.sleep(2)
             # Retry with stable model
             try:
-                model = genai.GenerativeModel("gemini-2.0-flash")
-                response = model.generate_content(prompt)
-                return response.text
+                return _generate("gemini-2.0-flash", prompt)
             except Exception as retry_error:
                 print(f"LLM Retry Error: {retry_error}")
                 return None
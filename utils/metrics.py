@@ -0,0 +1,244 @@
+"""
+Per-run instrumentation.
+Stage and per-source wall time, request counts, LLM calls and token usage, cache hits
+and jobs in/out are collected in memory while a cycle runs and stored as one
+run_metrics row when it ends. The same write adds the run to the running totals in
+run_metrics_totals, so old runs can be pruned (after metrics_retention_days) without the
+Prometheus counters going backwards. The API exposes them as JSON and in Prometheus format.
+"""
+import contextvars
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from backend.database import SessionLocal, RunMetrics, RunMetricsTotals
+from utils.config import get_config
+
+# Stage the current code is running under; asyncio.to_thread copies it into worker threads
+_current_stage = contextvars.ContextVar("metrics_stage", default=None)
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile; 0 for no samples."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class RunRecorder:
+    """Accumulates timings and counters for one run. Safe to use from pipeline threads."""
+
+    def __init__(self, cycle_id: int = None):
+        self.cycle_id = cycle_id
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.timings = {}  # (stage, source) -> [seconds, count]
+        self.samples = {}  # (stage, source) -> individual durations, for percentiles
+        self.counters = {}  # (name, stage, source) -> value
+
+    def add_time(self, stage: str, source: Optional[str], seconds: float):
+        with self._lock:
+            entry = self.timings.setdefault((stage, source), [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+            self.samples.setdefault((stage, source), []).append(seconds)
+
+    def incr(self, name: str, value: float = 1, stage: str = None, source: str = None):
+        with self._lock:
+            key = (name, stage, source)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cycle_id": self.cycle_id,
+                "started_at": self.started_at.isoformat(),
+                "wall_seconds": round(time.perf_counter() - self._start, 3),
+                "stages": [
+                    {"stage": stage, "source": source, "seconds": round(seconds, 3), "count": count,
+                     "p50": round(percentile(self.samples[(stage, source)], 50), 3),
+                     "p95": round(percentile(self.samples[(stage, source)], 95), 3)}
+                    for (stage, source), (seconds, count) in sorted(self.timings.items(), key=lambda i: (i[0][0], i[0][1] or ""))
+                ],
+                "counters": [
+                    {"name": name, "stage": stage, "source": source, "value": value}
+                    for (name, stage, source), value in sorted(self.counters.items(), key=lambda i: tuple(p or "" for p in i[0]))
+                ],
+            }
+
+
+_active: Optional[RunRecorder] = None
+
+
+def start_run(cycle_id: int = None) -> RunRecorder:
+    global _active
+    _active = RunRecorder(cycle_id)
+    return _active
+
+
+def active_run() -> Optional[RunRecorder]:
+    return _active
+
+
+def finish_run(store: bool = True) -> Optional[int]:
+    """Ends the active run; stores its metrics unless `store` is False and returns the run_metrics row id."""
+    global _active
+    recorder, _active = _active, None
+    if recorder is None or not store:
+        return None
+
+    data = recorder.to_dict()
+    db = SessionLocal()
+    try:
+        totals = _totals_row(db)
+        totals.data = json.dumps(_add_run(json.loads(totals.data), data))
+        totals.updated_at = datetime.utcnow()
+        row = RunMetrics(cycle_id=recorder.cycle_id, started_at=recorder.started_at,
+                         finished_at=datetime.utcnow(), data=json.dumps(data))
+        db.add(row)
+        db.commit()
+        return row.id
+    except Exception as e:
+        db.rollback()
+        print(f"Metrics save error: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def _add_run(totals: Dict[str, Any], run: Dict[str, Any]) -> Dict[str, Any]:
+    """`totals` with one run's counters and stage seconds added."""
+    counters = {(c["name"], c.get("stage"), c.get("source")): c["value"] for c in totals["counters"]}
+    for c in run.get("counters", []):
+        key = (c["name"], c.get("stage"), c.get("source"))
+        counters[key] = counters.get(key, 0) + c["value"]
+    stages = {(s["stage"], s.get("source")): s["seconds"] for s in totals["stages"]}
+    for s in run.get("stages", []):
+        key = (s["stage"], s.get("source"))
+        stages[key] = stages.get(key, 0) + s["seconds"]
+    return {
+        "runs": totals["runs"] + 1,
+        "counters": [{"name": n, "stage": stage, "source": source, "value": v} for (n, stage, source), v in counters.items()],
+        "stages": [{"stage": stage, "source": source, "seconds": round(v, 3)} for (stage, source), v in stages.items()],
+    }
+
+
+def _totals_row(db) -> RunMetricsTotals:
+    """The totals row; on first use it is built from every run stored so far."""
+    row = db.query(RunMetricsTotals).first()
+    if row is None:
+        totals = {"runs": 0, "counters": [], "stages": []}
+        for (data,) in db.query(RunMetrics.data).order_by(RunMetrics.id):
+            totals = _add_run(totals, json.loads(data or "{}"))
+        row = RunMetricsTotals(id=1, data=json.dumps(totals))
+        db.add(row)
+    return row
+
+
+def totals() -> Dict[str, Any]:
+    """Counters and stage seconds summed over every run ever stored, including pruned ones."""
+    db = SessionLocal()
+    try:
+        row = _totals_row(db)
+        db.commit()
+        return json.loads(row.data)
+    finally:
+        db.close()
+
+
+def prune(days: int = None) -> int:
+    """Deletes run_metrics rows older than metrics_retention_days (0 keeps all); totals are unaffected."""
+    days = get_config().metrics_retention_days if days is None else days
+    if days <= 0:
+        return 0
+    db = SessionLocal()
+    try:
+        _totals_row(db)  # Make sure the runs about to go are already counted
+        removed = (db.query(RunMetrics)
+                   .filter(RunMetrics.started_at < datetime.utcnow() - timedelta(days=days))
+                   .delete(synchronize_session=False))
+        db.commit()
+        return removed
+    finally:
+        db.close()
+
+
+@contextmanager
+def timer(stage: str, source: str = None):
+    """Times a block under `stage` (and optional source); nested LLM calls are attributed to it."""
+    token = _current_stage.set(stage)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+        if _active is not None:
+            _active.add_time(stage, source, time.perf_counter() - start)
+
+
+def incr(name: str, value: float = 1, source: str = None, stage: str = None):
+    """Adds to a counter; the stage defaults to the enclosing timer()."""
+    if _active is not None:
+        _active.incr(name, value, stage or _current_stage.get(), source)
+
+
+def record_llm_call(seconds: float, prompt_tokens: int = 0, output_tokens: int = 0, ok: bool = True):
+    if _active is None:
+        return
+    stage = _current_stage.get() or "other"
+    _active.incr("llm_calls", 1, stage)
+    _active.incr("llm_seconds", seconds, stage)
+    _active.incr("llm_prompt_tokens", prompt_tokens, stage)
+    _active.incr("llm_output_tokens", output_tokens, stage)
+    if not ok:
+        _active.incr("llm_errors", 1, stage)
+
+
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text(run_totals: Dict[str, Any], latest: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Renders the Prometheus text format: counters from `run_totals` (see totals()), plus
+    gauges for `latest`, the decoded data of the most recent run.
+    """
+    totals = {(c["name"], c.get("stage"), c.get("source")): c["value"] for c in run_totals.get("counters", [])}
+    stage_seconds = {(s["stage"], s.get("source")): s["seconds"] for s in run_totals.get("stages", [])}
+
+    def labels(stage, source):
+        parts = [f'stage="{_label_value(stage)}"'] if stage else []
+        if source:
+            parts.append(f'source="{_label_value(source)}"')
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    lines = [
+        "# HELP jobscraper_runs_total Pipeline runs recorded.",
+        "# TYPE jobscraper_runs_total counter",
+        f"jobscraper_runs_total {run_totals.get('runs', 0)}",
+        "# HELP jobscraper_stage_seconds_total Wall time spent per stage and source.",
+        "# TYPE jobscraper_stage_seconds_total counter",
+    ]
+    for (stage, source), seconds in sorted(stage_seconds.items(), key=lambda i: (i[0][0], i[0][1] or "")):
+        lines.append(f"jobscraper_stage_seconds_total{labels(stage, source)} {seconds:.3f}")
+
+    for name in sorted({k[0] for k in totals}):
+        lines.append(f"# TYPE jobscraper_{name}_total counter")
+        for (n, stage, source), value in sorted(totals.items(), key=lambda i: tuple(p or "" for p in i[0])):
+            if n == name:
+                lines.append(f"jobscraper_{name}_total{labels(stage, source)} {value:g}")
+
+    if latest:
+        lines.append("# HELP jobscraper_last_run_seconds Wall time of the most recent run.")
+        lines.append("# TYPE jobscraper_last_run_seconds gauge")
+        lines.append(f"jobscraper_last_run_seconds {latest.get('wall_seconds', 0):.3f}")
+        lines.append("# TYPE jobscraper_last_run_stage_seconds gauge")
+        for s in latest.get("stages", []):
+            lines.append(f"jobscraper_last_run_stage_seconds{labels(s['stage'], s.get('source'))} {s['seconds']:.3f}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,152 @@
+"""
+Near-duplicate detection for job postings.
+The same role is often listed on several boards under different URLs. Each job is
+reduced to a MinHash signature over its normalized (title, company, location, salary)
+tokens; LSH banding turns signature lookups into indexed bucket matches, so finding
+candidates never scans the whole table.
+"""
+import hashlib
+import re
+from typing import Dict, Any, List, Tuple
+
+NUM_PERM = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed permutation coefficients so signatures stay comparable across runs
+_PERMUTATIONS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MERSENNE_PRIME)
+    for i in range(NUM_PERM)
+]
+_EMPTY_SIGNATURE = tuple([_MAX_HASH] * NUM_PERM)
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9£$€]+')
+_COMPANY_SUFFIX_RE = re.compile(r'\b(ltd|limited|plc|llp|inc|group|uk|the)\b')
+_LOCATION_NOISE_RE = re.compile(r'\b(hybrid|remote|on-site|onsite|greater|area|city of|england|united kingdom)\b')
+_SALARY_NUMBER_RE = re.compile(r'(\d+(?:[.,]\d+)*)\s*(k)?', re.IGNORECASE)
+_TITLE_STOPWORDS = {"a", "an", "and", "the", "of", "for", "to", "in", "with", "job", "role"}
+
+
+def _tokens(text: str, stopwords=()) -> List[str]:
+    if not text or text.strip().upper() == "N/A":
+        return []
+    return [t for t in _NON_WORD_RE.split(text.lower()) if t and t not in stopwords]
+
+
+def _salary_tokens(salary: str) -> List[str]:
+    """Reduces a salary string to rounded thousands so '£50,000' and '£50k' agree."""
+    if not salary or salary == "N/A":
+        return []
+    tokens = []
+    for number, k in _SALARY_NUMBER_RE.findall(salary):
+        try:
+            value = float(number.replace(",", ""))
+        except ValueError:
+            continue
+        if k:
+            value *= 1000
+        tokens.append(str(int(round(value / 1000))))
+    return tokens
+
+
+def shingles(job: Dict[str, Any]) -> set:
+    """
+    Returns the field-prefixed token set a job's signature is built from; empty unless
+    both title and company have tokens.
+    """
+    title = job.get('Title') or job.get('title')
+    company = job.get('Company') or job.get('company') or ""
+    location = job.get('Location') or job.get('location') or ""
+    salary = job.get('Salary') or job.get('salary')
+
+    title_features = {f"t:{t}" for t in _tokens(title, _TITLE_STOPWORDS)}
+    company_features = {f"c:{t}" for t in _tokens(_COMPANY_SUFFIX_RE.sub(" ", company.lower()))}
+    # A title alone (CWJobs cards carry no company) cannot tell two postings apart
+    if not title_features or not company_features:
+        return set()
+    features = title_features | company_features
+    features.update(f"l:{t}" for t in _tokens(_LOCATION_NOISE_RE.sub(" ", location.lower())))
+    features.update(f"s:{t}" for t in _salary_tokens(salary))
+    return features
+
+
+def minhash(features: set) -> Tuple[int, ...]:
+    """Computes a NUM_PERM MinHash signature for a feature set."""
+    if not features:
+        return _EMPTY_SIGNATURE
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode(), digest_size=8).digest(), "big") for f in features]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def band_keys(signature: Tuple[int, ...]) -> List[str]:
+    """Returns one LSH bucket key per band; jobs sharing any key are candidates."""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(repr(chunk).encode(), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def encode_signature(signature: Tuple[int, ...]) -> str:
+    return ",".join(format(v, "x") for v in signature)
+
+
+def decode_signature(encoded: str) -> Tuple[int, ...]:
+    return tuple(int(v, 16) for v in encoded.split(","))
+
+
+def fingerprint(job: Dict[str, Any]) -> Tuple[int, ...]:
+    return minhash(shingles(job))
+
+
+def has_features(signature: Tuple[int, ...]) -> bool:
+    """False for jobs with nothing to compare on; those are never merged."""
+    return signature != _EMPTY_SIGNATURE
+
+
+def cluster_jobs(jobs: List[Dict[str, Any]], threshold: float = SIMILARITY_THRESHOLD) -> List[List[int]]:
+    """
+    Groups a batch of jobs into near-duplicate clusters.
+    Returns lists of indexes into `jobs`; the first index of each cluster is its representative.
+    """
+    parent = list(range(len(jobs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures = [fingerprint(job) for job in jobs]
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        if not has_features(signature):
+            continue
+        for key in band_keys(signature):
+            buckets.setdefault(key, []).append(i)
+
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and similarity(signatures[i], signatures[j]) >= threshold:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = {}
+    for i in range(len(jobs)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(clusters.values(), key=lambda c: c[0])
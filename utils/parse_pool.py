@@ -0,0 +1,98 @@
+"""
+Parse-worker pool.
+CPU-bound page work (extractors over page.content(), snapshot hashing and compression)
+would otherwise run on the event loop that drives Playwright and stall every other page
+while it runs. submit() hands a call to a pool of worker processes and returns an
+awaitable; run() submits and awaits in one step. The pool is created on first use with
+parse_workers processes (one per CPU by default) and kept for the life of the process;
+parse_workers = 0 runs calls inline, and a pool that dies is replaced once before
+falling back to inline calls. Functions and arguments must be picklable: pass
+module-level functions and plain data, never Playwright objects.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from utils.config import get_config
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def _context():
+    # Forking a process that runs threads (asyncio.to_thread, the browser driver) is unsafe
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Workers are forked from a server that has already imported the parsing code
+    context.set_forkserver_preload(["__main__", "utils.extractors", "utils.snapshots"])
+    return context
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """The shared pool, or None when parsing runs inline."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            workers = get_config().parse_workers
+            if workers <= 0:
+                return None
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_context())
+        return _pool
+
+
+def warm():
+    """Starts every worker now (call it from a thread), so the first parse does not wait for process start-up."""
+    try:
+        pool = get_pool()
+        if pool is not None:
+            for future in [pool.submit(os.getpid) for _ in range(get_config().parse_workers)]:
+                future.result()
+    except Exception as e:
+        print(f"Could not start parse workers: {e}")
+
+
+def _replace(broken: ProcessPoolExecutor):
+    global _pool
+    with _lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def submit(fn: Callable, *args) -> "asyncio.Future":
+    """Schedules fn(*args) on a worker; await the result from the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+    if pool is None:
+        future = loop.create_future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    return asyncio.wrap_future(pool.submit(fn, *args), loop=loop)
+
+
+async def run(fn: Callable, *args) -> Any:
+    """Runs fn(*args) in the pool and returns its result."""
+    for attempt in range(2):
+        pool = get_pool()
+        try:
+            return await submit(fn, *args)
+        except BrokenProcessPool:
+            print(f"Parse worker died running {fn.__name__}; {'restarting the pool' if attempt == 0 else 'running inline'}.")
+            _replace(pool)
+    return fn(*args)
+
+
+def shutdown():
+    """Stops the workers; the next submit starts a new pool."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
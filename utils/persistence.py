@@ -3,6 +3,7 @@ import os
 from datetime import datetime
 from typing import Dict, Any
 from backend.database import SessionLocal, AgentLog, Config, JobPost
+from utils.config import invalidate as invalidate_config
 
 # Keep file-based persistence for complex objects like Persona and Error Tracker for now
 # We could migrate these to DB later, but for now, let's focus on Logs and Jobs
@@ -93,10 +94,13 @@ def set_config_value(key: str, value: str):
     try:
         config = db.query(Config).filter(Config.key == key).first()
         if config:
-            config.value = value
+            if config.value != value:
+                config.value = value
+                config.version = (config.version or 0) + 1
         else:
             new_config = Config(key=key, value=value)
             db.add(new_config)
         db.commit()
     finally:
         db.close()
+    invalidate_config()
@@ -0,0 +1,105 @@
+"""
+Success Persona versioning.
+success_persona.json stays the working copy the agents read; every distinct persona is
+also recorded as a PersonaVersion row, and JobPost.persona_version says which version
+scored a row. Writes go through save_persona; edits made to the file by hand are picked
+up by current_version, which registers the file's content whenever it is new.
+
+Further candidates are named personas, one JSON file each in personas/ (personas/<name>.json).
+They share the scraped job corpus and are scored into job_scores alongside the default one.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+from sqlalchemy import or_
+from backend.database import SessionLocal, PersonaVersion, JobPost
+from utils.persistence import load_json, save_json, log_agent_action, SUCCESS_PERSONA_FILE
+
+DEFAULT_PERSONA = "default"
+PERSONA_DIR = "personas"
+_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def persona_hash(persona: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(persona, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def persona_file(name: str = DEFAULT_PERSONA) -> str:
+    if name == DEFAULT_PERSONA:
+        return SUCCESS_PERSONA_FILE
+    if not _NAME.match(name or ""):
+        raise ValueError(f"Invalid persona name: {name!r}")
+    return os.path.join(PERSONA_DIR, f"{name}.json")
+
+
+def persona_names():
+    """The default persona followed by the named ones in personas/."""
+    names = [os.path.splitext(os.path.basename(f))[0] for f in glob.glob(os.path.join(PERSONA_DIR, "*.json"))]
+    return [DEFAULT_PERSONA] + sorted(n for n in names if n != DEFAULT_PERSONA and _NAME.match(n))
+
+
+def load_personas() -> Dict[str, Dict[str, Any]]:
+    """Every persona with content, by name."""
+    personas = {name: load_json(persona_file(name)) for name in persona_names()}
+    return {name: p for name, p in personas.items() if p}
+
+
+def _name_filter(name: str):
+    # Versions recorded before personas were named belong to the default one
+    if name == DEFAULT_PERSONA:
+        return or_(PersonaVersion.name == name, PersonaVersion.name.is_(None))
+    return PersonaVersion.name == name
+
+
+def _register(persona: Dict[str, Any], source: str, name: str = DEFAULT_PERSONA) -> Optional[int]:
+    """Version id of `persona`, recording it as the newest version if it differs from the latest."""
+    if not persona:
+        return None
+    content_hash = persona_hash(persona)
+    db = SessionLocal()
+    try:
+        latest = db.query(PersonaVersion).filter(_name_filter(name)).order_by(PersonaVersion.id.desc()).first()
+        if latest and latest.content_hash == content_hash:
+            return latest.id
+        version = PersonaVersion(name=name, content_hash=content_hash, persona=json.dumps(persona, default=str), source=source)
+        db.add(version)
+        db.flush()
+        if latest is None and name == DEFAULT_PERSONA:
+            # Scores stored before versioning existed were made with this persona
+            db.query(JobPost).filter(JobPost.persona_version.is_(None)).update(
+                {JobPost.persona_version: version.id}, synchronize_session=False)
+        db.commit()
+        log_agent_action("Persona", f"Persona '{name}' version {version.id} recorded ({source}).", "INFO")
+        return version.id
+    finally:
+        db.close()
+
+
+def current_version(persona: Dict[str, Any] = None, filename: str = None, name: str = DEFAULT_PERSONA) -> Optional[int]:
+    """Version id of the persona in effect (the file's content unless `persona` is given)."""
+    if persona is None:
+        persona = load_json(filename or persona_file(name))
+    return _register(persona, "file", name)
+
+
+def save_persona(persona: Dict[str, Any], source: str, filename: str = None, name: str = DEFAULT_PERSONA) -> Optional[int]:
+    """Writes the persona file and records the new version. Returns its version id."""
+    filename = filename or persona_file(name)
+    if os.path.dirname(filename):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    save_json(filename, persona)
+    return _register(persona, source, name)
+
+
+def outdated_count(version: int) -> int:
+    """Scraped jobs whose score predates `version`."""
+    db = SessionLocal()
+    try:
+        return db.query(JobPost).filter(
+            JobPost.is_external.isnot(True),
+            (JobPost.persona_version.is_(None)) | (JobPost.persona_version != version)).count()
+    finally:
+        db.close()
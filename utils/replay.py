@@ -0,0 +1,104 @@
+"""
+Record/replay of job board traffic for offline scraper runs.
+A recording captures every document and XHR response a scrape fetches into a fixture
+archive (gzip bodies + JSON index). Replaying serves those responses through Playwright
+route interception, so the scrapers run end to end with no network access.
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+INDEX_FILE = "index.json"
+BODIES_DIR = "bodies"
+
+# Only these are recorded; images, fonts, stylesheets etc. are aborted on replay
+RECORDED_TYPES = ("document", "xhr", "fetch")
+
+
+class FixtureArchive:
+    """A directory of recorded responses keyed by request method and URL."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.meta: Dict[str, Any] = {}
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {})
+            self.meta = data.get("meta", {})
+
+    @staticmethod
+    def key(method: str, url: str) -> str:
+        return f"{method.upper()} {url}"
+
+    def add(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        digest = hashlib.sha1(body).hexdigest()
+        body_path = os.path.join(self.path, BODIES_DIR, f"{digest}.gz")
+        if not os.path.exists(body_path):
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            with gzip.open(body_path, 'wb') as f:
+                f.write(body)
+        self.entries[self.key(method, url)] = {
+            "status": status,
+            "content_type": headers.get("content-type", "text/html"),
+            "body": digest,
+        }
+
+    def lookup(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(self.key(method, url))
+
+    def read_body(self, entry: Dict[str, Any]) -> bytes:
+        with gzip.open(os.path.join(self.path, BODIES_DIR, f"{entry['body']}.gz"), 'rb') as f:
+            return f.read()
+
+    def save(self, **meta):
+        self.meta.update(meta)
+        self.meta["recorded_at"] = datetime.now().isoformat()
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, INDEX_FILE), 'w', encoding='utf-8') as f:
+            json.dump({"meta": self.meta, "entries": self.entries}, f, indent=2, sort_keys=True)
+
+
+def recorder(archive: FixtureArchive):
+    """Returns a scrape_all_jobs setup_context hook that records responses into the archive."""
+    async def on_response(response):
+        request = response.request
+        if request.resource_type not in RECORDED_TYPES:
+            return
+        try:
+            body = await response.body()
+        except Exception:
+            return  # Redirects and aborted requests have no body
+        archive.add(request.method, request.url, response.status, await response.all_headers(), body)
+
+    async def setup(context):
+        context.on("response", on_response)
+    return setup
+
+
+def replayer(archive: FixtureArchive, misses: list = None):
+    """
+    Returns a scrape_all_jobs setup_context hook that serves responses from the archive.
+    Unrecorded documents get a 404 (and are appended to `misses`); other resources are aborted.
+    """
+    async def handle(route):
+        request = route.request
+        entry = archive.lookup(request.method, request.url)
+        if entry:
+            await route.fulfill(status=entry["status"], content_type=entry["content_type"],
+                                body=archive.read_body(entry))
+        elif request.resource_type == "document":
+            if misses is not None:
+                misses.append(request.url)
+            await route.fulfill(status=404, content_type="text/html", body="<html><body>Not recorded</body></html>")
+        else:
+            await route.abort()
+
+    async def setup(context):
+        await context.route("**/*", handle)
+    return setup
@@ -0,0 +1,207 @@
+"""
+Background re-scoring after a Success Persona change.
+Stored jobs scored under an older persona version are re-evaluated in priority order
+(unapplied first, then most recently posted, then highest previous score), a page at a
+time, with LLM calls capped at rescore_calls_per_minute. Progress lives in the rows
+themselves: each re-scored row is committed with the new persona_version, so a run
+that is stopped or crashes resumes where it left off, and a persona edited mid-run
+simply re-targets the remaining rows at the newer version. Named personas are then
+brought up to date the same way in job_scores, which also backfills a newly added one.
+A run that ends with its process is flagged in config, so the API resumes it on startup.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List
+from sqlalchemy import or_, and_
+from backend.database import SessionLocal, JobPost, JobScore
+from utils.persistence import log_agent_action, set_config_value
+from utils.config import get_config
+from utils import metrics, persona, score_cache
+
+PAGE_SIZE = 25 # Rows fetched and committed per step
+IN_PROGRESS_KEY = "rescore_in_progress" # "true" from start() until the run ends
+
+rescore_status = {
+    "state": "IDLE", # IDLE, RUNNING, ERROR
+    "persona_version": None,
+    "rescored": 0,
+    "remaining": None,
+    "started_at": None,
+    "message": "",
+}
+_thread = None
+_stop = threading.Event()
+
+
+class _Throttle:
+    """Spaces out calls so at most `per_minute` start in any minute."""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0
+        self.next_at = 0.0
+
+    def wait(self):
+        delay = self.next_at - time.monotonic()
+        if delay > 0:
+            _stop.wait(delay)
+        self.next_at = time.monotonic() + self.interval
+
+
+_PRIORITY = (JobPost.is_applied.asc(), JobPost.posted_date.desc(), JobPost.match_score.desc(), JobPost.id.desc())
+
+
+def _next_page(db, version: int) -> List[JobPost]:
+    return (db.query(JobPost)
+            .filter(JobPost.is_external.isnot(True),
+                    or_(JobPost.persona_version.is_(None), JobPost.persona_version != version))
+            .order_by(*_PRIORITY)
+            .limit(PAGE_SIZE)
+            .all())
+
+
+def _next_persona_page(db, name: str, version: int) -> List[JobPost]:
+    """Jobs with no job_scores row for persona `name`, or one from an older version."""
+    return (db.query(JobPost)
+            .outerjoin(JobScore, and_(JobScore.job_id == JobPost.id, JobScore.persona == name))
+            .filter(JobPost.is_external.isnot(True),
+                    or_(JobScore.job_id.is_(None), JobScore.persona_version.is_(None), JobScore.persona_version != version))
+            .order_by(*_PRIORITY)
+            .limit(PAGE_SIZE)
+            .all())
+
+
+def _as_job(row: JobPost) -> Dict[str, Any]:
+    return {"Title": row.title, "Company": row.company, "Location": row.location,
+            "Salary": row.salary, "Job Type": row.job_type}
+
+
+def rescore_outdated(evaluator=None) -> int:
+    """Re-scores every outdated job (until stopped). Returns how many rows were updated."""
+    # The API imports this module for start/stop; the scoring stack loads only when a run starts
+    from agents.evaluator import EvaluatorAgent, ERROR_REASONING
+    evaluator = evaluator or EvaluatorAgent()
+    throttle = _Throttle(get_config().rescore_calls_per_minute)
+
+    def evaluate(batch):
+        throttle.wait()
+        return evaluator.evaluate_batch(batch)
+
+    rescored = 0
+    while not _stop.is_set():
+        evaluator.reload_persona()
+        version = evaluator.persona_version
+        if version is None:
+            log_agent_action("Rescorer", "No Success Persona found. Nothing to re-score against.", "WARNING")
+            break
+        rescore_status["persona_version"] = version
+
+        db = SessionLocal()
+        try:
+            rows = _next_page(db, version)
+            if not rows:
+                break
+            with metrics.timer("rescore"):
+                results = score_cache.cached([_as_job(r) for r in rows], "score", score_cache.persona_hash(evaluator.persona),
+                                             evaluate, evaluator.batch_size, lambda r: r[-1] == ERROR_REASONING)
+            for row, (score, reasoning) in zip(rows, results):
+                if reasoning == ERROR_REASONING:
+                    continue # Left outdated; retried on the next run
+                row.match_score = score
+                row.match_reasoning = reasoning
+                row.persona_version = version
+                db.merge(JobScore(job_id=row.id, persona=persona.DEFAULT_PERSONA, score=score, reasoning=reasoning,
+                                  persona_version=version, scored_at=datetime.utcnow()))
+                rescored += 1
+            db.commit()
+        finally:
+            db.close()
+
+        if all(r[-1] == ERROR_REASONING for r in results):
+            log_agent_action("Rescorer", "LLM unavailable; pausing re-scoring.", "ERROR")
+            break
+        rescore_status["rescored"] = rescored
+        rescore_status["remaining"] = persona.outdated_count(version)
+        metrics.incr("jobs_rescored", len(rows))
+
+    if rescored:
+        log_agent_action("Rescorer", f"Re-scored {rescored} jobs against persona version {rescore_status['persona_version']}.", "SUCCESS")
+    for name in list(evaluator.extra_personas):
+        if _stop.is_set():
+            break
+        rescored += _rescore_named(evaluator, name, throttle)
+    return rescored
+
+
+def _rescore_named(evaluator, name: str, throttle: _Throttle) -> int:
+    from agents.evaluator import ERROR_REASONING
+    rescored = 0
+    while not _stop.is_set():
+        evaluator.reload_persona()
+        version = evaluator.extra_versions.get(name)
+        if version is None:
+            break # Persona removed mid-run
+
+        db = SessionLocal()
+        try:
+            rows = _next_persona_page(db, name, version)
+            if not rows:
+                break
+            jobs = evaluator.score_extra_personas([_as_job(r) for r in rows], [name], before_call=throttle.wait)
+            failed = 0
+            for row, job in zip(rows, jobs):
+                score, reasoning, _ = job['persona_scores'][name]
+                if reasoning == ERROR_REASONING:
+                    failed += 1
+                    continue
+                db.merge(JobScore(job_id=row.id, persona=name, score=score, reasoning=reasoning,
+                                  persona_version=version, scored_at=datetime.utcnow()))
+                rescored += 1
+            db.commit()
+        finally:
+            db.close()
+
+        if failed == len(rows):
+            log_agent_action("Rescorer", f"LLM unavailable; pausing re-scoring for persona '{name}'.", "ERROR")
+            break
+        rescore_status["rescored"] += len(rows) - failed
+        metrics.incr("jobs_rescored", len(rows) - failed, source=name)
+
+    if rescored:
+        log_agent_action("Rescorer", f"Scored {rescored} jobs for persona '{name}' (version {version}).", "SUCCESS")
+    return rescored
+
+
+def _run():
+    try:
+        rescore_outdated()
+        rescore_status["state"] = "IDLE"
+        rescore_status["message"] = "Stopped" if _stop.is_set() else "Up to date"
+    except Exception as e:
+        rescore_status["state"] = "ERROR"
+        rescore_status["message"] = f"Error: {e}"
+        log_agent_action("Rescorer", f"Re-scoring failed: {e}", "ERROR")
+    finally:
+        set_config_value(IN_PROGRESS_KEY, "false")
+
+
+def interrupted() -> bool:
+    """True when the last run was started but never ended, i.e. its process exited mid-run."""
+    return (_thread is None or not _thread.is_alive()) and get_config().get(IN_PROGRESS_KEY) == "true"
+
+
+def start() -> bool:
+    """Starts the background re-score unless one is running. Returns whether it started."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return False
+    _stop.clear()
+    rescore_status.update(state="RUNNING", rescored=0, remaining=None, started_at=datetime.now(), message="Re-scoring...")
+    set_config_value(IN_PROGRESS_KEY, "true")
+    _thread = threading.Thread(target=_run, name="rescore", daemon=True)
+    _thread.start()
+    return True
+
+
+def stop():
+    _stop.set()
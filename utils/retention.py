@@ -0,0 +1,264 @@
+"""
+Retention for the hot tables.
+agent_logs and job_posts are trimmed by age (and agent_logs also by row count). Trimmed
+rows are moved in chunks into compressed archive tables, or into Parquet files when
+`retention_archive_dir` is configured and pyarrow is installed, and the freed pages are
+returned to the filesystem with SQLite's incremental vacuum (the one-off switch into that mode
+is the separate enable_incremental_vacuum step). Per-run metrics older than
+metrics_retention_days are deleted; their counters live on in the running totals.
+"""
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+from sqlalchemy import func, or_, text
+from backend.database import (SessionLocal, engine, AgentLog, AgentLogArchive, JobPost, JobPostArchive,
+                              JobFingerprintBand, JobScore, ArchivedJobLink)
+from utils.persistence import log_agent_action
+from utils.config import get_config
+from utils import metrics, score_cache, snapshots
+
+# Rows moved per archive chunk, and the most chunks one run will move per table,
+# so a large first run is spread over several cycles instead of stalling one
+CHUNK_SIZE = 5000
+MAX_CHUNKS_PER_RUN = 20
+
+# Free pages returned per run; 0 releases every free page
+VACUUM_PAGES = 0
+
+
+def _row_dict(row) -> Dict[str, Any]:
+    return {c.name: getattr(row, c.name) for c in row.__table__.columns}
+
+
+def _compress(rows: List[Dict[str, Any]]) -> bytes:
+    return zlib.compress(json.dumps(rows, default=str).encode("utf-8"), 9)
+
+
+def read_archive(payload: bytes) -> List[Dict[str, Any]]:
+    """Decodes one archive chunk back into row dicts (datetimes as ISO strings)."""
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _parquet_dir():
+    path = get_config().retention_archive_dir
+    if not path:
+        return None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("retention_archive_dir is set but pyarrow is not installed; archiving to tables instead.")
+        return None
+    return path
+
+
+def _write_parquet(directory: str, table: str, rows: List[Dict[str, Any]]) -> str:
+    import pandas as pd
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{table}_{rows[0]['id']}-{rows[-1]['id']}.parquet")
+    pd.DataFrame(rows).to_parquet(path, index=False, compression="zstd")
+    return path
+
+
+def _archive_chunk(db, model, archive_model, rows, time_column: str, parquet_dir=None):
+    """Writes one chunk of rows to the archive and deletes them from the hot table."""
+    data = [_row_dict(r) for r in rows]
+    ids = [r.id for r in rows]
+
+    if parquet_dir:
+        _write_parquet(parquet_dir, model.__tablename__, data)
+    else:
+        times = [d[time_column] for d in data if d[time_column] is not None]
+        db.add(archive_model(first_id=ids[0], last_id=ids[-1], row_count=len(ids),
+                             oldest=min(times) if times else None, newest=max(times) if times else None,
+                             payload=_compress(data)))
+
+    if model is JobPost:
+        links = {d["link"] for d in data if d["link"]}
+        existing = {r[0] for r in db.query(ArchivedJobLink.link).filter(ArchivedJobLink.link.in_(links))}
+        db.add_all(ArchivedJobLink(link=link) for link in links - existing)
+        db.query(JobFingerprintBand).filter(JobFingerprintBand.job_id.in_(ids)).delete(synchronize_session=False)
+        db.query(JobScore).filter(JobScore.job_id.in_(ids)).delete(synchronize_session=False)
+    db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+    db.commit()
+    if model is JobPost:
+        # Imported here so the API can import this module without loading numpy
+        from utils import embeddings
+        embeddings.get_index().remove(ids)
+    return len(ids)
+
+
+def _archive_query(db, query, model, archive_model, time_column, parquet_dir, limit=None):
+    moved = 0
+    for _ in range(MAX_CHUNKS_PER_RUN):
+        size = CHUNK_SIZE if limit is None else min(CHUNK_SIZE, limit - moved)
+        if size <= 0:
+            break
+        rows = query.order_by(model.id).limit(size).all()
+        if not rows:
+            break
+        moved += _archive_chunk(db, model, archive_model, rows, time_column, parquet_dir)
+    return moved
+
+
+def archive_logs(db, parquet_dir=None) -> int:
+    """Moves logs older than log_retention_days, then the oldest beyond log_max_rows."""
+    cutoff = datetime.utcnow() - timedelta(days=get_config().log_retention_days)
+    moved = _archive_query(db, db.query(AgentLog).filter(AgentLog.timestamp < cutoff),
+                           AgentLog, AgentLogArchive, "timestamp", parquet_dir)
+
+    excess = db.query(AgentLog).count() - get_config().log_max_rows
+    if excess > 0:
+        moved += _archive_query(db, db.query(AgentLog), AgentLog, AgentLogArchive, "timestamp", parquet_dir, limit=excess)
+    return moved
+
+
+def archive_jobs(db, parquet_dir=None) -> int:
+    """
+    Moves jobs first seen more than job_retention_days ago. Jobs the user applied to,
+    annotated or gave feedback on are kept, since the UI and the learner still use them.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=get_config().job_retention_days)
+    query = db.query(JobPost).filter(
+        JobPost.created_at < cutoff,
+        or_(JobPost.is_applied.is_(None), JobPost.is_applied.is_(False)),
+        or_(JobPost.user_remarks.is_(None), JobPost.user_remarks == ""),
+        or_(JobPost.user_feedback_comment.is_(None), JobPost.user_feedback_comment == ""),
+    )
+    return _archive_query(db, query, JobPost, JobPostArchive, "created_at", parquet_dir)
+
+
+def _parquet_row_counts() -> Dict[str, int]:
+    """Rows archived to Parquet per table, read from the file footers in retention_archive_dir."""
+    counts = {AgentLog.__tablename__: 0, JobPost.__tablename__: 0}
+    directory = _parquet_dir()
+    if not directory or not os.path.isdir(directory):
+        return counts
+    import pyarrow.parquet as pq
+    for name in os.listdir(directory):
+        table = next((t for t in counts if name.startswith(f"{t}_") and name.endswith(".parquet")), None)
+        if table:
+            counts[table] += pq.ParquetFile(os.path.join(directory, name)).metadata.num_rows
+    return counts
+
+
+def storage_stats() -> Dict[str, Any]:
+    """
+    Database file size and free pages, plus row counts of the retained tables. Archived
+    rows are reported per target (archive tables and Parquet files) and in total.
+    """
+    db = SessionLocal()
+    try:
+        logs_tables = db.query(func.sum(AgentLogArchive.row_count)).scalar() or 0
+        jobs_tables = db.query(func.sum(JobPostArchive.row_count)).scalar() or 0
+        stats = {
+            "agent_logs": db.query(AgentLog).count(),
+            "job_posts": db.query(JobPost).count(),
+        }
+    finally:
+        db.close()
+    parquet = _parquet_row_counts()
+    stats.update({
+        "agent_logs_archived": logs_tables + parquet[AgentLog.__tablename__],
+        "agent_logs_archived_tables": logs_tables,
+        "agent_logs_archived_parquet": parquet[AgentLog.__tablename__],
+        "job_posts_archived": jobs_tables + parquet[JobPost.__tablename__],
+        "job_posts_archived_tables": jobs_tables,
+        "job_posts_archived_parquet": parquet[JobPost.__tablename__],
+    })
+
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            page_size = conn.execute(text("PRAGMA page_size")).scalar()
+            page_count = conn.execute(text("PRAGMA page_count")).scalar()
+            free_pages = conn.execute(text("PRAGMA freelist_count")).scalar()
+            auto_vacuum = conn.execute(text("PRAGMA auto_vacuum")).scalar()
+        stats.update({"page_size": page_size, "page_count": page_count, "free_pages": free_pages,
+                      "file_bytes": page_size * page_count, "incremental_vacuum": auto_vacuum == 2})
+    return stats
+
+
+def enable_incremental_vacuum() -> bool:
+    """
+    Switches an existing database to incremental auto-vacuum mode with one full VACUUM.
+    That rewrites the whole file under an exclusive lock, so it is a maintenance step
+    (POST /maintenance/vacuum), never part of a cycle; new databases start in this mode.
+    Returns whether the mode was switched.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    raw = engine.raw_connection()
+    try:
+        if raw.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        log_agent_action("Retention", "Switching database to incremental auto-vacuum (one-off full VACUUM).", "INFO")
+        raw.executescript("PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+        return True
+    finally:
+        raw.close()
+
+
+def incremental_vacuum(pages: int = VACUUM_PAGES) -> bool:
+    """
+    Returns free pages to the filesystem. SQLite only does this in incremental auto-vacuum
+    mode; until enable_incremental_vacuum() has run, this does nothing and returns False.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    # Raw sqlite3 connection: executescript steps the pragma to completion, whereas a
+    # plain execute through the driver stops after freeing the first page
+    raw = engine.raw_connection()
+    try:
+        if raw.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return False
+        raw.executescript(f"PRAGMA incremental_vacuum({int(pages)});" if pages else "PRAGMA incremental_vacuum;")
+        return True
+    finally:
+        raw.close()
+
+
+def run_retention() -> Dict[str, Any]:
+    """Applies the retention policies, vacuums, and returns what was moved and reclaimed."""
+    with metrics.timer("retention"):
+        before = storage_stats()
+        parquet_dir = _parquet_dir()
+
+        db = SessionLocal()
+        try:
+            logs_moved = archive_logs(db, parquet_dir)
+            jobs_moved = archive_jobs(db, parquet_dir)
+            cache_evicted = score_cache.evict()
+            snapshots_pruned = snapshots.prune()
+            run_metrics_pruned = metrics.prune()
+        except Exception as e:
+            db.rollback()
+            log_agent_action("Retention", f"Archiving failed: {e}", "ERROR")
+            return {"error": str(e)}
+        finally:
+            db.close()
+
+        try:
+            incremental_vacuum()
+        except Exception as e:
+            log_agent_action("Retention", f"Vacuum failed: {e}", "ERROR")
+        after = storage_stats()
+
+    metrics.incr("rows_archived", logs_moved, source="agent_logs", stage="retention")
+    metrics.incr("rows_archived", jobs_moved, source="job_posts", stage="retention")
+    report = {
+        "logs_archived": logs_moved,
+        "jobs_archived": jobs_moved,
+        "score_cache_evicted": cache_evicted,
+        "snapshots_pruned": snapshots_pruned,
+        "run_metrics_pruned": run_metrics_pruned,
+        "archive_target": parquet_dir or "tables",
+        "bytes_before": before.get("file_bytes"),
+        "bytes_after": after.get("file_bytes"),
+        "bytes_reclaimed": (before.get("file_bytes") or 0) - (after.get("file_bytes") or 0),
+        "before": before,
+        "after": after,
+    }
+    if logs_moved or jobs_moved or report["bytes_reclaimed"]:
+        log_agent_action("Retention", f"Archived {logs_moved} logs and {jobs_moved} jobs; reclaimed {report['bytes_reclaimed'] / 1024:.0f} KiB.", "SUCCESS")
+    return report
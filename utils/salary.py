@@ -0,0 +1,135 @@
+"""
+Salary normalization.
+Boards show pay as free text ("£50,000 - £60,000", "£45k-£55k a year", "Up to £600 per day",
+"£25 - £30 per hour", "Competitive"). parse_salaries turns a column of such strings into
+annualized min/max figures, a day-rate flag and an ISO currency, parsing each distinct
+string once with vectorized regex extraction, so ingest and backfills stay fast. Day and
+hourly rates are annualized over WORKING_DAYS days of HOURS_PER_DAY hours; a figure without
+a stated period is read as a day rate under DAY_RATE_CEILING, hourly under HOURLY_CEILING.
+"""
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+
+WORKING_DAYS = 220
+HOURS_PER_DAY = 7.5
+HOURLY_CEILING = 200
+DAY_RATE_CEILING = 3000
+COLUMNS = ("salary_min", "salary_max", "salary_day_rate", "salary_currency")
+
+_AMOUNT = r'(\d[\d,]*(?:\.\d+)?)\s*(k\b)?'
+_RANGE = _AMOUNT + r'(?:\s*(?:-|–|—|to)\s*(?:[£$€]|gbp|usd|eur)?\s*' + _AMOUNT + r')?'
+_PRICED_RANGE = r'(?:[£$€]|\bgbp|\busd|\beur)\s*' + _RANGE
+_PERIOD = (r'(?:\bper|\ban?|/)\s*(annum|year|yr|day|hour|hr|week|month)\b'
+           r'|\b(p\.?a|daily|hourly|weekly|monthly|annual(?:ly)?|pd|ph)\b')
+_CURRENCY = r'([£$€]|\bgbp\b|\busd\b|\beur\b)'
+
+_CURRENCIES = {"£": "GBP", "gbp": "GBP", "$": "USD", "usd": "USD", "€": "EUR", "eur": "EUR"}
+_MULTIPLIERS = {
+    "annum": 1, "year": 1, "yr": 1, "pa": 1, "p.a": 1, "annual": 1, "annually": 1,
+    "month": 12, "monthly": 12, "week": 52, "weekly": 52,
+    "day": WORKING_DAYS, "daily": WORKING_DAYS, "pd": WORKING_DAYS,
+    "hour": WORKING_DAYS * HOURS_PER_DAY, "hr": WORKING_DAYS * HOURS_PER_DAY,
+    "hourly": WORKING_DAYS * HOURS_PER_DAY, "ph": WORKING_DAYS * HOURS_PER_DAY,
+}
+_DAY_PERIODS = {"day", "daily", "pd"}
+
+
+def _amount(number: pd.Series, k: pd.Series) -> pd.Series:
+    value = pd.to_numeric(number.str.replace(",", "", regex=False), errors="coerce").astype("float64")
+    return value * np.where(k.notna(), 1000.0, 1.0)
+
+
+def _parse_unique(s: pd.Series) -> pd.DataFrame:
+    s = s.astype("string").str.lower()
+    out = pd.DataFrame(index=s.index, columns=list(COLUMNS)).astype(
+        {"salary_min": "float64", "salary_max": "float64", "salary_day_rate": "boolean", "salary_currency": "object"})
+
+    # Prefer figures with a currency sign, so "6 month contract, £500 per day" reads 500
+    amounts = s.str.extract(_PRICED_RANGE)
+    if amounts[0].isna().any():
+        # Whole rows only: never mix a priced figure with a bare one
+        amounts = amounts.mask(amounts[0].isna(), s.str.extract(_RANGE), axis=0)
+    low = _amount(amounts[0], amounts[1])
+    high = _amount(amounts[2], amounts[3]).fillna(low)
+    # "£45 - 55k": a bare lower bound borrows the upper bound's k
+    low = low.where(~(amounts[1].isna() & amounts[3].notna() & (low * 1000 <= high)), low * 1000)
+
+    period = s.str.extract(_PERIOD)
+    period = period[0].fillna(period[1]).str.replace(".", "", regex=False)
+    # No stated period: guess from magnitude
+    guessed = pd.Series(np.select([high < HOURLY_CEILING, high < DAY_RATE_CEILING], ["hour", "day"], "annum"),
+                        index=s.index)
+    period = period.fillna(guessed.where(low.notna()))
+    multiplier = period.map(_MULTIPLIERS).astype("float64")
+
+    parsed = low.notna()
+    out.loc[parsed, "salary_min"] = (low * multiplier)[parsed].round(0)
+    out.loc[parsed, "salary_max"] = (high * multiplier)[parsed].round(0)
+    out.loc[parsed, "salary_day_rate"] = period[parsed].isin(_DAY_PERIODS)
+    out.loc[parsed, "salary_currency"] = s.str.extract(_CURRENCY)[0][parsed].map(_CURRENCIES)
+    # Ranges written high-to-low
+    swap = out["salary_min"] > out["salary_max"]
+    out.loc[swap, ["salary_min", "salary_max"]] = out.loc[swap, ["salary_max", "salary_min"]].to_numpy()
+    return out
+
+
+def parse_salaries(values) -> pd.DataFrame:
+    """
+    Vectorized salary parse. Returns a frame aligned with `values` with salary_min and
+    salary_max (annualized), salary_day_rate and salary_currency; unparseable text
+    ("Competitive", "N/A") gives nulls.
+    """
+    values = pd.Series(values, copy=False)
+    codes, uniques = pd.factorize(values)
+    parsed = _parse_unique(pd.Series(uniques, dtype=object))
+    # Missing values have code -1, which picks the trailing empty row
+    parsed = pd.concat([parsed, pd.DataFrame([[np.nan, np.nan, pd.NA, None]], columns=list(COLUMNS))],
+                       ignore_index=True)
+    result = parsed.iloc[np.where(codes < 0, len(parsed) - 1, codes)]
+    result.index = values.index
+    return result
+
+
+def parse_salary(text: Optional[str]) -> Dict[str, Any]:
+    """parse_salaries for a single string, as a dict of plain Python values (None when unknown)."""
+    row = parse_salaries([text]).iloc[0]
+    return {col: (None if pd.isna(row[col]) else row[col].item() if hasattr(row[col], "item") else row[col])
+            for col in COLUMNS}
+
+
+def records(values) -> list:
+    """parse_salaries as a list of dicts with plain Python values, for ORM writes."""
+    frame = parse_salaries(values).astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
+
+
+def backfill(chunk: int = 20000) -> int:
+    """Parses salaries of rows stored before the columns existed (once; flagged in config)."""
+    from sqlalchemy import update
+    from backend.database import SessionLocal, JobPost
+    from utils.config import get_config
+    from utils.persistence import set_config_value
+
+    if get_config().get("salary_backfilled") == "true":
+        return 0
+    updated, last_id = 0, 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = (db.query(JobPost.id, JobPost.salary)
+                    .filter(JobPost.id > last_id, JobPost.salary_min.is_(None))
+                    .order_by(JobPost.id).limit(chunk).all())
+            if not rows:
+                break
+            last_id = rows[-1].id
+            parsed = records([r.salary for r in rows])
+            values = [{"id": r.id, **p} for r, p in zip(rows, parsed) if p["salary_min"] is not None]
+            if values:
+                db.execute(update(JobPost), values)
+                db.commit()
+            updated += len(values)
+    finally:
+        db.close()
+    set_config_value("salary_backfilled", "true")
+    return updated
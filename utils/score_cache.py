@@ -0,0 +1,137 @@
+"""
+LLM score cache.
+Reposts and cross-posted roles reach the evaluator under new links, so scores are cached
+by what the LLM actually sees: a normalized hash of title, company, location, salary and
+job type, combined with a hash of the persona (and the target industries, for the fused
+pass). Identical inputs under an unchanged success_persona.json are scored once. Entries
+expire after score_cache_ttl_days, and evict() trims the least recently used entries
+down to score_cache_max_entries.
+"""
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List
+from sqlalchemy import func
+from backend.database import SessionLocal, ScoreCache
+from utils.config import get_config
+from utils import metrics
+
+CONTENT_FIELDS = ("Title", "Company", "Location", "Salary", "Job Type")
+LOOKUP_CHUNK = 500
+_SPACES = re.compile(r'\s+')
+
+
+def _normalize(value) -> str:
+    if value is None or value == "N/A":
+        return ""
+    return _SPACES.sub(" ", str(value)).strip().lower()
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def persona_hash(persona: Any, *context) -> str:
+    """Hash of the persona (plus any other prompt context, e.g. target industries)."""
+    return _digest(json.dumps(persona, sort_keys=True, default=str), json.dumps(context, sort_keys=True))[:16]
+
+
+def content_hash(job: Dict[str, Any]) -> str:
+    return _digest(*(_normalize(job.get(f)) for f in CONTENT_FIELDS))
+
+
+def job_key(job: Dict[str, Any], kind: str, version: str) -> str:
+    return _digest(kind, version, content_hash(job))
+
+
+def text_key(kind: str, *parts) -> str:
+    return _digest(kind, *(_normalize(p) for p in parts))
+
+
+def get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """Cached values for those `keys` that are present and unexpired; marks them as used."""
+    keys = list(set(keys))
+    if not keys:
+        return {}
+    cutoff = datetime.utcnow() - timedelta(days=get_config().score_cache_ttl_days)
+    found = {}
+    db = SessionLocal()
+    try:
+        for i in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[i:i + LOOKUP_CHUNK]
+            rows = db.query(ScoreCache.key, ScoreCache.value).filter(
+                ScoreCache.key.in_(chunk), ScoreCache.created_at >= cutoff).all()
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            db.query(ScoreCache).filter(ScoreCache.key.in_(list(found))).update(
+                {ScoreCache.last_used: datetime.utcnow(), ScoreCache.hits: func.coalesce(ScoreCache.hits, 0) + 1},
+                synchronize_session=False)
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Score cache lookup failed: {e}")
+    finally:
+        db.close()
+    metrics.incr("score_cache_hits", len(found))
+    metrics.incr("score_cache_misses", len(keys) - len(found))
+    return found
+
+
+def put_many(values: Dict[str, Any], kind: str):
+    """Stores (or replaces) cached values."""
+    if not values:
+        return
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        for key, value in values.items():
+            db.merge(ScoreCache(key=key, kind=kind, value=json.dumps(value), created_at=now, last_used=now, hits=0))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Score cache write failed: {e}")
+    finally:
+        db.close()
+
+
+def evict() -> int:
+    """Drops expired entries, then the least recently used beyond the size cap. Returns how many were removed."""
+    cfg = get_config()
+    db = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=cfg.score_cache_ttl_days)
+        removed = db.query(ScoreCache).filter(ScoreCache.created_at < cutoff).delete(synchronize_session=False)
+        excess = db.query(func.count(ScoreCache.key)).scalar() - cfg.score_cache_max_entries
+        if excess > 0:
+            oldest = db.query(ScoreCache.key).order_by(ScoreCache.last_used.asc()).limit(excess)
+            removed += db.query(ScoreCache).filter(ScoreCache.key.in_(oldest.scalar_subquery())).delete(synchronize_session=False)
+        db.commit()
+        return removed
+    finally:
+        db.close()
+
+
+def cached(jobs: List[Dict[str, Any]], kind: str, version: str, evaluate, batch_size: int, is_error) -> List[Any]:
+    """
+    Results for `jobs`, one per job. Cached results are reused; the distinct uncached jobs
+    go to `evaluate` (a batched LLM call) `batch_size` at a time, and its results are
+    cached unless `is_error` says the call failed.
+    """
+    keys = [job_key(job, kind, version) for job in jobs]
+    results = get_many(keys)
+
+    misses = {}
+    for job, key in zip(jobs, keys):
+        if key not in results:
+            misses.setdefault(key, job)
+    pending = list(misses.items())
+    fresh = {}
+    for i in range(0, len(pending), batch_size):
+        batch = pending[i:i + batch_size]
+        for (key, _), result in zip(batch, evaluate([job for _, job in batch])):
+            results[key] = result
+            if not is_error(result):
+                fresh[key] = result
+    put_many(fresh, kind)
+    return [results[key] for key in keys]
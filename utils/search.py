@@ -0,0 +1,71 @@
+"""
+Full-text job search.
+Queries run against job_posts_fts, the FTS5 index that triggers keep in step with
+job_posts (see backend/database.py). User input is turned into a safe FTS5 expression:
+"quoted text" is a phrase, a trailing * makes a prefix match, and every other word must
+appear somewhere in the row. Results are ranked by bm25 with the title weighted highest.
+Scoring every match of a very common term ("manager") would cost hundreds of ms, so only
+the newest RANK_WINDOW matches (found in rowid order, which FTS5 walks cheaply) are
+ranked; deeper pages widen the window.
+"""
+import re
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import text
+from backend.database import FTS_COLUMNS
+
+# bm25 weights in FTS_COLUMNS order: title, company, location, salary, match_reasoning, user_remarks
+WEIGHTS = (10.0, 5.0, 2.0, 1.0, 1.0, 2.0)
+MAX_PAGE_SIZE = 200
+RANK_WINDOW = 5000
+_TERM = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r'\w+')
+
+
+def build_match(query: str) -> str:
+    """FTS5 MATCH expression for a user query; empty if it has no searchable terms."""
+    terms = []
+    for phrase, word in _TERM.findall(query or ""):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+            continue
+        prefix = word.endswith("*")
+        # Punctuation inside a word (C++, e-commerce) splits it into a phrase, as the tokenizer would
+        words = _WORD.findall(word)
+        if words:
+            terms.append('"' + " ".join(words) + '"' + ("*" if prefix else ""))
+    return " AND ".join(terms)
+
+
+def search_jobs(db, query: str, page: int = 1, page_size: int = 50) -> Tuple[int, List[Dict[str, Any]]]:
+    """(total matches, one page of {id, rank, snippet}) for `query`, best match first."""
+    match = build_match(query)
+    if not match:
+        return 0, []
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    offset = (max(page, 1) - 1) * page_size
+    weights = ", ".join(str(w) for w in WEIGHTS)
+    reasoning_col = FTS_COLUMNS.index("match_reasoning")
+
+    total = db.execute(text("SELECT count(*) FROM job_posts_fts WHERE job_posts_fts MATCH :q"), {"q": match}).scalar()
+    window = max(RANK_WINDOW, offset + page_size)
+    floor = 0
+    if total > window:
+        floor = db.execute(text(
+            "SELECT rowid FROM job_posts_fts WHERE job_posts_fts MATCH :q ORDER BY rowid DESC LIMIT 1 OFFSET :n"),
+            {"q": match, "n": window - 1}).scalar()
+
+    rows = db.execute(text(
+        f"SELECT rowid, bm25(job_posts_fts, {weights}) AS rank FROM job_posts_fts "
+        f"WHERE job_posts_fts MATCH :q AND rowid >= :floor ORDER BY rank LIMIT :limit OFFSET :offset"),
+        {"q": match, "floor": floor, "limit": page_size, "offset": offset}).all()
+    if not rows:
+        return total, []
+
+    # Snippets only for the page, not for every row the sort had to consider
+    ids = ",".join(str(int(r.rowid)) for r in rows)
+    snippets = dict(db.execute(text(
+        f"SELECT rowid, snippet(job_posts_fts, {reasoning_col}, '[', ']', '…', 12) FROM job_posts_fts "
+        f"WHERE job_posts_fts MATCH :q AND rowid IN ({ids})"), {"q": match}).all())
+    return total, [{"id": r.rowid, "rank": r.rank, "snippet": snippets.get(r.rowid)} for r in rows]
@@ -0,0 +1,88 @@
+"""
+Seen-links store for monitor_jobs.
+An append-only SQLite table of every link the monitor has exported, keyed by link, so
+each run checks its scraped batch with indexed lookups instead of re-reading the history
+of spreadsheets. Export files written outside the monitor (e.g. a new jobs_v*.xlsx) are
+imported once, from their .links sidecar, the first time the store sees them.
+"""
+import glob
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, Set
+from utils.export import read_links
+
+DEFAULT_PATH = "seen_links.db"
+EXPORT_PATTERNS = ("jobs_*.xlsx", "new_jobs_*.xlsx")
+LOOKUP_CHUNK = 500
+
+
+class SeenLinksStore:
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen_links (
+                link TEXT PRIMARY KEY,
+                first_seen TEXT,
+                source_file TEXT
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS imported_files (
+                path TEXT PRIMARY KEY,
+                mtime REAL
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen_links").fetchone()[0]
+
+    def seen(self, links: Iterable[str]) -> Set[str]:
+        """Returns which of `links` are already in the store."""
+        links = list(set(links))
+        found = set()
+        for i in range(0, len(links), LOOKUP_CHUNK):
+            chunk = links[i:i + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(r[0] for r in self.conn.execute(
+                f"SELECT link FROM seen_links WHERE link IN ({placeholders})", chunk))
+        return found
+
+    def add(self, links: Iterable[str], source_file: str = None) -> int:
+        """Appends links; ones already present keep their first sighting. Returns how many were new."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_links (link, first_seen, source_file) VALUES (?, ?, ?)",
+                ((link, now, source_file) for link in links if link))
+            return self.conn.total_changes - before
+
+    def add_file(self, filename: str) -> int:
+        """Records the links of an export file and marks it imported."""
+        added = self.add(read_links(filename), os.path.basename(filename))
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO imported_files (path, mtime) VALUES (?, ?)",
+                              (os.path.abspath(filename), os.path.getmtime(filename)))
+        return added
+
+    def sync(self, directory: str = ".") -> int:
+        """Imports export files in `directory` that the store has not seen (or that changed since)."""
+        imported = dict(self.conn.execute("SELECT path, mtime FROM imported_files"))
+        added = 0
+        for pattern in EXPORT_PATTERNS:
+            for f in glob.glob(os.path.join(directory, pattern)):
+                if imported.get(os.path.abspath(f)) == os.path.getmtime(f):
+                    continue
+                try:
+                    added += self.add_file(f)
+                except Exception as e:
+                    print(f"Error reading {f}: {e}")
+        return added
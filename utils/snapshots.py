@@ -0,0 +1,155 @@
+"""
+Raw-page snapshot store.
+Every detail page the scrapers fetch is kept, so an improved extractor or LLM prompt can be
+replayed over stored pages (reextract.py) instead of re-crawling the boards. Pages are
+content-addressed: the blob is named by the sha256 of the HTML and written once however
+often it is fetched, compressed with zstd (zstandard is a requirement; an install without
+it falls back to zlib, and the file extension records which, so both can coexist). The
+page_snapshots table indexes each fetch by link and time. prune() drops fetches older
+than snapshot_retention_days, keeping the newest of every link that is still stored,
+and then deletes blobs nothing refers to.
+"""
+import hashlib
+import os
+import zlib
+from datetime import datetime, timedelta
+from typing import Iterable
+from sqlalchemy import func
+from backend.database import SessionLocal, PageSnapshot, JobPost
+from utils.config import get_config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SNAPSHOT_DIR = "snapshots"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 6
+_EXTENSIONS = (".zst", ".zz")
+
+
+def snapshot_dir() -> str:
+    return get_config().get("snapshot_dir") or SNAPSHOT_DIR
+
+
+def _blob_base(content_hash: str, directory: str) -> str:
+    return os.path.join(directory, content_hash[:2], content_hash)
+
+
+def _compress(data: bytes):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), ".zst"
+    return zlib.compress(data, ZLIB_LEVEL), ".zz"
+
+
+def _decompress(payload: bytes, extension: str) -> bytes:
+    if extension == ".zst":
+        if zstandard is None:
+            raise RuntimeError("Snapshot is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return zlib.decompress(payload)
+
+
+def write_blob(html: str, directory: str = None) -> str:
+    """Stores the page unless an identical one is already stored. Returns its content hash."""
+    directory = directory or snapshot_dir()
+    data = html.encode("utf-8")
+    content_hash = hashlib.sha256(data).hexdigest()
+    base = _blob_base(content_hash, directory)
+    if any(os.path.exists(base + ext) for ext in _EXTENSIONS):
+        return content_hash
+    payload, extension = _compress(data)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    # Write then rename, so a crash never leaves a truncated blob under the final name
+    tmp = f"{base}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, base + extension)
+    return content_hash
+
+
+def read_blob(content_hash: str, directory: str = None) -> str:
+    base = _blob_base(content_hash, directory or snapshot_dir())
+    for extension in _EXTENSIONS:
+        if os.path.exists(base + extension):
+            with open(base + extension, "rb") as f:
+                return _decompress(f.read(), extension).decode("utf-8")
+    raise FileNotFoundError(f"No snapshot blob {content_hash}")
+
+
+def record(link: str, content_hash: str, size: int, source: str, kind: str = "detail"):
+    """Indexes one fetch of `link` whose page is already stored as blob `content_hash`."""
+    db = SessionLocal()
+    try:
+        db.add(PageSnapshot(link=link, source=source, kind=kind, content_hash=content_hash,
+                            size=size, fetched_at=datetime.utcnow()))
+        db.commit()
+    finally:
+        db.close()
+
+
+def latest_query(db, sources: Iterable[str] = None, since: datetime = None, kind: str = "detail"):
+    """The newest snapshot of each link (optionally only for some sources or fetched since a time)."""
+    newest = db.query(func.max(PageSnapshot.id)).filter(PageSnapshot.kind == kind)
+    if sources:
+        newest = newest.filter(PageSnapshot.source.in_(list(sources)))
+    if since is not None:
+        newest = newest.filter(PageSnapshot.fetched_at >= since)
+    newest = newest.group_by(PageSnapshot.link)
+    return db.query(PageSnapshot).filter(PageSnapshot.id.in_(newest)).order_by(PageSnapshot.id)
+
+
+def prune(days: int = None, directory: str = None) -> dict:
+    """Applies snapshot_retention_days (0 keeps everything) and removes unreferenced blobs."""
+    days = get_config().snapshot_retention_days if days is None else days
+    directory = directory or snapshot_dir()
+    removed_rows = removed_blobs = 0
+    db = SessionLocal()
+    try:
+        if days > 0:
+            cutoff = datetime.utcnow() - timedelta(days=days)
+            # The newest fetch of a job we still hold is what re-extraction replays; keep it
+            keep = (db.query(func.max(PageSnapshot.id))
+                    .filter(PageSnapshot.link.in_(db.query(JobPost.link)))
+                    .group_by(PageSnapshot.link))
+            removed_rows = (db.query(PageSnapshot)
+                            .filter(PageSnapshot.fetched_at < cutoff, PageSnapshot.id.notin_(keep))
+                            .delete(synchronize_session=False))
+            db.commit()
+        referenced = {h for (h,) in db.query(PageSnapshot.content_hash).distinct()}
+    finally:
+        db.close()
+
+    if not os.path.isdir(directory):
+        return {"rows": removed_rows, "blobs": 0}
+    # A scraper writes the blob just before its index row; leave fresh blobs alone
+    fresh = datetime.now().timestamp() - 3600
+    for prefix in os.listdir(directory):
+        folder = os.path.join(directory, prefix)
+        if not os.path.isdir(folder):
+            continue
+        for name in os.listdir(folder):
+            content_hash, extension = os.path.splitext(name)
+            path = os.path.join(folder, name)
+            if extension in _EXTENSIONS and content_hash not in referenced and os.path.getmtime(path) < fresh:
+                os.remove(path)
+                removed_blobs += 1
+    return {"rows": removed_rows, "blobs": removed_blobs}
+
+
+def stats(directory: str = None) -> dict:
+    """Fetches indexed, distinct pages, and raw vs on-disk bytes of the distinct pages."""
+    directory = directory or snapshot_dir()
+    db = SessionLocal()
+    try:
+        fetches = db.query(func.count(PageSnapshot.id)).scalar() or 0
+        pages = dict(db.query(PageSnapshot.content_hash, PageSnapshot.size).distinct())
+    finally:
+        db.close()
+    stored = 0
+    for content_hash in pages:
+        base = _blob_base(content_hash, directory)
+        stored += sum(os.path.getsize(base + ext) for ext in _EXTENSIONS if os.path.exists(base + ext))
+    return {"fetches": fetches, "pages": len(pages), "raw_bytes": sum(pages.values()),
+            "stored_bytes": stored, "codec": "zstd" if zstandard is not None else "zlib"}